@@ -0,0 +1,173 @@
+"""Content-addressed input images for ComfyUI jobs on RunPod.
+
+The control, reference and inpaint images sent with every job repeat across
+scenes and retries (the character reference goes into all of them). Two
+layers keep that cheap:
+
+* :func:`memoized_png_data_url` renders and PNG-optimises each distinct input
+  once per process;
+* an :class:`AssetStore` holds each distinct image once where the worker can
+  read it, so jobs reference ``<subfolder>/<sha>.png`` by name instead of
+  inlining megabytes of base64. Images fall back to the inline
+  ``input.images`` list when no store is configured, an upload fails, or the
+  endpoint has shown it cannot see the store.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Protocol
+
+_PNG_MEMO_MAX_CHARS = 64 * 1024 * 1024
+_PNG_MEMO: OrderedDict[str, str] = OrderedDict()
+_PNG_MEMO_LOCK = threading.Lock()
+_PNG_MEMO_CHARS = 0
+
+_ENDPOINTS_WITHOUT_STORE: set[str] = set()
+_ENDPOINTS_LOCK = threading.Lock()
+
+
+def file_identity(path: Path) -> tuple[str, int, int]:
+    stat = path.stat()
+    return str(path.resolve()), stat.st_size, stat.st_mtime_ns
+
+
+def memoized_png_data_url(key: Mapping[str, Any], render: Callable[[], bytes]) -> str:
+    """Return ``render()`` as a PNG data URL, rendering each ``key`` once.
+
+    ``key`` must capture every input of ``render``; source files belong in it
+    as :func:`file_identity` so an overwritten file renders again.
+    """
+    global _PNG_MEMO_CHARS
+    memo_key = hashlib.sha256(
+        json.dumps(key, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+    with _PNG_MEMO_LOCK:
+        if memo_key in _PNG_MEMO:
+            _PNG_MEMO.move_to_end(memo_key)
+            return _PNG_MEMO[memo_key]
+    encoded = base64.b64encode(render()).decode("ascii")
+    data_url = f"data:image/png;base64,{encoded}"
+    with _PNG_MEMO_LOCK:
+        if memo_key not in _PNG_MEMO:
+            _PNG_MEMO[memo_key] = data_url
+            _PNG_MEMO_CHARS += len(data_url)
+        while _PNG_MEMO_CHARS > _PNG_MEMO_MAX_CHARS and len(_PNG_MEMO) > 1:
+            _, evicted = _PNG_MEMO.popitem(last=False)
+            _PNG_MEMO_CHARS -= len(evicted)
+    return data_url
+
+
+class AssetStore(Protocol):
+    def has(self, name: str) -> bool: ...
+
+    def put(self, name: str, data: bytes) -> None: ...
+
+
+class LocalAssetStore:
+    """Directory store: a mounted network volume, or a stand-in for tests.
+
+    On the worker the same directory must appear as ``<subfolder>`` inside
+    ComfyUI's input directory.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def has(self, name: str) -> bool:
+        return (self.root / name).is_file()
+
+    def put(self, name: str, data: bytes) -> None:
+        target = self.root / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, target)
+
+
+def asset_subfolder() -> str:
+    return os.getenv("COMFYUI_ASSET_SUBFOLDER", "ai_film_assets").strip().strip("/")
+
+
+def default_asset_store() -> AssetStore | None:
+    root = os.getenv("COMFYUI_ASSET_STORE_DIR", "").strip()
+    return LocalAssetStore(Path(root).expanduser()) if root else None
+
+
+def mark_endpoint_without_store(endpoint_id: str) -> None:
+    """Send every later job for ``endpoint_id`` with inline images."""
+    with _ENDPOINTS_LOCK:
+        _ENDPOINTS_WITHOUT_STORE.add(endpoint_id)
+
+
+def endpoint_reads_store(endpoint_id: str) -> bool:
+    with _ENDPOINTS_LOCK:
+        return endpoint_id not in _ENDPOINTS_WITHOUT_STORE
+
+
+@dataclass
+class StagedInputs:
+    inline_images: list[dict[str, str]] = field(default_factory=list)
+    # Original image name -> name of the stored asset the workflow should load.
+    stored_names: dict[str, str] = field(default_factory=dict)
+    uploaded: int = 0
+    reused: int = 0
+
+    @property
+    def inline_chars(self) -> int:
+        return sum(len(item["image"]) for item in self.inline_images)
+
+
+def stage_input_images(
+    images: Iterable[Mapping[str, str]],
+    *,
+    store: AssetStore | None,
+    endpoint_id: str,
+) -> StagedInputs:
+    """Move each distinct input image into ``store`` once, keyed by content."""
+    staged = StagedInputs()
+    use_store = store is not None and endpoint_reads_store(endpoint_id)
+    subfolder = asset_subfolder()
+    for item in images:
+        if not use_store:
+            staged.inline_images.append(dict(item))
+            continue
+        data_url = item["image"]
+        digest = hashlib.sha256(data_url.encode("ascii")).hexdigest()[:32]
+        name = f"{digest}.png"
+        try:
+            if store.has(name):
+                staged.reused += 1
+            else:
+                store.put(name, base64.b64decode(data_url.split(",", 1)[1]))
+                staged.uploaded += 1
+        except (OSError, ValueError):
+            staged.inline_images.append(dict(item))
+            continue
+        staged.stored_names[item["name"]] = f"{subfolder}/{name}" if subfolder else name
+    return staged
+
+
+def reference_stored_assets(
+    workflow: dict[str, dict[str, Any]], stored_names: Mapping[str, str]
+) -> None:
+    """Point ``LoadImage`` nodes at stored assets instead of inline uploads."""
+    for node in workflow.values():
+        inputs = node.get("inputs") or {}
+        if (
+            node.get("class_type") == "LoadImage"
+            and inputs.get("image") in stored_names
+        ):
+            inputs["image"] = stored_names[inputs["image"]]
+
+
+def mentions_stored_asset(error: Any, stored_names: Mapping[str, str]) -> bool:
+    text = json.dumps(error, default=str) if not isinstance(error, str) else error
+    return any(name in text for name in stored_names.values())
@@ -0,0 +1,154 @@
+"""CPU-only pre-pass for cross-scene visual consistency.
+
+A difference hash catches near-duplicate compositions and a coarse RGB
+histogram measures palette drift. Both take a few milliseconds per image.
+Only near-duplicates are failed locally: a palette outlier may be an
+intended night or interior scene, and neither signal sees identity, age,
+costume or medium drift, so every other set still goes to the vision model.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+# Hamming distance between 64-bit dHashes.
+_DUPLICATE_MAX_BITS = 6
+_DISTINCT_MIN_BITS = 16
+# Histogram intersection of one scene against the mean palette of the others.
+_PALETTE_DRIFT_MAX = 0.30
+_PALETTE_MATCH_MIN = 0.55
+
+
+@dataclass(frozen=True)
+class ImageSignature:
+    dhash: int
+    palette: tuple[float, ...]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def consistency_prefilter_enabled() -> bool:
+    value = os.getenv("IMAGE_CONSISTENCY_PREFILTER_ENABLED", "true")
+    return value.strip().lower() not in {"0", "false", "no"}
+
+
+@functools.lru_cache(maxsize=256)
+def _signature(path: str, _size: int, _mtime_ns: int) -> ImageSignature:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.load()
+        rgb = image.convert("RGB")
+    gray = rgb.convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+    pixels = gray.tobytes()
+    dhash = 0
+    for row in range(8):
+        for column in range(8):
+            left = pixels[row * 9 + column]
+            right = pixels[row * 9 + column + 1]
+            dhash = (dhash << 1) | int(left > right)
+    counts = [0] * 64
+    thumb = rgb.resize((64, 64), Image.Resampling.BILINEAR)
+    data = thumb.tobytes()
+    for offset in range(0, len(data), 3):
+        red, green, blue = data[offset : offset + 3]
+        counts[(red >> 6) * 16 + (green >> 6) * 4 + (blue >> 6)] += 1
+    total = float(sum(counts)) or 1.0
+    return ImageSignature(dhash, tuple(count / total for count in counts))
+
+
+def image_signature(path: Path) -> ImageSignature:
+    stat = path.stat()
+    return _signature(str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def _palette_intersection(left: Sequence[float], right: Sequence[float]) -> float:
+    return sum(min(a, b) for a, b in zip(left, right))
+
+
+def prefilter_image_set(paths: Sequence[Path]) -> Dict[str, Any]:
+    """Return a ``pass``, ``fail`` or ``ambiguous`` verdict for the scene set.
+
+    ``fail`` is reserved for near-duplicate compositions and carries the
+    vision model's ``compositional_redundancy`` code, so repair scene
+    selection works unchanged. Palette drift is only ever ``ambiguous``.
+    """
+    signatures = [image_signature(path) for path in paths]
+    duplicate_max = int(
+        _env_float("IMAGE_CONSISTENCY_DUPLICATE_MAX_BITS", _DUPLICATE_MAX_BITS)
+    )
+    distinct_min = int(
+        _env_float("IMAGE_CONSISTENCY_DISTINCT_MIN_BITS", _DISTINCT_MIN_BITS)
+    )
+    drift_max = _env_float("IMAGE_CONSISTENCY_PALETTE_DRIFT_MAX", _PALETTE_DRIFT_MAX)
+    match_min = _env_float("IMAGE_CONSISTENCY_PALETTE_MATCH_MIN", _PALETTE_MATCH_MIN)
+
+    issues: List[str] = []
+    ambiguous: List[str] = []
+    duplicate_pairs: List[List[int]] = []
+    min_distance = 64
+    for first in range(len(signatures)):
+        for second in range(first + 1, len(signatures)):
+            distance = bin(signatures[first].dhash ^ signatures[second].dhash).count(
+                "1"
+            )
+            min_distance = min(min_distance, distance)
+            if distance <= duplicate_max:
+                duplicate_pairs.append([first, second])
+    if duplicate_pairs:
+        issues.append("compositional_redundancy")
+    elif min_distance < distinct_min:
+        ambiguous.append("composition_similarity")
+
+    palette_scores: List[float] = []
+    drifting: List[int] = []
+    for index, signature in enumerate(signatures):
+        others = [
+            other.palette
+            for position, other in enumerate(signatures)
+            if position != index
+        ]
+        mean_palette = [sum(values) / len(others) for values in zip(*others)]
+        score = _palette_intersection(signature.palette, mean_palette)
+        palette_scores.append(round(score, 3))
+        if score < drift_max:
+            drifting.append(index)
+    if drifting:
+        ambiguous.append("palette_drift")
+    elif min(palette_scores) < match_min:
+        ambiguous.append("palette_similarity")
+
+    verdict = "fail" if issues else "ambiguous" if ambiguous else "pass"
+    return {
+        "verdict": verdict,
+        "issues": issues,
+        "ambiguous": ambiguous,
+        "duplicate_pairs": duplicate_pairs,
+        "drifting_images": drifting,
+        "min_hash_distance": min_distance,
+        "palette_scores": palette_scores,
+        "palette_min": min(palette_scores),
+    }
+
+
+def downscaled_jpeg(path: Path, longest_edge: int, quality: int = 85) -> bytes:
+    """Re-encode ``path`` as a JPEG no longer than ``longest_edge`` pixels."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.load()
+        rgb = image.convert("RGB")
+    rgb.thumbnail((longest_edge, longest_edge), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    rgb.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
@@ -5,6 +5,8 @@ Integrates LangGraph workflows with Open3D visualization
 
 import ast
 import base64
+import binascii
+import contextvars
 import hashlib
 import importlib
 import json
@@ -12,14 +14,19 @@ import math
 import os
 import re
 import shutil
-import struct
 import subprocess
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, TypedDict
+from typing import Any, Callable, Dict, List, Mapping, Sequence, TypedDict, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+
+_SceneJobInput = TypeVar("_SceneJobInput")
+_SceneJobResult = TypeVar("_SceneJobResult")
 
 
 class Open3DAgentState(TypedDict, total=False):
@@ -36,6 +43,11 @@ class Open3DAgentState(TypedDict, total=False):
     max_scenes: int
     image_style: str
     image_quality_preset: str
+    video_render_profile: str
+    pipeline_execution_mode: str
+    # Skip cached LLM responses for this run; fresh ones still refresh the cache.
+    bypass_cache: bool
+    output_root: str
     visual_bible: Dict[str, Any]
     enhanced_multimodal_input_asset: Dict[str, Any]
     cinematic_prompt: str
@@ -52,6 +64,7 @@ class Open3DAgentState(TypedDict, total=False):
     runpod_jobs: List[Dict[str, Any]]
     quality_metrics: Dict[str, Any]
     cost_estimate: Dict[str, Any]
+    prerendered_clips: Dict[str, Dict[str, Any]]
 
 
 IMAGE_STYLE_PRESETS: Dict[str, Dict[str, str]] = {
@@ -133,6 +146,35 @@ IMAGE_QUALITY_PRESETS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+VIDEO_RENDER_PROFILES: Dict[str, Dict[str, Any]] = {
+    "draft": {
+        "width": 540,
+        "height": 960,
+        "fps": 24,
+        "preset": "ultrafast",
+        "crf": 28,
+        "profile": "main",
+    },
+    "review": {
+        "width": 720,
+        "height": 1280,
+        "fps": 30,
+        "preset": "veryfast",
+        "crf": 23,
+        "profile": "high",
+    },
+    "master": {
+        "width": 1080,
+        "height": 1920,
+        "fps": 30,
+        "preset": "slow",
+        "crf": 18,
+        "profile": "high",
+    },
+}
+
+DEFAULT_VIDEO_RENDER_PROFILE = "master"
+
 IMAGE_NEGATIVE_PROMPT = (
     "low quality, worst quality, blurry, distorted, deformed, bad anatomy, malformed face, "
     "asymmetrical eyes, crossed eyes, broken nose, melted facial features, extra fingers, "
@@ -173,6 +215,23 @@ def _resolve_quality_preset(preset_key: str | None) -> Dict[str, Any]:
     )
 
 
+def _video_render_profile_key(profile_key: str | None) -> str:
+    key = (
+        (
+            profile_key
+            or os.getenv("VIDEO_RENDER_PROFILE", DEFAULT_VIDEO_RENDER_PROFILE)
+            or DEFAULT_VIDEO_RENDER_PROFILE
+        )
+        .strip()
+        .lower()
+    )
+    return key if key in VIDEO_RENDER_PROFILES else DEFAULT_VIDEO_RENDER_PROFILE
+
+
+def _resolve_video_render_profile(profile_key: str | None) -> Dict[str, Any]:
+    return VIDEO_RENDER_PROFILES[_video_render_profile_key(profile_key)]
+
+
 def _resolve_comfyui_checkpoint(style_key: str | None) -> str:
     style_specific_key = (
         f"COMFYUI_CHECKPOINT_{(style_key or DEFAULT_IMAGE_STYLE).upper()}"
@@ -1126,19 +1185,335 @@ def _shot_plan(scene: Dict[str, Any]) -> Dict[str, str]:
 
 
 def _ffmpeg_zoompan_filter(
-    scene: Dict[str, Any], duration: float, fps: int = 30
+    scene: Dict[str, Any],
+    duration: float,
+    fps: int = 30,
+    width: int = 1080,
+    height: int = 1920,
 ) -> str:
     frames = max(1, int(duration * fps))
     plan = _motion_plan(scene)
     zoompan = plan["zoompan"].replace("duration_frames", str(frames))
     return (
-        "scale=1080:1920:force_original_aspect_ratio=increase,"
-        "crop=1080:1920,"
-        f"zoompan={zoompan}:d={frames}:s=1080x1920:fps={fps},"
+        f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+        f"crop={width}:{height},"
+        f"zoompan={zoompan}:d={frames}:s={width}x{height}:fps={fps},"
         "format=yuv420p"
     )
 
 
+def _ffmpeg_threads_per_encode() -> int:
+    return max(1, min(16, _safe_int(os.getenv("FFMPEG_THREADS_PER_ENCODE", "2"), 2)))
+
+
+def _ffmpeg_max_parallel_encodes() -> int:
+    # Size the encode pool so parallel clips do not oversubscribe the CPU.
+    default = max(1, (os.cpu_count() or 1) // _ffmpeg_threads_per_encode())
+    return max(
+        1,
+        min(
+            8,
+            _safe_int(os.getenv("FFMPEG_MAX_PARALLEL_ENCODES", str(default)), default),
+        ),
+    )
+
+
+def _ffmpeg_motion_clip_command(
+    image_path: str,
+    clip_path: str,
+    scene: Dict[str, Any],
+    duration: float,
+    render_profile: Mapping[str, Any] | None = None,
+) -> List[str]:
+    profile = render_profile or VIDEO_RENDER_PROFILES[DEFAULT_VIDEO_RENDER_PROFILE]
+    fps = int(profile["fps"])
+    return [
+        "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostats",
+        "-progress",
+        "pipe:2",
+        "-loop",
+        "1",
+        "-i",
+        image_path,
+        "-vf",
+        _ffmpeg_zoompan_filter(
+            scene,
+            duration,
+            fps=fps,
+            width=int(profile["width"]),
+            height=int(profile["height"]),
+        ),
+        "-t",
+        str(duration),
+        "-r",
+        str(fps),
+        "-c:v",
+        "libx264",
+        "-preset",
+        str(profile["preset"]),
+        "-crf",
+        str(profile["crf"]),
+        "-profile:v",
+        str(profile["profile"]),
+        "-threads",
+        str(_ffmpeg_threads_per_encode()),
+        "-pix_fmt",
+        "yuv420p",
+        "-movflags",
+        "+faststart",
+        clip_path,
+    ]
+
+
+_FFMPEG_PROGRESS_LINE = re.compile(r"^[a-z0-9_]+=")
+
+
+def _run_ffmpeg_with_progress(
+    cmd: Sequence[str],
+    *,
+    label: str,
+    duration: float,
+    report_step: int = 25,
+) -> subprocess.CompletedProcess[str]:
+    """Run an encode reading ``-progress pipe:2`` and print progress to the run log.
+
+    Non-progress stderr lines are kept as the error text of the result.
+    """
+    process = subprocess.Popen(
+        list(cmd),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    error_lines: List[str] = []
+    reported = 0
+    assert process.stderr is not None
+    for line in process.stderr:
+        stripped = line.strip()
+        if not _FFMPEG_PROGRESS_LINE.match(stripped):
+            error_lines.append(line)
+            continue
+        key, _, value = stripped.partition("=")
+        if key == "progress" and value == "end":
+            percent = 100
+        elif key == "out_time_us" and duration > 0:
+            percent = min(100, int(_safe_float(value) / 1_000_000 / duration * 100))
+        else:
+            continue
+        if percent >= reported + report_step:
+            reported = percent - percent % report_step
+            print(f"🎞️ {label}: {reported}%", flush=True)
+    returncode = process.wait()
+    return subprocess.CompletedProcess(list(cmd), returncode, "", "".join(error_lines))
+
+
+def _video_assembly_engine() -> str:
+    engine = os.getenv("VIDEO_ASSEMBLY_ENGINE", "single_pass").strip().lower()
+    if engine not in {"single_pass", "multi_pass"}:
+        return "single_pass"
+    return engine
+
+
+def _video_transition_seconds() -> float:
+    return max(
+        0.0,
+        min(2.0, _safe_float(os.getenv("VIDEO_TRANSITION_SECONDS", "0.5"), 0.5)),
+    )
+
+
+PIPELINE_EXECUTION_MODES = ("staged", "scene_streaming")
+
+
+def _pipeline_execution_mode(mode: str | None) -> str:
+    key = (
+        (mode or os.getenv("PIPELINE_EXECUTION_MODE", "staged") or "staged")
+        .strip()
+        .lower()
+    )
+    return key if key in PIPELINE_EXECUTION_MODES else "staged"
+
+
+def _image_fingerprint(image_path: str) -> List[int] | None:
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _scene_clip_duration(
+    img: Dict[str, Any],
+    audio_files: List[Dict[str, Any]],
+) -> float:
+    return max(
+        3.0,
+        _scene_audio_duration(audio_files, img.get("scene_id")),
+        _safe_float(img.get("duration"), 5.0),
+    )
+
+
+def _output_root(state: Mapping[str, Any]) -> Path:
+    """Artifact directory of one run; the relative default keeps CLI runs as before."""
+    return Path(state.get("output_root") or "output")
+
+
+def _render_ffmpeg_motion_clip(
+    img: Dict[str, Any],
+    duration: float,
+    render_profile_key: str,
+    output_root: Path,
+    index: int = 0,
+) -> Dict[str, Any] | None:
+    """Animate one approved still into ``<output_root>/scene_<id>_motion.mp4``."""
+    clip_path = str(output_root / f"scene_{img['scene_id']}_motion.mp4")
+    cmd = _ffmpeg_motion_clip_command(
+        img["image_path"],
+        clip_path,
+        {
+            "scene_id": img.get("scene_id", index),
+            "camera_motion": img.get("camera_motion", ""),
+        },
+        duration,
+        VIDEO_RENDER_PROFILES[render_profile_key],
+    )
+    result = _run_ffmpeg_with_progress(
+        cmd,
+        label=f"cena {img.get('scene_id')}",
+        duration=duration,
+    )
+    if result.returncode != 0 or not os.path.exists(clip_path):
+        print("⚠️ Erro ao animar cena " f"{img.get('scene_id')}: {result.stderr[:500]}")
+        return None
+    media_quality = _probe_media_quality(clip_path, "video")
+    return {
+        "scene_id": img.get("scene_id", index),
+        "video_path": clip_path,
+        "provider": "ffmpeg_camera_motion",
+        "render_profile": render_profile_key,
+        "duration": duration,
+        "quality_score": media_quality.get("quality_score", 0),
+    }
+
+
+def _ffmpeg_single_pass_command(
+    scene_inputs: Sequence[tuple[str, Dict[str, Any], float, str | None]],
+    video_path: str,
+    render_profile: Mapping[str, Any],
+    transition_seconds: float = 0.0,
+) -> List[str]:
+    """Build one ffmpeg graph that animates, joins and mixes every scene.
+
+    Each input is ``(image_path, scene, duration, audio_path)``. Scenes before a
+    crossfade are extended by the transition length so every xfade offset lands
+    on the scene's narration boundary and the total runtime stays the sum of
+    the scene durations.
+    """
+    fps = int(render_profile["fps"])
+    width = int(render_profile["width"])
+    height = int(render_profile["height"])
+    count = len(scene_inputs)
+    transition = 0.0
+    if count > 1:
+        shortest = min(duration for _, _, duration, _ in scene_inputs)
+        transition = max(0.0, min(transition_seconds, shortest / 2))
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostats",
+        "-progress",
+        "pipe:2",
+    ]
+    filters: List[str] = []
+    for index, (image_path, scene, duration, _) in enumerate(scene_inputs):
+        cmd.extend(["-i", image_path])
+        length = duration + (transition if index < count - 1 else 0.0)
+        filters.append(
+            f"[{index}:v]"
+            f"{_ffmpeg_zoompan_filter(scene, length, fps=fps, width=width, height=height)},"
+            f"trim=duration={length:.3f},setpts=PTS-STARTPTS[v{index}]"
+        )
+    if count == 1:
+        video_label = "v0"
+    elif transition > 0:
+        video_label = "v0"
+        offset = 0.0
+        for index in range(1, count):
+            offset += scene_inputs[index - 1][2]
+            filters.append(
+                f"[{video_label}][v{index}]xfade=transition=fade:"
+                f"duration={transition:.3f}:offset={offset:.3f}[x{index}]"
+            )
+            video_label = f"x{index}"
+    else:
+        filters.append(
+            "".join(f"[v{index}]" for index in range(count))
+            + f"concat=n={count}:v=1:a=0[vcat]"
+        )
+        video_label = "vcat"
+
+    has_audio = any(audio_path for _, _, _, audio_path in scene_inputs)
+    if has_audio:
+        for index, (_, _, duration, audio_path) in enumerate(scene_inputs):
+            if audio_path:
+                cmd.extend(["-i", audio_path])
+            else:
+                cmd.extend(
+                    [
+                        "-f",
+                        "lavfi",
+                        "-t",
+                        f"{duration:.3f}",
+                        "-i",
+                        "anullsrc=r=44100:cl=stereo",
+                    ]
+                )
+            # Pad narration to the scene length so audio stays on its shot.
+            filters.append(
+                f"[{count + index}:a]aresample=44100,"
+                "aformat=sample_fmts=fltp:channel_layouts=stereo,"
+                f"apad=whole_dur={duration:.3f},atrim=duration={duration:.3f}[a{index}]"
+            )
+        filters.append(
+            "".join(f"[a{index}]" for index in range(count))
+            + f"concat=n={count}:v=0:a=1,"
+            f"loudnorm=I={_audio_loudness_target_lufs():.1f}:TP=-1.5:LRA=11,"
+            "aresample=48000[aout]"
+        )
+
+    cmd.extend(["-filter_complex", ";".join(filters), "-map", f"[{video_label}]"])
+    if has_audio:
+        cmd.extend(["-map", "[aout]", "-c:a", "aac", "-b:a", "160k"])
+    cmd.extend(
+        [
+            "-r",
+            str(fps),
+            "-c:v",
+            "libx264",
+            "-preset",
+            str(render_profile["preset"]),
+            "-crf",
+            str(render_profile["crf"]),
+            "-profile:v",
+            str(render_profile["profile"]),
+            "-pix_fmt",
+            "yuv420p",
+            "-movflags",
+            "+faststart",
+            video_path,
+        ]
+    )
+    return cmd
+
+
 def _scene_audio_duration(audio_files: List[Dict[str, Any]], scene_id: Any) -> float:
     for audio in audio_files:
         if audio.get("scene_id") != scene_id:
@@ -1383,6 +1758,102 @@ def _image_generation_max_attempts() -> int:
     return max(1, min(4, _safe_int(os.getenv("IMAGE_GENERATION_MAX_ATTEMPTS", "4"), 4)))
 
 
+def _image_generation_max_in_flight() -> int:
+    return max(
+        1,
+        min(8, _safe_int(os.getenv("IMAGE_GENERATION_MAX_IN_FLIGHT", "3"), 3)),
+    )
+
+
+def _image_generation_best_of_n() -> int:
+    return max(
+        1,
+        min(4, _safe_int(os.getenv("IMAGE_GENERATION_BEST_OF_N", "1"), 1)),
+    )
+
+
+_CandidateResult = tuple[
+    int, Dict[str, Any], Dict[str, Any] | None, Dict[str, Any] | None
+]
+
+
+def _sample_best_of_n(
+    candidates: int,
+    run_candidate: Callable[
+        [int, threading.Event],
+        tuple[Dict[str, Any], Dict[str, Any] | None, Dict[str, Any] | None],
+    ],
+) -> List[_CandidateResult]:
+    """Run ``candidates`` seeds at once and stop the rest once one is accepted.
+
+    Results come back in arrival order as ``(candidate, job_monitor, record,
+    metric)``; the first with ``semantic_accepted`` sets the shared cancel
+    event, which later candidates see while polling or before their QA. A
+    candidate that raises comes back as a ``FAILED`` job monitor so its
+    siblings, and the spend they already tracked, are kept.
+    """
+    cancel_event = threading.Event()
+    contexts = [contextvars.copy_context() for _ in range(candidates)]
+    results: List[_CandidateResult] = []
+    with ThreadPoolExecutor(
+        max_workers=candidates,
+        thread_name_prefix="ai-film-candidate",
+    ) as executor:
+        futures = {
+            executor.submit(
+                contexts[index].run, run_candidate, index + 1, cancel_event
+            ): index
+            + 1
+            for index in range(candidates)
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    job_monitor, image_record, image_metric = future.result()
+                except Exception as exc:
+                    job_monitor = {
+                        "job_id": None,
+                        "status": "FAILED",
+                        "error": f"candidate_raised: {type(exc).__name__}: {exc}",
+                        "estimated_cost_usd": 0.0,
+                        "cost_estimate_status": "unknown_candidate_raised",
+                    }
+                    image_record = image_metric = None
+                results.append(
+                    (futures[future], job_monitor, image_record, image_metric)
+                )
+                if image_metric and image_metric.get("semantic_accepted"):
+                    cancel_event.set()
+        except BaseException:
+            # Leaving early must not wait on siblings still paying for GPU.
+            cancel_event.set()
+            raise
+    return results
+
+
+def _run_scene_jobs(
+    items: Sequence[_SceneJobInput],
+    worker: Callable[[_SceneJobInput], _SceneJobResult],
+    *,
+    max_in_flight: int,
+) -> List[_SceneJobResult]:
+    """Run independent scene jobs with a bounded pool, keeping input order."""
+    if max_in_flight <= 1 or len(items) <= 1:
+        return [worker(item) for item in items]
+    # Each job runs in a copy of the caller's context so progress sinks and
+    # other context variables follow the scene into the pool thread.
+    contexts = [contextvars.copy_context() for _ in items]
+    with ThreadPoolExecutor(
+        max_workers=min(max_in_flight, len(items)),
+        thread_name_prefix="ai-film-scene",
+    ) as executor:
+        return list(
+            executor.map(
+                lambda context, item: context.run(worker, item), contexts, items
+            )
+        )
+
+
 def _qwen_semantic_retry_enabled(
     model_family: str,
     repair_source_path: str | None,
@@ -1429,6 +1900,7 @@ def _non_retryable_comfyui_job_error(job_monitor: Dict[str, Any]) -> bool:
             "node '",
             "not in []",
             "prompt_outputs_failed_validation",
+            "runpod_submit_outcome_unknown",
         )
     )
 
@@ -1535,6 +2007,44 @@ def _visual_consistency_soft_min_score() -> int:
     )
 
 
+def _consistency_qa_longest_edge() -> int:
+    return max(
+        256,
+        min(
+            2048,
+            _safe_int(os.getenv("IMAGE_CONSISTENCY_QA_LONGEST_EDGE", "768"), 768),
+        ),
+    )
+
+
+def _local_consistency_verdict(
+    metrics: Dict[str, Any],
+    prefilter: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Settle a local near-duplicate failure without the vision model.
+
+    The score stays on the vision model's scale, below the soft minimum, so
+    repair attempts compare consistently whichever path judged them.
+    """
+    min_score = _visual_consistency_min_score()
+    soft_min_score = _visual_consistency_soft_min_score()
+    local_score = round(100 * _safe_float(prefilter.get("palette_min"), 0.0))
+    metrics.update(
+        {
+            "consistency_score": min(soft_min_score - 1, local_score),
+            "accepted": False,
+            "issues": list(prefilter.get("issues", [])),
+            "style_notes": "pré-filtro local: "
+            + ", ".join(prefilter.get("issues", [])),
+            "model": "local_prefilter",
+            "min_score": min_score,
+            "soft_min_score": soft_min_score,
+            "soft_pass": False,
+        }
+    )
+    return metrics
+
+
 def _select_consistency_repair_scene(
     scenes: List[Dict[str, Any]],
     visual_consistency: Dict[str, Any],
@@ -1934,27 +2444,45 @@ def _encode_comfyui_control_image(
 
     from PIL import Image, ImageFilter, ImageOps
 
+    from open3d_implementation.core.comfyui_assets import (
+        file_identity,
+        memoized_png_data_url,
+    )
+
     control_mode = _comfyui_control_image_mode()
-    if scene and control_mode == "semantic_depth":
-        control_image = _draw_semantic_hero_depth_image(scene, width, height)
-    elif scene and control_mode == "semantic_hero":
-        control_image = _draw_semantic_hero_control_image(scene, width, height)
-    else:
-        source_path = Path(source_image_path)
-        if not source_path.exists():
-            raise RuntimeError("control_image_missing")
-        with Image.open(source_path) as source_image:
-            control_image = (
-                source_image.convert("L")
-                .resize((width, height), Image.Resampling.LANCZOS)
-                .filter(ImageFilter.FIND_EDGES)
-            )
-            control_image = ImageOps.autocontrast(control_image).convert("RGB")
-    buffer = BytesIO()
-    control_image.save(buffer, format="PNG", optimize=True)
+    semantic = bool(scene) and control_mode in {"semantic_depth", "semantic_hero"}
+    source_path = Path(source_image_path)
+    if not semantic and not source_path.exists():
+        raise RuntimeError("control_image_missing")
+
+    def render() -> bytes:
+        if scene and control_mode == "semantic_depth":
+            control_image = _draw_semantic_hero_depth_image(scene, width, height)
+        elif scene and control_mode == "semantic_hero":
+            control_image = _draw_semantic_hero_control_image(scene, width, height)
+        else:
+            with Image.open(source_path) as source_image:
+                control_image = (
+                    source_image.convert("L")
+                    .resize((width, height), Image.Resampling.LANCZOS)
+                    .filter(ImageFilter.FIND_EDGES)
+                )
+                control_image = ImageOps.autocontrast(control_image).convert("RGB")
+        buffer = BytesIO()
+        control_image.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
 
-    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
-    return {"name": image_name, "image": f"data:image/png;base64,{encoded}"}
+    image = memoized_png_data_url(
+        {
+            "kind": "control",
+            "mode": control_mode if semantic else "edges",
+            "source": None if semantic else file_identity(source_path),
+            "scene": scene if semantic else None,
+            "size": [width, height],
+        },
+        render,
+    )
+    return {"name": image_name, "image": image}
 
 
 def _encode_comfyui_reference_image(
@@ -1968,42 +2496,59 @@ def _encode_comfyui_reference_image(
 
     from PIL import Image, ImageOps
 
+    from open3d_implementation.core.comfyui_assets import (
+        file_identity,
+        memoized_png_data_url,
+    )
+
     source_path = Path(source_image_path)
     if not source_path.exists():
         raise RuntimeError("ipadapter_reference_image_missing")
-    with Image.open(source_path) as source_image:
-        reference = source_image.convert("RGB")
-        if crop_box is not None:
-            left, top, right, bottom = crop_box
-            if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
-                raise ValueError("invalid_reference_crop_box")
-            reference = reference.crop(
-                (
-                    round(reference.width * left),
-                    round(reference.height * top),
-                    round(reference.width * right),
-                    round(reference.height * bottom),
+
+    def render() -> bytes:
+        with Image.open(source_path) as source_image:
+            reference = source_image.convert("RGB")
+            if crop_box is not None:
+                left, top, right, bottom = crop_box
+                if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
+                    raise ValueError("invalid_reference_crop_box")
+                reference = reference.crop(
+                    (
+                        round(reference.width * left),
+                        round(reference.height * top),
+                        round(reference.width * right),
+                        round(reference.height * bottom),
+                    )
                 )
-            )
-        if target_size:
-            contained = ImageOps.contain(
-                reference,
-                target_size,
-                method=Image.Resampling.LANCZOS,
-            )
-            background = Image.new("RGB", target_size, reference.getpixel((0, 0)))
-            offset = (
-                (target_size[0] - contained.width) // 2,
-                (target_size[1] - contained.height) // 2,
-            )
-            background.paste(contained, offset)
-            reference = background
-        else:
-            reference.thumbnail((1024, 1536), Image.Resampling.LANCZOS)
-    buffer = BytesIO()
-    reference.save(buffer, format="PNG", optimize=True)
-    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
-    return {"name": image_name, "image": f"data:image/png;base64,{encoded}"}
+            if target_size:
+                contained = ImageOps.contain(
+                    reference,
+                    target_size,
+                    method=Image.Resampling.LANCZOS,
+                )
+                background = Image.new("RGB", target_size, reference.getpixel((0, 0)))
+                offset = (
+                    (target_size[0] - contained.width) // 2,
+                    (target_size[1] - contained.height) // 2,
+                )
+                background.paste(contained, offset)
+                reference = background
+            else:
+                reference.thumbnail((1024, 1536), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        reference.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    image = memoized_png_data_url(
+        {
+            "kind": "reference",
+            "source": file_identity(source_path),
+            "target_size": target_size,
+            "crop_box": crop_box,
+        },
+        render,
+    )
+    return {"name": image_name, "image": image}
 
 
 def _hero_object_focus_boxes(
@@ -2077,35 +2622,53 @@ def _encode_comfyui_inpaint_image(
 
     from PIL import Image, ImageDraw, ImageFilter
 
+    from open3d_implementation.core.comfyui_assets import (
+        file_identity,
+        memoized_png_data_url,
+    )
+
     source_path = Path(source_image_path)
     if not source_path.exists():
         raise RuntimeError("inpaint_reference_image_missing")
-    with Image.open(source_path) as source_image:
-        inpaint_image = source_image.convert("RGB").resize(
-            (width, height), Image.Resampling.LANCZOS
-        )
+    focus_boxes = _hero_object_focus_boxes(scene)
 
-    alpha = Image.new("L", (width, height), 255)
-    draw = ImageDraw.Draw(alpha)
-    for left, top, right, bottom in _hero_object_focus_boxes(scene):
-        draw.rounded_rectangle(
-            (
-                int(width * left),
-                int(height * top),
-                int(width * right),
-                int(height * bottom),
-            ),
-            radius=max(10, width // 30),
-            fill=0,
-        )
-    alpha = alpha.filter(ImageFilter.GaussianBlur(radius=max(6, width // 80)))
-    inpaint_rgba = inpaint_image.convert("RGBA")
-    inpaint_rgba.putalpha(alpha)
+    def render() -> bytes:
+        with Image.open(source_path) as source_image:
+            inpaint_image = source_image.convert("RGB").resize(
+                (width, height), Image.Resampling.LANCZOS
+            )
 
-    buffer = BytesIO()
-    inpaint_rgba.save(buffer, format="PNG", optimize=True)
-    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
-    return {"name": image_name, "image": f"data:image/png;base64,{encoded}"}
+        alpha = Image.new("L", (width, height), 255)
+        draw = ImageDraw.Draw(alpha)
+        for left, top, right, bottom in focus_boxes:
+            draw.rounded_rectangle(
+                (
+                    int(width * left),
+                    int(height * top),
+                    int(width * right),
+                    int(height * bottom),
+                ),
+                radius=max(10, width // 30),
+                fill=0,
+            )
+        alpha = alpha.filter(ImageFilter.GaussianBlur(radius=max(6, width // 80)))
+        inpaint_rgba = inpaint_image.convert("RGBA")
+        inpaint_rgba.putalpha(alpha)
+
+        buffer = BytesIO()
+        inpaint_rgba.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    image = memoized_png_data_url(
+        {
+            "kind": "inpaint",
+            "source": file_identity(source_path),
+            "size": [width, height],
+            "focus_boxes": focus_boxes,
+        },
+        render,
+    )
+    return {"name": image_name, "image": image}
 
 
 def _build_flux2_klein_workflow(
@@ -2670,8 +3233,11 @@ def _submit_runpod_job(
     run_url: str,
     request_payload: Mapping[str, object],
     headers: Mapping[str, str],
-) -> tuple[requests.Response, List[Dict[str, int | str]]]:
+    post: Callable[..., Any] | None = None,
+    timeout: float = 30,
+) -> tuple[Any, List[Dict[str, int | str]]]:
     """Submit once, with one bounded retry for RunPod capacity propagation."""
+    post_request = post or requests.post
     retry_seconds = max(
         0,
         min(
@@ -2684,11 +3250,11 @@ def _submit_runpod_job(
     )
     submission_attempts: List[Dict[str, int | str]] = []
 
-    response = requests.post(
+    response = post_request(
         run_url,
         json=request_payload,
         headers=headers,
-        timeout=30,
+        timeout=timeout,
     )
     submission_attempts.append({"attempt": 1, "http_status": response.status_code})
 
@@ -2704,11 +3270,11 @@ def _submit_runpod_job(
         f"nova submissão em {retry_seconds}s..."
     )
     time.sleep(retry_seconds)
-    response = requests.post(
+    response = post_request(
         run_url,
         json=request_payload,
         headers=headers,
-        timeout=30,
+        timeout=timeout,
     )
     submission_attempts.append({"attempt": 2, "http_status": response.status_code})
     return response, submission_attempts
@@ -2755,6 +3321,49 @@ def _apply_runpod_execution_telemetry(
     job_monitor["cost_estimate_status"] = "execution_time_unavailable"
 
 
+def _write_runpod_output_image(
+    status_payload: Mapping[str, Any],
+    image_path: str,
+) -> str | None:
+    """Decode the first worker image; return an error code when unusable."""
+    images = (status_payload.get("output") or {}).get("images", [])
+    if not images:
+        return "completed_without_images"
+
+    image_b64 = images[0].get("data", "")
+    try:
+        with open(image_path, "wb") as output_file:
+            output_file.write(base64.b64decode(image_b64))
+    except (OSError, ValueError, binascii.Error) as exc:
+        return f"decode_failed:{type(exc).__name__}"
+
+    if not (os.path.exists(image_path) and os.path.getsize(image_path) > 1000):
+        return "invalid_decoded_image"
+    return None
+
+
+def _emit_scene_job_progress(job_monitor: Mapping[str, Any]) -> None:
+    from open3d_implementation.core.run_events import emit_progress
+
+    emit_progress(
+        "scene_job",
+        **{
+            key: job_monitor.get(key)
+            for key in (
+                "scene_id",
+                "attempt",
+                "job_id",
+                "provider",
+                "status",
+                "elapsed_seconds",
+                "queue_seconds",
+                "estimated_cost_usd",
+                "error",
+            )
+        },
+    )
+
+
 def _run_comfyui_image_attempt(
     *,
     scene: Dict[str, Any],
@@ -2779,13 +3388,38 @@ def _run_comfyui_image_attempt(
     semantic_repair_backend_override: str | None = None,
     qwen_inpaint_denoise_override: float | None = None,
     sdxl_inpaint_denoise_override: float | None = None,
+    cancel_event: threading.Event | None = None,
 ) -> tuple[Dict[str, Any], Dict[str, Any] | None, Dict[str, Any] | None]:
-    import base64
-    import binascii
+    """Submit, poll and QA one ComfyUI job.
+
+    ``cancel_event`` is set by a best-of-N sampler once a sibling candidate
+    has been accepted; this job is then cancelled on RunPod or, if it already
+    finished, returned without QA.
+    """
     import time
 
     import requests
 
+    from open3d_implementation.core.comfyui_assets import (
+        default_asset_store,
+        mark_endpoint_without_store,
+        mentions_stored_asset,
+        reference_stored_assets,
+        stage_input_images,
+    )
+    from open3d_implementation.core.runpod_client import (
+        EXECUTION_CLOCK,
+        RUNPOD_TERMINAL_STATUSES,
+        RunPodClientError,
+        RunPodPoll,
+        RunPodSubmitTimeout,
+        get_runpod_client,
+        is_runsync_url,
+        record_runpod_completion,
+        runpod_submit_timeout,
+        runpod_submit_url,
+    )
+
     headers = {"Authorization": f"Bearer {runpod_api_key}"}
     model_family = _comfyui_model_family()
     if control_strategy not in {"controlled_inpaint", "masked_inpaint"}:
@@ -2830,7 +3464,7 @@ def _run_comfyui_image_attempt(
         if qwen_edit_enabled
         else runpod_gpu_usd_per_second
     )
-    run_url = f"https://api.runpod.ai/v2/{effective_endpoint_id}/run"
+    run_url = runpod_submit_url(effective_endpoint_id)
     status_url_template = (
         f"https://api.runpod.ai/v2/{effective_endpoint_id}/status/{{job_id}}"
     )
@@ -3153,17 +3787,53 @@ def _run_comfyui_image_attempt(
         "last_remote_status": None,
     }
 
+    if cancel_event is not None and cancel_event.is_set():
+        job_monitor["status"] = "CANCELLED_EARLY_ACCEPT"
+        return job_monitor, None, None
+
+    # Distinct input images live once in the asset store; the workflow loads
+    # them by content hash and only the rest travel inline as base64.
+    staged_inputs = stage_input_images(
+        input_images,
+        store=default_asset_store(),
+        endpoint_id=effective_endpoint_id,
+    )
+    reference_stored_assets(workflow, staged_inputs.stored_names)
+    job_monitor["input_assets"] = {
+        "stored": len(staged_inputs.stored_names),
+        "uploaded": staged_inputs.uploaded,
+        "reused": staged_inputs.reused,
+        "inline": len(staged_inputs.inline_images),
+        "inline_chars": staged_inputs.inline_chars,
+    }
+
+    runpod_client = get_runpod_client()
+    job_monitor["runpod_transport"] = runpod_client.transport
     try:
         request_payload: Dict[str, Any] = {"input": {"workflow": workflow}}
-        if input_images:
-            request_payload["input"]["images"] = input_images
+        if staged_inputs.inline_images:
+            request_payload["input"]["images"] = staged_inputs.inline_images
         response, submission_attempts = _submit_runpod_job(
             run_url=run_url,
             request_payload=request_payload,
             headers=headers,
+            post=runpod_client.post,
+            timeout=runpod_submit_timeout(run_url),
         )
         job_monitor["submission_attempts"] = submission_attempts
-    except requests.RequestException as exc:
+    except RunPodSubmitTimeout as exc:
+        # The job may be queued and billing under an id we never received;
+        # resubmitting would pay for the scene twice.
+        EXECUTION_CLOCK.record_submit_timeout(
+            effective_endpoint_id, runpod_submit_timeout(run_url)
+        )
+        job_monitor["status"] = "SUBMIT_UNKNOWN"
+        job_monitor["error"] = f"runpod_submit_outcome_unknown: {exc}"
+        job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
+        job_monitor["estimated_cost_usd"] = 0.0
+        job_monitor["cost_estimate_status"] = "unknown_job_may_be_billing"
+        return job_monitor, None, None
+    except (requests.RequestException, RunPodClientError) as exc:
         job_monitor["status"] = "SUBMIT_FAILED"
         job_monitor["error"] = f"{type(exc).__name__}: {exc}"
         job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
@@ -3179,151 +3849,171 @@ def _run_comfyui_image_attempt(
         job_monitor["cost_estimate_status"] = "not_submitted"
         return job_monitor, None, None
 
-    job_id = response.json().get("id")
+    submit_payload = response.json()
+    job_id = submit_payload.get("id")
     job_monitor["job_id"] = job_id
+    job_monitor["submit_mode"] = "runsync" if is_runsync_url(run_url) else "run"
     print(f"🆔 Job ID: {job_id}")
+    _emit_scene_job_progress(job_monitor)
 
-    max_wait = int(os.getenv("COMFYUI_RUNPOD_MAX_WAIT_SECONDS", "120"))
-    wait_time = 0
-    while wait_time < max_wait:
-        time.sleep(3)
-        wait_time += 3
-
-        try:
-            status_response = requests.get(
-                status_url_template.format(job_id=job_id),
-                headers=headers,
-                timeout=10,
-            )
-        except requests.RequestException as exc:
+    def record_poll(poll: RunPodPoll) -> None:
+        if poll.error:
             job_monitor["polls"].append(
                 {
-                    "status": f"POLL_FAILED:{type(exc).__name__}",
-                    "wait_seconds": wait_time,
+                    "status": f"POLL_FAILED:{poll.error}",
+                    "wait_seconds": poll.wait_seconds,
                 }
             )
-            continue
-
-        if status_response.status_code != 200:
-            print(f"⚠️ Erro ao consultar status: {status_response.status_code}")
-            continue
-
-        status_payload = status_response.json()
-        job_status = status_payload.get("status")
+            _emit_scene_job_progress(
+                {**job_monitor, "status": job_monitor["polls"][-1]["status"]}
+            )
+            return
+        if poll.payload is None:
+            print(f"⚠️ Erro ao consultar status: {poll.http_status}")
+            return
+        job_status = poll.status
         job_monitor["status"] = job_status
         job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
         _apply_runpod_execution_telemetry(
             job_monitor,
-            status_payload,
+            poll.payload,
             effective_gpu_usd_per_second,
         )
-        job_monitor["polls"].append({"status": job_status, "wait_seconds": wait_time})
+        job_monitor["polls"].append(
+            {"status": job_status, "wait_seconds": poll.wait_seconds}
+        )
+        _emit_scene_job_progress(job_monitor)
+        if job_status not in RUNPOD_TERMINAL_STATUSES:
+            print(f"⏳ Status: {job_status} ({poll.wait_seconds}s)")
 
-        if job_status == "COMPLETED":
-            images = status_payload.get("output", {}).get("images", [])
-            if not images:
-                job_monitor["error"] = "completed_without_images"
-                break
+    max_wait = int(os.getenv("COMFYUI_RUNPOD_MAX_WAIT_SECONDS", "120"))
+    if str(submit_payload.get("status") or "") in RUNPOD_TERMINAL_STATUSES:
+        # /runsync returned the finished job; no status polling is needed.
+        record_runpod_completion(effective_endpoint_id, submit_payload)
+        record_poll(
+            RunPodPoll(
+                round(time.monotonic() - job_started_at, 1),
+                response.status_code,
+                submit_payload,
+            )
+        )
+        status_payload: Mapping[str, Any] | None = submit_payload
+    else:
+        status_payload = runpod_client.wait_for_job(
+            endpoint_id=effective_endpoint_id,
+            status_url=status_url_template.format(job_id=job_id),
+            headers=headers,
+            max_wait_seconds=max_wait,
+            on_poll=record_poll,
+            should_stop=cancel_event.is_set if cancel_event is not None else None,
+        )
 
-            image_b64 = images[0].get("data", "")
-            try:
-                with open(image_path, "wb") as output_file:
-                    output_file.write(base64.b64decode(image_b64))
-            except (OSError, ValueError, binascii.Error) as exc:
-                job_monitor["error"] = f"decode_failed:{type(exc).__name__}"
-                break
+    if status_payload is None and cancel_event is not None and cancel_event.is_set():
+        job_monitor["status"] = "CANCELLED_EARLY_ACCEPT"
+        job_monitor["error"] = "cancelled_after_sibling_accepted"
+        if job_id:
+            _cancel_runpod_job(effective_endpoint_id, runpod_api_key, job_id)
+        job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
+        return job_monitor, None, None
 
-            if not (os.path.exists(image_path) and os.path.getsize(image_path) > 1000):
-                job_monitor["error"] = "invalid_decoded_image"
-                break
+    if status_payload is None:
+        job_monitor["status"] = "LOCAL_TIMEOUT"
+        job_monitor["error"] = f"timeout_after_{max_wait}s"
+        if job_id:
+            _cancel_runpod_job(effective_endpoint_id, runpod_api_key, job_id)
+        job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
+        return job_monitor, None, None
 
-            image_record = {
-                "scene_id": scene["scene_id"],
-                "image_path": image_path,
-                "prompt": directed_prompt,
-                "base_prompt": scene["prompt"],
-                "style": image_style,
-                "quality_preset": quality_preset_key,
-                "checkpoint": effective_checkpoint,
-                "seed": scene_seed,
-                "duration": scene.get("duration", 6),
-                "camera_motion": scene.get(
-                    "camera_motion",
-                    _motion_plan(scene)["description"],
-                ),
-                "runpod_job_id": job_id,
-                "generation_method": generation_method,
-                "model_family": model_family,
-                "execution_model_family": execution_model_family,
-                "controlled_backend_fallback": controlled_backend_fallback,
-                "controlled_workflow": effective_controlled_workflow,
-                "control_strategy": (
-                    control_strategy if effective_controlled_workflow else ""
-                ),
-                "controlnet_model": controlnet_model,
-                "control_image": control_image_name or "",
-                "inpaint_image": qwen_inpaint_image_name or inpaint_image_name or "",
-                "qwen_prop_reference_image": qwen_prop_reference_image_name or "",
-                "refiner_enabled": refiner_enabled,
-                "refiner_checkpoint": refiner_checkpoint,
-            }
-            job_monitor["image_path"] = image_path
-            technical_metrics = _probe_image_quality(image_path, scene=scene)
-            semantic_metrics = _evaluate_image_semantics(
-                image_path,
-                scene,
-                directed_prompt,
-                image_style,
-                visual_bible,
-            )
-            combined_metrics = _combine_image_quality(
-                technical_metrics,
-                semantic_metrics,
-            )
-            image_metric = {
-                "scene_id": scene["scene_id"],
-                "generation_method": generation_method,
-                "attempt": attempt,
-                "style": image_style,
-                "quality_preset": quality_preset_key,
-                "checkpoint": effective_checkpoint,
-                "model_family": model_family,
-                "execution_model_family": execution_model_family,
-                "controlled_backend_fallback": controlled_backend_fallback,
-                "seed": scene_seed,
-                "controlled_workflow": effective_controlled_workflow,
-                "control_strategy": (
-                    control_strategy if effective_controlled_workflow else ""
-                ),
-                "controlnet_model": controlnet_model,
-                "control_image": control_image_name or "",
-                "inpaint_image": qwen_inpaint_image_name or inpaint_image_name or "",
-                "qwen_prop_reference_image": qwen_prop_reference_image_name or "",
-                "refiner_enabled": refiner_enabled,
-                "refiner_checkpoint": refiner_checkpoint,
-                **combined_metrics,
-            }
-            job_monitor["semantic_score"] = combined_metrics.get("semantic_score")
-            job_monitor["quality_score"] = combined_metrics.get("quality_score")
-            job_monitor["semantic_accepted"] = combined_metrics.get("semantic_accepted")
-            job_monitor["quality_issues"] = combined_metrics.get("issues", [])
-            job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
-            return job_monitor, image_record, image_metric
-
-        if job_status in ("FAILED", "CANCELLED", "TIMED_OUT"):
-            job_monitor["error"] = status_payload.get("error")
-            break
-
-        print(f"⏳ Status: {job_status} ({wait_time}s)")
+    output_error = (
+        _write_runpod_output_image(status_payload, image_path)
+        if status_payload.get("status") == "COMPLETED"
+        else status_payload.get("error")
+    )
+    if status_payload.get("status") != "COMPLETED" or output_error:
+        if staged_inputs.stored_names and mentions_stored_asset(
+            output_error, staged_inputs.stored_names
+        ):
+            # The worker cannot see the store; later attempts go inline.
+            mark_endpoint_without_store(effective_endpoint_id)
+            job_monitor["input_assets"]["worker_missing_store"] = True
+        job_monitor["error"] = output_error
+        job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
+        return job_monitor, None, None
 
-    else:
-        job_monitor["status"] = "LOCAL_TIMEOUT"
-        job_monitor["error"] = f"timeout_after_{max_wait}s"
-        if job_id:
-            _cancel_runpod_job(effective_endpoint_id, runpod_api_key, job_id)
+    if cancel_event is not None and cancel_event.is_set():
+        # Already billed, but a sibling won: skip the semantic QA pass.
+        job_monitor["qa_skipped"] = "sibling_accepted"
+        job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
+        return job_monitor, None, None
 
+    image_record = {
+        "scene_id": scene["scene_id"],
+        "image_path": image_path,
+        "prompt": directed_prompt,
+        "base_prompt": scene["prompt"],
+        "style": image_style,
+        "quality_preset": quality_preset_key,
+        "checkpoint": effective_checkpoint,
+        "seed": scene_seed,
+        "duration": scene.get("duration", 6),
+        "camera_motion": scene.get(
+            "camera_motion",
+            _motion_plan(scene)["description"],
+        ),
+        "runpod_job_id": job_id,
+        "generation_method": generation_method,
+        "model_family": model_family,
+        "execution_model_family": execution_model_family,
+        "controlled_backend_fallback": controlled_backend_fallback,
+        "controlled_workflow": effective_controlled_workflow,
+        "control_strategy": (control_strategy if effective_controlled_workflow else ""),
+        "controlnet_model": controlnet_model,
+        "control_image": control_image_name or "",
+        "inpaint_image": qwen_inpaint_image_name or inpaint_image_name or "",
+        "qwen_prop_reference_image": qwen_prop_reference_image_name or "",
+        "refiner_enabled": refiner_enabled,
+        "refiner_checkpoint": refiner_checkpoint,
+    }
+    job_monitor["image_path"] = image_path
+    technical_metrics = _probe_image_quality(image_path, scene=scene)
+    semantic_metrics = _evaluate_image_semantics(
+        image_path,
+        scene,
+        directed_prompt,
+        image_style,
+        visual_bible,
+    )
+    combined_metrics = _combine_image_quality(
+        technical_metrics,
+        semantic_metrics,
+    )
+    image_metric = {
+        "scene_id": scene["scene_id"],
+        "generation_method": generation_method,
+        "attempt": attempt,
+        "style": image_style,
+        "quality_preset": quality_preset_key,
+        "checkpoint": effective_checkpoint,
+        "model_family": model_family,
+        "execution_model_family": execution_model_family,
+        "controlled_backend_fallback": controlled_backend_fallback,
+        "seed": scene_seed,
+        "controlled_workflow": effective_controlled_workflow,
+        "control_strategy": (control_strategy if effective_controlled_workflow else ""),
+        "controlnet_model": controlnet_model,
+        "control_image": control_image_name or "",
+        "inpaint_image": qwen_inpaint_image_name or inpaint_image_name or "",
+        "qwen_prop_reference_image": qwen_prop_reference_image_name or "",
+        "refiner_enabled": refiner_enabled,
+        "refiner_checkpoint": refiner_checkpoint,
+        **combined_metrics,
+    }
+    job_monitor["semantic_score"] = combined_metrics.get("semantic_score")
+    job_monitor["quality_score"] = combined_metrics.get("quality_score")
+    job_monitor["semantic_accepted"] = combined_metrics.get("semantic_accepted")
+    job_monitor["quality_issues"] = combined_metrics.get("issues", [])
     job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
-    return job_monitor, None, None
+    return job_monitor, image_record, image_metric
 
 
 def _extract_gemini_image_bytes(response: Any) -> bytes | None:
@@ -3441,6 +4131,7 @@ def _run_gemini_image_attempt(
         "Do not copy the reference image pose, camera angle, body angle, background, tree placement, room layout, foreground object or overall composition; each scene must have distinct blocking and scene geography."
     )
 
+    _emit_scene_job_progress(job_monitor)
     try:
         client = genai.Client(api_key=api_key)
         contents: Any = generation_prompt
@@ -3478,6 +4169,7 @@ def _run_gemini_image_attempt(
         job_monitor["status"] = "FAILED"
         job_monitor["error"] = f"{type(exc).__name__}: {exc}"
         job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
+        _emit_scene_job_progress(job_monitor)
         return job_monitor, None, None
 
     job_monitor["elapsed_seconds"] = round(time.monotonic() - job_started_at, 3)
@@ -3501,6 +4193,7 @@ def _run_gemini_image_attempt(
 
     job_monitor["status"] = "COMPLETED"
     job_monitor["image_path"] = image_path
+    _emit_scene_job_progress(job_monitor)
     image_record = {
         "scene_id": scene["scene_id"],
         "image_path": image_path,
@@ -3799,6 +4492,28 @@ def _semantic_qa_model(provider: str) -> str:
     )
 
 
+def _semantic_qa_model_revision(provider: str) -> str:
+    if provider != "local":
+        return ""
+    try:
+        from open3d_implementation.core.local_visual_qa import (
+            DEFAULT_LOCAL_AGE_QA_REVISION,
+            DEFAULT_LOCAL_VISION_QA_REVISION,
+        )
+    except ImportError:
+        DEFAULT_LOCAL_AGE_QA_REVISION = DEFAULT_LOCAL_VISION_QA_REVISION = ""
+    return "|".join(
+        [
+            os.getenv("LOCAL_VISION_QA_REVISION", "").strip()
+            or DEFAULT_LOCAL_VISION_QA_REVISION,
+            os.getenv("LOCAL_AGE_QA_MODEL", "").strip(),
+            os.getenv("LOCAL_AGE_QA_REVISION", "").strip()
+            or DEFAULT_LOCAL_AGE_QA_REVISION,
+            os.getenv("LOCAL_VISION_QA_BACKEND", "float32").strip().lower(),
+        ]
+    )
+
+
 SEMANTIC_QA_RESPONSE_JSON_SCHEMA = {
     "type": "object",
     "properties": {
@@ -3995,6 +4710,7 @@ def _evaluate_semantic_qa_with_local_vlm(
             "matched": answer.matched,
             "raw_response": answer.raw_response,
             "question": answer.criterion.question,
+            "backend": answer.backend,
         }
         for answer in answers
     ]
@@ -4081,6 +4797,7 @@ def _evaluate_semantic_qa_with_local_vlm(
                     "crop_box": list(estimate.crop_box),
                     "provider": "local_age_classifier",
                     "model": estimate.model_name,
+                    "backend": estimate.backend,
                 }
             )
     critical_failures = list(dict.fromkeys(critical_failures))
@@ -4383,6 +5100,38 @@ JSON schema:
 }}
 """
 
+    from open3d_implementation.core.semantic_qa_cache import (
+        default_semantic_qa_cache,
+        file_sha256,
+        semantic_qa_cache_key,
+    )
+
+    cache = default_semantic_qa_cache()
+    cache_key = ""
+    if cache is not None:
+        cache_key = semantic_qa_cache_key(
+            image_sha256=file_sha256(path),
+            contract={
+                "scene": scene,
+                "scene_contract": scene_contract,
+                "directed_prompt": directed_prompt,
+                "style_key": style_key,
+                "visual_bible": visual_bible or {},
+                "min_score": _image_semantic_min_score(),
+            },
+            prompt=prompt,
+            provider=primary_provider,
+            model=str(metrics["model"]),
+            revision=_semantic_qa_model_revision(primary_provider),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None and isinstance(cached.get("parsed"), dict):
+            metrics.update(cached.get("metrics") or {})
+            _apply_semantic_qa_result(metrics, cached["parsed"], hero_objects)
+            metrics["cache_hit"] = True
+            return metrics
+        metrics["cache_hit"] = False
+
     parsed: Dict[str, Any] | None = None
     provider_errors: List[str] = []
     if primary_provider == "local":
@@ -4491,6 +5240,25 @@ JSON schema:
     if provider_errors:
         metrics["provider_warnings"] = provider_errors
     _apply_semantic_qa_result(metrics, parsed, hero_objects)
+    # The key names the primary provider; a fallback verdict stored under it
+    # would keep answering for that provider after a transient outage.
+    if cache is not None and not metrics.get("fallback_used"):
+        cache.put(
+            cache_key,
+            {
+                "parsed": parsed,
+                "metrics": {
+                    key: metrics[key]
+                    for key in (
+                        "provider",
+                        "model",
+                        "fallback_used",
+                        "provider_warnings",
+                    )
+                    if key in metrics
+                },
+            },
+        )
 
     return metrics
 
@@ -4541,6 +5309,7 @@ def _combine_image_quality(
         "semantic_qa_provider": semantic_metrics.get("provider"),
         "semantic_qa_model": semantic_metrics.get("model"),
         "semantic_qa_fallback_used": bool(semantic_metrics.get("fallback_used")),
+        "semantic_qa_cache_hit": bool(semantic_metrics.get("cache_hit")),
         "semantic_qa_provider_warnings": semantic_metrics.get("provider_warnings", []),
         "semantic_qa_error": semantic_metrics.get("error", ""),
         "semantic_qa_evidence": semantic_metrics.get("evidence", []),
@@ -4731,6 +5500,22 @@ def _evaluate_image_set_consistency(
         and Path(item["image_path"]).exists()
         and Path(item["image_path"]).stat().st_size > 1000
     ]
+    if len(valid_images) >= 2:
+        from open3d_implementation.core.consistency_prefilter import (
+            consistency_prefilter_enabled,
+            prefilter_image_set,
+        )
+
+        if consistency_prefilter_enabled():
+            try:
+                prefilter = prefilter_image_set(valid_images[:5])
+            except (OSError, ValueError) as exc:
+                prefilter = {"verdict": "ambiguous", "error": type(exc).__name__}
+            metrics["prefilter"] = prefilter
+            # A local pass cannot see identity/costume/medium drift, so only
+            # near-duplicate failures skip the vision model.
+            if prefilter["verdict"] == "fail":
+                return _local_consistency_verdict(metrics, prefilter)
     if not api_key or len(valid_images) < 2:
         metrics["issues"].append("consistency_qa_insufficient_inputs")
         return metrics
@@ -4747,7 +5532,7 @@ def _evaluate_image_set_consistency(
         prompt = f"""
 Avalie se estas imagens pertencem ao mesmo filme.
 Use a bíblia visual abaixo como fonte da verdade:
-{json.dumps(visual_bible, ensure_ascii=False)}
+{json.dumps(visual_bible, ensure_ascii=False, separators=(",", ":"))}
 
 Penalize: mudança de estilo/medium entre cenas, mudança de idade/figurino da protagonista,
 paleta incompatível, cenas com acabamento de gravura enquanto outras são aquarela/foto,
@@ -4765,10 +5550,16 @@ Retorne somente JSON válido:
   "style_notes": "diagnóstico curto"
 }}
 """
+        from open3d_implementation.core.consistency_prefilter import downscaled_jpeg
+
         contents: List[Any] = [prompt]
+        longest_edge = _consistency_qa_longest_edge()
         for path in valid_images[:5]:
             contents.append(
-                types.Part.from_bytes(data=path.read_bytes(), mime_type="image/png")
+                types.Part.from_bytes(
+                    data=downscaled_jpeg(path, longest_edge),
+                    mime_type="image/jpeg",
+                )
             )
         response = client.models.generate_content(
             model=str(metrics["model"]),
@@ -4824,10 +5615,48 @@ Retorne somente JSON válido:
     return metrics
 
 
+def _measure_image_stats(
+    path: Path,
+    focus_box: tuple[float, float, float, float] | None,
+) -> Dict[str, Any]:
+    from PIL import Image, ImageFilter, ImageStat
+
+    with Image.open(path) as image:
+        image.load()
+        grayscale = image.convert("L")
+        stat = ImageStat.Stat(grayscale)
+        edge_stat = ImageStat.Stat(grayscale.filter(ImageFilter.FIND_EDGES))
+        stats: Dict[str, Any] = {
+            "width": image.size[0],
+            "height": image.size[1],
+            "mode": image.mode,
+            "contrast": stat.stddev[0] if stat.stddev else 0.0,
+            "edge_sharpness": edge_stat.stddev[0] if edge_stat.stddev else 0.0,
+        }
+        if focus_box is not None:
+            left, top, right, bottom = focus_box
+            width, height = image.size
+            focus = grayscale.crop(
+                (
+                    int(width * left),
+                    int(height * top),
+                    int(width * right),
+                    int(height * bottom),
+                )
+            )
+            focus_edge_stat = ImageStat.Stat(focus.filter(ImageFilter.FIND_EDGES))
+            stats["focal_edge_sharpness"] = (
+                focus_edge_stat.stddev[0] if focus_edge_stat.stddev else 0.0
+            )
+    return stats
+
+
 def _probe_image_quality(
     image_path: str,
     scene: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
+    from open3d_implementation.core.probe_cache import cached_probe
+
     path = Path(image_path)
     metrics: Dict[str, Any] = {
         "path": image_path,
@@ -4844,38 +5673,28 @@ def _probe_image_quality(
         return metrics
 
     try:
-        from PIL import Image, ImageFilter, ImageStat
-
-        with Image.open(path) as image:
-            image.load()
-            metrics["width"], metrics["height"] = image.size
-            metrics["mode"] = image.mode
-            grayscale = image.convert("L")
-            stat = ImageStat.Stat(grayscale)
-            contrast = stat.stddev[0] if stat.stddev else 0.0
-            edge_stat = ImageStat.Stat(grayscale.filter(ImageFilter.FIND_EDGES))
-            edge_sharpness = edge_stat.stddev[0] if edge_stat.stddev else 0.0
-            sharpness_for_gate = edge_sharpness
-            metrics["contrast"] = round(contrast, 2)
-            metrics["edge_sharpness"] = round(edge_sharpness, 2)
-            metrics["sharpness_gate_scope"] = "global"
-            if scene and _hero_object_requirements(scene):
-                left, top, right, bottom = _hero_object_quality_box(scene)
-                width, height = image.size
-                focus = grayscale.crop(
-                    (
-                        int(width * left),
-                        int(height * top),
-                        int(width * right),
-                        int(height * bottom),
-                    )
-                )
-                focus_edge_stat = ImageStat.Stat(focus.filter(ImageFilter.FIND_EDGES))
-                sharpness_for_gate = (
-                    focus_edge_stat.stddev[0] if focus_edge_stat.stddev else 0.0
-                )
-                metrics["focal_edge_sharpness"] = round(sharpness_for_gate, 2)
-                metrics["sharpness_gate_scope"] = "hero_object"
+        focus_box = (
+            _hero_object_quality_box(scene)
+            if scene and _hero_object_requirements(scene)
+            else None
+        )
+        image_stats: Dict[str, Any] = cached_probe(
+            path,
+            f"image_stats:{','.join(map(str, focus_box)) if focus_box else 'global'}",
+            lambda: _measure_image_stats(path, focus_box),
+        )
+        metrics["width"] = image_stats["width"]
+        metrics["height"] = image_stats["height"]
+        metrics["mode"] = image_stats["mode"]
+        contrast = image_stats["contrast"]
+        sharpness_for_gate = image_stats["edge_sharpness"]
+        metrics["contrast"] = round(contrast, 2)
+        metrics["edge_sharpness"] = round(image_stats["edge_sharpness"], 2)
+        metrics["sharpness_gate_scope"] = "global"
+        if focus_box is not None:
+            sharpness_for_gate = image_stats["focal_edge_sharpness"]
+            metrics["focal_edge_sharpness"] = round(sharpness_for_gate, 2)
+            metrics["sharpness_gate_scope"] = "hero_object"
 
         pixel_count = int(metrics["width"]) * int(metrics["height"])
         min_edge_sharpness = _image_min_edge_sharpness()
@@ -4900,6 +5719,76 @@ def _probe_image_quality(
     return metrics
 
 
+def _ffprobe_format(
+    path: Path,
+    errors: List[str] | None = None,
+) -> Dict[str, Any] | None:
+    """ffprobe ``format`` duration/size/bit_rate, cached per file version."""
+    from open3d_implementation.core.probe_cache import cached_probe
+
+    def probe() -> Dict[str, Any] | None:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration,size,bit_rate",
+                "-of",
+                "json",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            if errors is not None:
+                errors.append("ffprobe_failed")
+            return None
+        try:
+            return json.loads(result.stdout).get("format", {})
+        except (json.JSONDecodeError, AttributeError):
+            if errors is not None:
+                errors.append("ffprobe_invalid_json")
+            return None
+
+    return cached_probe(path, "ffprobe_format", probe)
+
+
+def _ffprobe_video_stream(path: Path) -> Dict[str, Any] | None:
+    """First video stream geometry/codec, cached per file version."""
+    from open3d_implementation.core.probe_cache import cached_probe
+
+    def probe() -> Dict[str, Any] | None:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "v:0",
+                "-show_entries",
+                "stream=codec_name,width,height,r_frame_rate,pix_fmt",
+                "-of",
+                "json",
+                str(path),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            return None
+        try:
+            streams = json.loads(result.stdout).get("streams") or []
+        except (json.JSONDecodeError, AttributeError):
+            return None
+        return streams[0] if streams else None
+
+    return cached_probe(path, "ffprobe_video_stream", probe)
+
+
 def _probe_media_quality(media_path: str, media_type: str) -> Dict[str, Any]:
     path = Path(media_path)
     metrics: Dict[str, Any] = {
@@ -4917,32 +5806,12 @@ def _probe_media_quality(media_path: str, media_type: str) -> Dict[str, Any]:
         metrics["issues"].append("missing_file")
         return metrics
 
-    result = subprocess.run(
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-show_entries",
-            "format=duration,size,bit_rate",
-            "-of",
-            "json",
-            str(path),
-        ],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode != 0:
-        metrics["issues"].append("ffprobe_failed")
-        return metrics
-
-    try:
-        payload = json.loads(result.stdout)
-    except json.JSONDecodeError:
-        metrics["issues"].append("ffprobe_invalid_json")
+    probe_error: List[str] = []
+    fmt = _ffprobe_format(path, probe_error)
+    if fmt is None:
+        metrics["issues"].extend(probe_error)
         return metrics
 
-    fmt = payload.get("format", {})
     duration = _safe_float(fmt.get("duration"))
     bit_rate = int(_safe_float(fmt.get("bit_rate")))
     metrics["duration_seconds"] = round(duration, 3)
@@ -4972,52 +5841,36 @@ def _audio_loudness_target_lufs() -> float:
     return _safe_float(os.getenv("AUDIO_LOUDNESS_TARGET_LUFS", "-14.0"))
 
 
-def _measure_audio_loudness(audio_path: str) -> Dict[str, Any]:
-    if not shutil.which("ffmpeg"):
-        return {"issues": ["ffmpeg_unavailable_for_loudness"]}
-    result = subprocess.run(
-        [
-            "ffmpeg",
-            "-hide_banner",
-            "-nostats",
-            "-i",
-            audio_path,
-            "-af",
-            (
-                "loudnorm=I="
-                f"{_audio_loudness_target_lufs():.1f}:TP=-1.5:LRA=11:"
-                "print_format=json"
-            ),
-            "-f",
-            "null",
-            "-",
-        ],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if result.returncode != 0:
-        return {"issues": ["loudness_probe_failed"]}
-    match = re.search(r"\{\s*\"input_i\".*?\}", result.stderr, flags=re.S)
-    if not match:
-        return {"issues": ["loudness_probe_missing_json"]}
-    try:
-        payload = json.loads(match.group(0))
-    except json.JSONDecodeError:
-        return {"issues": ["loudness_probe_invalid_json"]}
-    return {
-        "input_i_lufs": _safe_float(payload.get("input_i")),
-        "input_tp_db": _safe_float(payload.get("input_tp")),
-        "input_lra_lu": _safe_float(payload.get("input_lra")),
-        "target_i_lufs": _audio_loudness_target_lufs(),
-        "normalization": "loudnorm",
-        "issues": [],
-    }
+# ITU-R BS.1770 K-weighting at 48 kHz: high-shelf pre-filter, then RLB high-pass.
+_K_WEIGHTING_48K = (
+    (
+        (1.53512485958697, -2.69169618940638, 1.19839281085285),
+        (1.0, -1.69065929318241, 0.73248077421585),
+    ),
+    (
+        (1.0, -2.0, 1.0),
+        (1.0, -1.99004745483398, 0.99007225036621),
+    ),
+)
+_AUDIO_ANALYSIS_RATE = 48000
+_SILENCE_POWER = 1e-5  # -50 dBFS
 
 
-def _audio_waveform_samples(audio_path: str, bins: int = 48) -> List[float]:
-    if bins <= 0 or not shutil.which("ffmpeg"):
-        return []
+def _analyze_audio(audio_path: str, bins: int = 48) -> Dict[str, Any]:
+    """Decode once and derive waveform, levels, silence and R128 loudness.
+
+    ffmpeg only decodes to 48 kHz mono float PCM; every statistic is a NumPy
+    reduction over that buffer. Loudness follows BS.1770 gating with the
+    K-weighting applied in the frequency domain, so it estimates what
+    ``loudnorm`` reports rather than reproducing it bit for bit. The peak is
+    the sample peak, a lower bound on true peak.
+    """
+    if not shutil.which("ffmpeg"):
+        return {"issues": ["ffmpeg_unavailable_for_audio_analysis"]}
+    try:
+        import numpy as np
+    except ImportError:
+        return {"issues": ["numpy_unavailable_for_audio_analysis"]}
     result = subprocess.run(
         [
             "ffmpeg",
@@ -5029,34 +5882,107 @@ def _audio_waveform_samples(audio_path: str, bins: int = 48) -> List[float]:
             "-ac",
             "1",
             "-ar",
-            "8000",
+            str(_AUDIO_ANALYSIS_RATE),
             "-f",
-            "s16le",
+            "f32le",
             "-",
         ],
         capture_output=True,
         check=False,
     )
-    if result.returncode != 0 or not result.stdout:
-        return []
-    sample_count = len(result.stdout) // 2
-    if sample_count <= 0:
-        return []
-    samples = struct.unpack(f"<{sample_count}h", result.stdout[: sample_count * 2])
-    chunk_size = max(1, math.ceil(sample_count / bins))
-    values: List[float] = []
-    for start in range(0, sample_count, chunk_size):
-        chunk = samples[start : start + chunk_size]
-        if not chunk:
-            continue
-        rms = math.sqrt(
-            sum(float(sample) * float(sample) for sample in chunk) / len(chunk)
-        )
-        values.append(rms)
-    peak = max(values) if values else 0
-    if peak <= 0:
-        return [0.0 for _ in range(min(bins, len(values) or bins))]
-    return [round(min(1.0, value / peak), 3) for value in values[:bins]]
+    if result.returncode != 0:
+        return {"issues": ["audio_analysis_decode_failed"]}
+    samples = np.frombuffer(result.stdout, dtype="<f4").astype(np.float64)
+    if samples.size == 0:
+        return {"issues": ["audio_analysis_empty"]}
+    rate = _AUDIO_ANALYSIS_RATE
+    squares = samples * samples
+
+    chunk = max(1, math.ceil(samples.size / max(1, bins)))
+    starts = np.arange(0, samples.size, chunk)
+    bin_rms = np.sqrt(
+        np.add.reduceat(squares, starts) / np.diff(np.append(starts, samples.size))
+    )
+    top = float(bin_rms.max())
+    waveform = (
+        [round(float(value), 3) for value in np.minimum(1.0, bin_rms / top)[:bins]]
+        if top > 0
+        else [0.0] * min(bins, bin_rms.size)
+    )
+
+    window = rate // 20
+    usable = samples.size // window * window
+    window_power = (
+        squares[:usable].reshape(-1, window).mean(axis=1)
+        if usable
+        else squares.mean(keepdims=True)
+    )
+    silence_ratio = float(np.mean(window_power < _SILENCE_POWER))
+
+    # Pad well past the end so the filter tail does not wrap onto the start.
+    size = 1 << int(samples.size + rate // 2 - 1).bit_length()
+    z = np.exp(-2j * np.pi * np.fft.rfftfreq(size))
+    response = np.ones_like(z)
+    for b, a in _K_WEIGHTING_48K:
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+    weighted = np.fft.irfft(np.fft.rfft(samples, size) * response, size)[: samples.size]
+    energy = np.concatenate(([0.0], np.cumsum(weighted * weighted)))
+
+    def block_power(seconds: float) -> Any:
+        length = min(samples.size, int(rate * seconds))
+        block_starts = np.arange(0, samples.size - length + 1, rate // 10)
+        return (energy[block_starts + length] - energy[block_starts]) / length
+
+    def lufs(power: Any) -> Any:
+        return -0.691 + 10 * np.log10(np.maximum(power, 1e-12))
+
+    momentary = block_power(0.4)
+    momentary = momentary[lufs(momentary) > -70.0]
+    if momentary.size:
+        momentary = momentary[lufs(momentary) > lufs(momentary.mean()) - 10.0]
+    short_term = block_power(3.0)
+    short_term = short_term[lufs(short_term) > -70.0]
+    if short_term.size:
+        short_term = lufs(short_term[lufs(short_term) > lufs(short_term.mean()) - 20.0])
+    loudness_range = (
+        float(np.percentile(short_term, 95) - np.percentile(short_term, 10))
+        if short_term.size
+        else 0.0
+    )
+    peak = float(np.max(np.abs(samples)))
+    return {
+        "duration_seconds": round(samples.size / rate, 3),
+        "peak_dbfs": round(20 * math.log10(peak), 2) if peak > 0 else -120.0,
+        "rms_dbfs": round(float(10 * np.log10(max(squares.mean(), 1e-12))), 2),
+        "silence_ratio": round(silence_ratio, 3),
+        "waveform": waveform,
+        "loudness": {
+            "input_i_lufs": (
+                round(float(lufs(momentary.mean())), 2) if momentary.size else -70.0
+            ),
+            "input_tp_db": round(20 * math.log10(peak), 2) if peak > 0 else -120.0,
+            "input_lra_lu": round(loudness_range, 2),
+            "target_i_lufs": _audio_loudness_target_lufs(),
+            "normalization": "loudnorm",
+            "measurement": "bs1770_numpy",
+            "issues": [],
+        },
+        "issues": [],
+    }
+
+
+def _audio_analysis_fields(audio_path: str) -> Dict[str, Any]:
+    """Fields ``_audio_quality_gate`` reads, from one ``_analyze_audio`` pass."""
+    analysis = _analyze_audio(audio_path)
+    if "loudness" not in analysis:
+        return {"loudness": {"issues": analysis["issues"]}, "waveform": []}
+    return {
+        "loudness": analysis["loudness"],
+        "waveform": analysis["waveform"],
+        "audio_levels": {
+            key: analysis[key] for key in ("peak_dbfs", "rms_dbfs", "silence_ratio")
+        },
+    }
 
 
 def _response_error_detail(response: requests.Response) -> str:
@@ -5071,9 +5997,56 @@ def _response_error_detail(response: requests.Response) -> str:
     return str(detail or payload)[:500]
 
 
+_ELEVENLABS_SESSION: requests.Session | None = None
+_ELEVENLABS_SESSION_LOCK = threading.Lock()
+
+
+def _audio_generation_max_in_flight() -> int:
+    return max(
+        1,
+        min(4, _safe_int(os.getenv("ELEVENLABS_MAX_IN_FLIGHT", "3"), 3)),
+    )
+
+
+def _elevenlabs_session() -> requests.Session:
+    """Keep-alive session shared by quota lookups and parallel scene posts."""
+    global _ELEVENLABS_SESSION
+    with _ELEVENLABS_SESSION_LOCK:
+        if _ELEVENLABS_SESSION is None:
+            session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(pool_connections=1, pool_maxsize=4),
+            )
+            _ELEVENLABS_SESSION = session
+        return _ELEVENLABS_SESSION
+
+
+def _reserve_elevenlabs_characters(
+    character_counts: Sequence[int],
+    remaining_characters: int | None,
+) -> List[tuple[bool, int | None]]:
+    """Reserve quota in scene order before any scene is posted.
+
+    Parallel posts cannot check the balance one after another, so each scene
+    either holds its characters up front or goes straight to local fallback.
+    Returns ``(reserved, characters_available_before_scene)`` per scene.
+    """
+    reservations: List[tuple[bool, int | None]] = []
+    for count in character_counts:
+        if remaining_characters is None:
+            reservations.append((True, None))
+            continue
+        reserved = count <= remaining_characters
+        reservations.append((reserved, remaining_characters))
+        if reserved:
+            remaining_characters -= count
+    return reservations
+
+
 def _elevenlabs_remaining_characters(api_key: str) -> int | None:
     try:
-        response = requests.get(
+        response = _elevenlabs_session().get(
             "https://api.elevenlabs.io/v1/user",
             headers={"xi-api-key": api_key},
             timeout=20,
@@ -5314,8 +6287,7 @@ def _enhance_premium_audio(
         return {
             **base_quality,
             "enhanced": False,
-            "loudness": _measure_audio_loudness(input_path),
-            "waveform": _audio_waveform_samples(input_path),
+            **_audio_analysis_fields(input_path),
         }
 
     duration = _safe_float(base_quality.get("duration_seconds"))
@@ -5366,8 +6338,7 @@ def _enhance_premium_audio(
             {
                 "enhanced": False,
                 "ambient": ambient,
-                "loudness": _measure_audio_loudness(input_path),
-                "waveform": _audio_waveform_samples(input_path),
+                **_audio_analysis_fields(input_path),
                 "issues": [
                     *fallback.get("issues", []),
                     "premium_audio_enhancement_failed",
@@ -5381,8 +6352,7 @@ def _enhance_premium_audio(
         {
             "enhanced": True,
             "ambient": ambient,
-            "loudness": _measure_audio_loudness(str(output)),
-            "waveform": _audio_waveform_samples(str(output)),
+            **_audio_analysis_fields(str(output)),
         }
     )
     return enhanced
@@ -5399,10 +6369,10 @@ def _audio_quality_gate(
     bit_rate = _safe_int(gated.get("bit_rate"), 0)
     audio_path = str(gated.get("path") or "").strip()
 
-    if audio_path and not gated.get("loudness"):
-        gated["loudness"] = _measure_audio_loudness(audio_path)
-    if audio_path and not gated.get("waveform"):
-        gated["waveform"] = _audio_waveform_samples(audio_path)
+    if audio_path and not (gated.get("loudness") and gated.get("waveform")):
+        for key, value in _audio_analysis_fields(audio_path).items():
+            if not gated.get(key):
+                gated[key] = value
 
     if re.match(r"^\s*cena\s+\d+\s*[:.-]", narration_text, flags=re.I):
         issues.append("debug_scene_label_in_narration")
@@ -5653,10 +6623,54 @@ def _aggregate_quality(
     }
 
 
+def _llm_response_cache():
+    from open3d_implementation.core.llm_response_cache import (
+        default_llm_response_cache,
+    )
+
+    return default_llm_response_cache()
+
+
+def _llm_cache_summary(
+    state: Open3DAgentState, step: str, outcome: str
+) -> Dict[str, Any]:
+    """Merge one step's cache outcome into ``cost_estimate['llm_cache']``."""
+    previous = (state.get("cost_estimate") or {}).get("llm_cache") or {}
+    steps = {**previous.get("steps", {}), step: outcome}
+    return {
+        "hits": sum(1 for value in steps.values() if value == "hit"),
+        "misses": sum(1 for value in steps.values() if value in {"miss", "bypass"}),
+        "bypassed": bool(state.get("bypass_cache")),
+        "steps": steps,
+    }
+
+
+_COMPILED_WORKFLOW: Any = None
+_COMPILED_WORKFLOW_LOCK = threading.Lock()
+
+
+def get_open3d_workflow():
+    """
+    Returns the process-wide compiled workflow, building it on first use
+
+    Nodes keep no per-run state: story, style, presets, output_root and the
+    execution mode all arrive through the invoke state, and env knobs are read
+    when a node runs. One compiled graph therefore serves every run, including
+    concurrent ones. A failed build is not cached, so the next call retries.
+    """
+    global _COMPILED_WORKFLOW
+    with _COMPILED_WORKFLOW_LOCK:
+        if _COMPILED_WORKFLOW is None:
+            _COMPILED_WORKFLOW = create_open3d_workflow()
+        return _COMPILED_WORKFLOW
+
+
 def create_open3d_workflow():
     """
     Creates a LangGraph workflow for Open3D processing
 
+    Prefer ``get_open3d_workflow()``, which compiles this once per process.
+
     Returns:
         A configured LangGraph workflow
     """
@@ -5665,7 +6679,17 @@ def create_open3d_workflow():
 
         from langgraph.graph import END, StateGraph
 
-        from orchestration.llm_config import generate_cinematic_prompt, get_llm
+        from open3d_implementation.core.run_events import emit_progress
+        from open3d_implementation.core.llm_response_cache import (
+            llm_response_cache_key,
+        )
+        from orchestration.llm_config import (
+            build_cinematic_prompt_request,
+            describe_llm,
+            fallback_cinematic_prompt,
+            generate_cinematic_prompt,
+            get_llm,
+        )
 
         print("🔧 Criando workflow LangGraph funcional...")
 
@@ -5693,11 +6717,33 @@ def create_open3d_workflow():
                 print(f"⚠️ AVISO: História vazia! State completo: {state}")
 
             # Generate cinematic prompt using Flash model (Pro exceeded quota)
-            prompt = generate_cinematic_prompt(story_text, use_pro_model=False)
+            llm_cache = _llm_response_cache()
+            cache_key = llm_response_cache_key(
+                prompt=build_cinematic_prompt_request(story_text),
+                **describe_llm(with_fallback=True),
+            )
+            cached = (
+                llm_cache.get(cache_key)
+                if llm_cache is not None and not state.get("bypass_cache")
+                else None
+            )
+            if cached is not None and isinstance(cached.get("text"), str):
+                prompt = cached["text"]
+                cache_outcome = "hit"
+                print("♻️ Prompt cinematográfico reutilizado do cache do LLM")
+            else:
+                prompt = generate_cinematic_prompt(story_text, use_pro_model=False)
+                cache_outcome = "bypass" if state.get("bypass_cache") else "miss"
+                # The canned fallback means the LLM failed; retry it next run.
+                if llm_cache is not None and prompt != fallback_cinematic_prompt(
+                    story_text
+                ):
+                    llm_cache.put(cache_key, {"text": prompt})
             image_style = state.get("image_style", DEFAULT_IMAGE_STYLE)
             visual_bible = _build_visual_bible(story_text, image_style)
-            input_tokens = _estimate_tokens(story_text)
-            output_tokens = _estimate_tokens(prompt)
+            # A cache hit bills no tokens.
+            input_tokens = 0 if cache_outcome == "hit" else _estimate_tokens(story_text)
+            output_tokens = 0 if cache_outcome == "hit" else _estimate_tokens(prompt)
             gemini_input_usd_per_1m = _safe_float(
                 os.getenv("GEMINI_INPUT_USD_PER_1M_TOKENS", "0.30")
             )
@@ -5719,6 +6765,9 @@ def create_open3d_workflow():
                             + (output_tokens / 1_000_000 * gemini_output_usd_per_1m),
                             6,
                         ),
+                        "llm_cache": _llm_cache_summary(
+                            state, "extract_story", cache_outcome
+                        ),
                     },
                     "current_step": "story_extracted",
                 }
@@ -5740,6 +6789,7 @@ def create_open3d_workflow():
 
             print(f"🎬 Gerando cenas com estilo visual: {style_label}...")
 
+            cache_outcome = None
             if not story_text:
                 print("⚠️ História vazia, usando cenas mock")
                 scenes = [
@@ -5768,8 +6818,6 @@ def create_open3d_workflow():
             else:
                 # Generate real scenes using LLM
                 try:
-                    llm = get_llm()
-
                     scene_prompt = f"""
 Divida esta história em {max_scenes} cenas cinematográficas.
 
@@ -5821,15 +6869,32 @@ Retorne em formato JSON:
 ]
 """
 
-                    response = llm.invoke(scene_prompt)
-
-                    # Parse response
-                    # Extrair conteúdo da resposta - tratar diferentes formatos
-                    raw_content = (
-                        response.content
-                        if hasattr(response, "content")
-                        else str(response)
+                    llm_cache = _llm_response_cache()
+                    cache_key = llm_response_cache_key(
+                        prompt=scene_prompt, **describe_llm()
+                    )
+                    cached = (
+                        llm_cache.get(cache_key)
+                        if llm_cache is not None and not state.get("bypass_cache")
+                        else None
                     )
+                    if cached is not None and "content" in cached:
+                        raw_content = cached["content"]
+                        cache_outcome = "hit"
+                        print("♻️ Resposta de cenas reutilizada do cache do LLM")
+                    else:
+                        cache_outcome = (
+                            "bypass" if state.get("bypass_cache") else "miss"
+                        )
+                        response = get_llm().invoke(scene_prompt)
+
+                        # Parse response
+                        # Extrair conteúdo da resposta - tratar diferentes formatos
+                        raw_content = (
+                            response.content
+                            if hasattr(response, "content")
+                            else str(response)
+                        )
 
                     # Debug: ver tipo e conteúdo original
                     print(f"🔍 DEBUG - Tipo de raw_content: {type(raw_content)}")
@@ -5892,6 +6957,9 @@ Retorne em formato JSON:
 
                         try:
                             scenes = json.loads(json_str)
+                            # Only parseable responses are worth replaying.
+                            if llm_cache is not None and cache_outcome != "hit":
+                                llm_cache.put(cache_key, {"content": raw_content})
                             scenes = _merge_canonical_scenes(
                                 scenes,
                                 story_text,
@@ -5954,13 +7022,24 @@ Retorne em formato JSON:
                     "current_step": "scenes_generated",
                 }
             )
+            if cache_outcome is not None:
+                state["cost_estimate"] = {
+                    **state.get("cost_estimate", {}),
+                    "llm_cache": _llm_cache_summary(
+                        state, "generate_scenes", cache_outcome
+                    ),
+                }
 
             print(f"✅ {len(scenes)} cenas geradas")
             return state
 
-        def generate_images(state: Open3DAgentState) -> Open3DAgentState:
+        def generate_images(
+            state: Open3DAgentState,
+            on_scene_ready: Callable[[Dict[str, Any]], None] | None = None,
+        ) -> Open3DAgentState:
             """Generate images for scenes using ComfyUI on a RunPod Serverless endpoint"""
             scenes = state.get("scenes", [])
+            output_root = _output_root(state)
             runpod_api_key = os.getenv("RUNPOD_API_KEY", "")
             runpod_endpoint_id = os.getenv("RUNPOD_ENDPOINT_ID", "")
             image_style = state.get("image_style", DEFAULT_IMAGE_STYLE)
@@ -6014,7 +7093,7 @@ Retorne em formato JSON:
             ):
                 print("🎭 Gerando referência fixa da personagem Alice...")
                 reference_scene = _build_character_reference_scene(visual_bible)
-                reference_path = "output/alice_character_reference.png"
+                reference_path = str(output_root / "alice_character_reference.png")
                 reference_seed = _scene_seed(
                     session_id,
                     image_style,
@@ -6067,9 +7146,9 @@ Retorne em formato JSON:
                 and _story_has_any(state.get("story_text", ""), ["alice"])
             ):
                 print("🎭 Gerando referência fixa da Alice no ComfyUI...")
-                os.makedirs("output", exist_ok=True)
+                output_root.mkdir(parents=True, exist_ok=True)
                 reference_scene = _build_character_reference_scene(visual_bible)
-                reference_path = "output/alice_character_reference.png"
+                reference_path = str(output_root / "alice_character_reference.png")
                 reference_seed = _scene_seed(
                     session_id,
                     image_style,
@@ -6119,13 +7198,31 @@ Retorne em formato JSON:
                         "não usarão uma âncora não aprovada."
                     )
 
-            for i, scene in enumerate(scenes[:3]):  # Limit to 3 scenes
+            def generate_scene_image(
+                scene: Dict[str, Any],
+                reference_image_path: str | None,
+            ) -> Dict[str, Any]:
+                """Generate one scene; records stay local until merged in order."""
+                scene_images: List[Dict[str, Any]] = []
+                runpod_jobs: List[Dict[str, Any]] = []
+                image_metrics: List[Dict[str, Any]] = []
+
+                def scene_outcome() -> Dict[str, Any]:
+                    return {
+                        "scene_images": scene_images,
+                        "image_metrics": image_metrics,
+                        "runpod_jobs": runpod_jobs,
+                        "reference_image_path": reference_image_path,
+                    }
+
                 try:
                     print(f"🎨 Gerando imagem para cena {scene['scene_id']}...")
 
                     # Create output directory
-                    os.makedirs("output", exist_ok=True)
-                    image_path = f"output/scene_{scene['scene_id']}_image.png"
+                    output_root.mkdir(parents=True, exist_ok=True)
+                    image_path = str(
+                        output_root / f"scene_{scene['scene_id']}_image.png"
+                    )
 
                     if image_provider == "gemini":
                         retry_instruction = ""
@@ -6154,7 +7251,10 @@ Retorne em formato JSON:
                             attempt_path = (
                                 image_path
                                 if attempt == max_attempts
-                                else f"output/scene_{scene['scene_id']}_gemini_attempt_{attempt}.png"
+                                else str(
+                                    output_root
+                                    / f"scene_{scene['scene_id']}_gemini_attempt_{attempt}.png"
+                                )
                             )
                             job_monitor, image_record, image_metric = (
                                 _run_gemini_image_attempt(
@@ -6233,7 +7333,7 @@ Retorne em formato JSON:
                                     f"(melhor tentativa={image_metric.get('attempt')}, "
                                     f"semantic_score={image_metric.get('semantic_score')})"
                                 )
-                                continue
+                                return scene_outcome()
                             else:
                                 if best_path != image_path:
                                     os.replace(best_path, image_path)
@@ -6255,7 +7355,7 @@ Retorne em formato JSON:
                         and img["generation_method"] == "gemini_image"
                         for img in scene_images
                     ):
-                        continue
+                        return scene_outcome()
 
                     # Generate image using ComfyUI via RunPod Serverless
                     if runpod_api_key and runpod_endpoint_id:
@@ -6264,7 +7364,117 @@ Retorne em formato JSON:
                         previous_metric: Dict[str, Any] | None = None
                         best_candidate = None
                         selected_scene = False
-                        for attempt in range(1, max_attempts + 1):
+                        first_serial_attempt = 1
+                        best_of_n = _image_generation_best_of_n()
+                        if best_of_n > 1:
+                            # First attempt as N concurrent seeds; repairs stay serial.
+                            first_serial_attempt = 2
+                            fresh_prompt = (
+                                _build_flux2_image_prompt
+                                if model_family == "flux2_klein"
+                                else _build_image_prompt
+                            )(scene, image_style, visual_bible, "")
+
+                            def run_candidate(
+                                candidate: int,
+                                cancel_event: threading.Event,
+                            ) -> tuple[
+                                Dict[str, Any],
+                                Dict[str, Any] | None,
+                                Dict[str, Any] | None,
+                            ]:
+                                seed_key = f"{scene['scene_id']}:1" + (
+                                    f":{candidate}" if candidate > 1 else ""
+                                )
+                                return _run_comfyui_image_attempt(
+                                    scene=scene,
+                                    image_path=str(
+                                        output_root
+                                        / f"scene_{scene['scene_id']}_attempt_1_candidate_{candidate}.png"
+                                    ),
+                                    directed_prompt=fresh_prompt,
+                                    image_style=image_style,
+                                    style_label=style_label,
+                                    quality_preset_key=quality_preset_key,
+                                    quality_preset=quality_preset,
+                                    checkpoint_name=checkpoint_name,
+                                    scene_seed=_scene_seed(
+                                        session_id, image_style, seed_key
+                                    ),
+                                    visual_bible=visual_bible,
+                                    runpod_endpoint_id=runpod_endpoint_id,
+                                    runpod_api_key=runpod_api_key,
+                                    runpod_gpu_usd_per_second=runpod_gpu_usd_per_second,
+                                    attempt=1,
+                                    reference_image_path=reference_image_path,
+                                    cancel_event=cancel_event,
+                                )
+
+                            print(
+                                f"🎲 Amostrando {best_of_n} candidatos em paralelo "
+                                f"para a cena {scene['scene_id']}"
+                            )
+                            non_retryable = False
+                            for (
+                                candidate,
+                                job_monitor,
+                                image_record,
+                                image_metric,
+                            ) in _sample_best_of_n(best_of_n, run_candidate):
+                                job_monitor["candidate"] = candidate
+                                job_monitor.setdefault("scene_id", scene["scene_id"])
+                                runpod_jobs.append(job_monitor)
+                                if not image_record or not image_metric:
+                                    non_retryable = (
+                                        non_retryable
+                                        or _non_retryable_comfyui_job_error(job_monitor)
+                                    )
+                                    continue
+                                image_metric["candidate"] = candidate
+                                candidate_path = str(image_record["image_path"])
+                                quality_score = _safe_float(
+                                    image_metric.get("quality_score"),
+                                    0.0,
+                                )
+                                if (
+                                    best_candidate is None
+                                    or quality_score > best_candidate[0]
+                                ):
+                                    best_candidate = (
+                                        quality_score,
+                                        candidate_path,
+                                        image_record,
+                                        image_metric,
+                                    )
+                                if selected_scene or not image_metric.get(
+                                    "semantic_accepted"
+                                ):
+                                    continue
+                                os.replace(candidate_path, image_path)
+                                image_record["image_path"] = image_path
+                                image_metric["path"] = image_path
+                                scene_images.append(image_record)
+                                image_metrics.append(image_metric)
+                                if reference_image_path is None:
+                                    reference_image_path = image_path
+                                print(
+                                    "✅ Imagem ComfyUI REAL "
+                                    f"aceita: cena {scene['scene_id']} "
+                                    f"(candidato {candidate}/{best_of_n}, "
+                                    f"score={image_metric.get('quality_score')})"
+                                )
+                                selected_scene = True
+                            if selected_scene or non_retryable:
+                                first_serial_attempt = max_attempts + 1
+                            elif best_candidate is not None:
+                                _, repair_path, _, previous_metric = best_candidate
+                                if os.path.isfile(repair_path):
+                                    repair_source_path = repair_path
+                                retry_instruction = _semantic_retry_instruction(
+                                    scene,
+                                    previous_metric,
+                                )
+                        for attempt in range(first_serial_attempt, max_attempts + 1):
                             attempt_seed = _scene_seed(
                                 session_id,
                                 image_style,
@@ -6295,7 +7505,10 @@ Retorne em formato JSON:
                             attempt_path = (
                                 image_path
                                 if attempt == max_attempts
-                                else f"output/scene_{scene['scene_id']}_attempt_{attempt}.png"
+                                else str(
+                                    output_root
+                                    / f"scene_{scene['scene_id']}_attempt_{attempt}.png"
+                                )
                             )
                             job_monitor, image_record, image_metric = (
                                 _run_comfyui_image_attempt(
@@ -6394,7 +7607,7 @@ Retorne em formato JSON:
                                     f"(melhor tentativa={image_metric.get('attempt')}, "
                                     f"semantic_score={image_metric.get('semantic_score')})"
                                 )
-                                continue
+                                return scene_outcome()
                             else:
                                 if best_path != image_path:
                                     os.replace(best_path, image_path)
@@ -6417,7 +7630,7 @@ Retorne em formato JSON:
                         and str(img["generation_method"]).startswith("comfyui")
                         for img in scene_images
                     ):
-                        continue
+                        return scene_outcome()
 
                     # Fallback mock generation se ComfyUI falhar
                     print(f"💡 Usando fallback PNG real para cena {scene['scene_id']}")
@@ -6473,7 +7686,43 @@ Retorne em formato JSON:
                     subprocess.SubprocessError,
                 ) as e:
                     print(f"⚠️ Erro ao gerar imagem para cena {scene['scene_id']}: {e}")
-                    # Continue with next scene
+                    # The other scenes keep their own outcome.
+
+                return scene_outcome()
+
+            def finish_scene(outcome: Dict[str, Any]) -> Dict[str, Any]:
+                if on_scene_ready is not None:
+                    for image_record in outcome["scene_images"]:
+                        on_scene_ready(image_record)
+                return outcome
+
+            pending_scenes = list(scenes[:3])  # Limit to 3 scenes
+            scene_outcomes: List[Dict[str, Any]] = []
+            # Without an approved anchor, the first accepted scene becomes the
+            # identity reference, so scenes run one by one until it exists.
+            while pending_scenes and reference_image_path is None:
+                outcome = finish_scene(
+                    generate_scene_image(pending_scenes.pop(0), None)
+                )
+                scene_outcomes.append(outcome)
+                reference_image_path = outcome["reference_image_path"]
+            anchored_reference_path = reference_image_path
+            scene_outcomes.extend(
+                _run_scene_jobs(
+                    pending_scenes,
+                    lambda scene: finish_scene(
+                        generate_scene_image(
+                            scene,
+                            anchored_reference_path,
+                        )
+                    ),
+                    max_in_flight=_image_generation_max_in_flight(),
+                )
+            )
+            for outcome in scene_outcomes:
+                scene_images.extend(outcome["scene_images"])
+                image_metrics.extend(outcome["image_metrics"])
+                runpod_jobs.extend(outcome["runpod_jobs"])
 
             visual_consistency = _evaluate_image_set_consistency(
                 scene_images,
@@ -6549,7 +7798,10 @@ Retorne em formato JSON:
                         image_style,
                         f"{image_provider}:{repair_scene_id}:consistency_repair:{repair_attempt}",
                     )
-                    repair_path = f"output/scene_{repair_scene_id}_consistency_repair_{repair_attempt}.png"
+                    repair_path = str(
+                        output_root
+                        / f"scene_{repair_scene_id}_consistency_repair_{repair_attempt}.png"
+                    )
                     directed_prompt = _build_image_prompt(
                         repair_scene,
                         image_style,
@@ -6634,7 +7886,7 @@ Retorne em formato JSON:
                     _, best_path, image_record, image_metric, visual_consistency = (
                         best_repair
                     )
-                    final_path = f"output/scene_{repair_scene_id}_image.png"
+                    final_path = str(output_root / f"scene_{repair_scene_id}_image.png")
                     if best_path != final_path:
                         os.replace(best_path, final_path)
                     image_record["image_path"] = final_path
@@ -6676,9 +7928,13 @@ Retorne em formato JSON:
 
             return state
 
-        def generate_audio(state: Open3DAgentState) -> Open3DAgentState:
+        def generate_audio(
+            state: Open3DAgentState,
+            on_scene_ready: Callable[[Any, Dict[str, Any] | None], None] | None = None,
+        ) -> Open3DAgentState:
             """Generate audio narration using ElevenLabs"""
             scenes = state.get("scenes", [])
+            output_root = _output_root(state)
 
             print("🎙️ Gerando áudio com ElevenLabs...")
 
@@ -6702,16 +7958,38 @@ Retorne em formato JSON:
                     f"{elevenlabs_remaining_chars}"
                 )
 
-            for i, scene in enumerate(scenes[:3]):  # Limit to 3 scenes
+            output_root.mkdir(parents=True, exist_ok=True)
+            audio_scenes = scenes[:3]  # Limit to 3 scenes
+            narration_texts = [
+                _premium_audio_narration(scene) for scene in audio_scenes
+            ]
+            reservations = _reserve_elevenlabs_characters(
+                [len(text) for text in narration_texts],
+                elevenlabs_remaining_chars,
+            )
+            elevenlabs_model_id = os.getenv(
+                "ELEVENLABS_MODEL_ID",
+                "eleven_multilingual_v2",
+            )
+
+            def synthesize_scene_audio(
+                job: tuple[Dict[str, Any], str, tuple[bool, int | None]],
+            ) -> Dict[str, Any]:
+                scene, narration_text, (reserved, available_chars) = job
+                scene_result: Dict[str, Any] = {
+                    "audio_file": None,
+                    "audio_metric": None,
+                    "voice_metric": None,
+                    "elevenlabs_characters": 0,
+                }
                 try:
                     print(f"🎤 Gerando áudio para cena {scene['scene_id']}...")
 
-                    # Create output directory
-                    os.makedirs("output", exist_ok=True)
-                    audio_path = f"output/scene_{scene['scene_id']}_audio.mp3"
+                    audio_path = str(
+                        output_root / f"scene_{scene['scene_id']}_audio.mp3"
+                    )
 
                     # Generate premium narration using ElevenLabs
-                    narration_text = _premium_audio_narration(scene)
                     audio_direction = _premium_audio_direction(scene)
                     text_characters = len(narration_text)
                     failure_reason = ""
@@ -6732,10 +8010,7 @@ Retorne em formato JSON:
 
                         data = {
                             "text": narration_text,
-                            "model_id": os.getenv(
-                                "ELEVENLABS_MODEL_ID",
-                                "eleven_multilingual_v2",
-                            ),
+                            "model_id": elevenlabs_model_id,
                             "voice_settings": _elevenlabs_voice_settings(),
                         }
 
@@ -6744,23 +8019,20 @@ Retorne em formato JSON:
                             "https://api.elevenlabs.io/v1/text-to-speech/" f"{voice_id}"
                         )
 
-                        if (
-                            elevenlabs_remaining_chars is not None
-                            and text_characters > elevenlabs_remaining_chars
-                        ):
+                        if not reserved:
                             failure_reason = (
                                 "elevenlabs_insufficient_characters:"
-                                f"needed={text_characters},remaining={elevenlabs_remaining_chars}"
+                                f"needed={text_characters},remaining={available_chars}"
                             )
                             print(
                                 "⚠️ Quota ElevenLabs insuficiente para a cena: "
                                 f"{text_characters} chars necessários, "
-                                f"{elevenlabs_remaining_chars} restantes"
+                                f"{available_chars} restantes"
                             )
                         else:
                             print("🎤 Chamando ElevenLabs API...")
                             try:
-                                response = requests.post(
+                                response = _elevenlabs_session().post(
                                     voice_url,
                                     headers=headers,
                                     json=data,
@@ -6801,12 +8073,7 @@ Retorne em formato JSON:
                                         media_quality.update(
                                             {
                                                 "enhanced": False,
-                                                "loudness": _measure_audio_loudness(
-                                                    audio_path
-                                                ),
-                                                "waveform": _audio_waveform_samples(
-                                                    audio_path
-                                                ),
+                                                **_audio_analysis_fields(audio_path),
                                             }
                                         )
                                     try:
@@ -6819,66 +8086,52 @@ Retorne em formato JSON:
                                         "elevenlabs",
                                     )
                                     if bool(media_quality.get("valid")):
-                                        audio_files.append(
-                                            {
-                                                "scene_id": scene["scene_id"],
-                                                "audio_path": audio_path,
-                                                "text": narration_text,
-                                                "voice_direction": audio_direction,
-                                                "voice_id": voice_id,
-                                                "voice_role": voice_role,
-                                                "generation_method": "elevenlabs",
-                                            }
-                                        )
-                                        audio_metrics.append(
-                                            {
-                                                "scene_id": scene["scene_id"],
-                                                "generation_method": "elevenlabs",
-                                                "voice_direction": audio_direction,
-                                                "voice_id": voice_id,
-                                                "voice_role": voice_role,
-                                                **media_quality,
-                                            }
-                                        )
-                                        voice_metrics.append(
-                                            {
-                                                "scene_id": scene["scene_id"],
-                                                "voice_id": voice_id,
-                                                "voice_role": voice_role,
-                                                "model_id": data["model_id"],
-                                                "text_characters": text_characters,
-                                                "voice_direction": audio_direction,
-                                                "premium_audio": media_quality.get(
-                                                    "premium_audio",
-                                                    False,
-                                                ),
-                                                "quality_score": media_quality.get(
-                                                    "quality_score",
-                                                    0,
-                                                ),
-                                                "issues": media_quality.get(
-                                                    "issues",
-                                                    [],
-                                                ),
-                                            }
-                                        )
-                                        estimated_elevenlabs_cost += (
+                                        scene_result["audio_file"] = {
+                                            "scene_id": scene["scene_id"],
+                                            "audio_path": audio_path,
+                                            "text": narration_text,
+                                            "voice_direction": audio_direction,
+                                            "voice_id": voice_id,
+                                            "voice_role": voice_role,
+                                            "generation_method": "elevenlabs",
+                                        }
+                                        scene_result["audio_metric"] = {
+                                            "scene_id": scene["scene_id"],
+                                            "generation_method": "elevenlabs",
+                                            "voice_direction": audio_direction,
+                                            "voice_id": voice_id,
+                                            "voice_role": voice_role,
+                                            **media_quality,
+                                        }
+                                        scene_result["voice_metric"] = {
+                                            "scene_id": scene["scene_id"],
+                                            "voice_id": voice_id,
+                                            "voice_role": voice_role,
+                                            "model_id": data["model_id"],
+                                            "text_characters": text_characters,
+                                            "voice_direction": audio_direction,
+                                            "premium_audio": media_quality.get(
+                                                "premium_audio",
+                                                False,
+                                            ),
+                                            "quality_score": media_quality.get(
+                                                "quality_score",
+                                                0,
+                                            ),
+                                            "issues": media_quality.get(
+                                                "issues",
+                                                [],
+                                            ),
+                                        }
+                                        scene_result["elevenlabs_characters"] = (
                                             text_characters
-                                            / 1000
-                                            * elevenlabs_usd_per_1k_chars
                                         )
-                                        if elevenlabs_remaining_chars is not None:
-                                            elevenlabs_remaining_chars = max(
-                                                0,
-                                                elevenlabs_remaining_chars
-                                                - text_characters,
-                                            )
                                         print(
                                             "✅ Áudio ElevenLabs REAL gerado: "
                                             f"cena {scene['scene_id']} "
                                             f"({os.path.getsize(audio_path)} bytes)"
                                         )
-                                        continue
+                                        return scene_result
                                     failure_reason = (
                                         "elevenlabs_invalid_audio:"
                                         f"{','.join(media_quality.get('issues', []))}"
@@ -6914,20 +8167,18 @@ Retorne em formato JSON:
                         generation_method,
                     )
                     if bool(media_quality.get("valid")):
-                        audio_files.append(
-                            {
-                                "scene_id": scene["scene_id"],
-                                "audio_path": audio_path,
-                                "text": narration_text,
-                                "voice_direction": audio_direction,
-                                "voice_id": os.getenv(
-                                    "AUDIO_LOCAL_TTS_VOICE",
-                                    "Luciana",
-                                ),
-                                "generation_method": "local_tts",
-                                "fallback_reason": failure_reason,
-                            }
-                        )
+                        scene_result["audio_file"] = {
+                            "scene_id": scene["scene_id"],
+                            "audio_path": audio_path,
+                            "text": narration_text,
+                            "voice_direction": audio_direction,
+                            "voice_id": os.getenv(
+                                "AUDIO_LOCAL_TTS_VOICE",
+                                "Luciana",
+                            ),
+                            "generation_method": "local_tts",
+                            "fallback_reason": failure_reason,
+                        }
                         print(
                             "✅ Áudio local válido gerado: "
                             f"cena {scene['scene_id']} "
@@ -6938,35 +8189,31 @@ Retorne em formato JSON:
                             "❌ Nenhum áudio válido gerado para cena "
                             f"{scene['scene_id']}: {failure_reason}"
                         )
-                    audio_metrics.append(
-                        {
-                            "scene_id": scene["scene_id"],
-                            "generation_method": generation_method,
-                            "fallback_reason": failure_reason,
-                            "voice_direction": audio_direction,
-                            **media_quality,
-                        }
-                    )
-                    voice_metrics.append(
-                        {
-                            "scene_id": scene["scene_id"],
-                            "voice_id": (
-                                os.getenv("AUDIO_LOCAL_TTS_VOICE", "Luciana")
-                                if generation_method == "local_tts"
-                                else "none"
-                            ),
-                            "model_id": generation_method,
-                            "text_characters": text_characters,
-                            "voice_direction": audio_direction,
-                            "premium_audio": media_quality.get(
-                                "premium_audio",
-                                False,
-                            ),
-                            "quality_score": media_quality.get("quality_score", 0),
-                            "issues": media_quality.get("issues", []),
-                            "fallback_reason": failure_reason,
-                        }
-                    )
+                    scene_result["audio_metric"] = {
+                        "scene_id": scene["scene_id"],
+                        "generation_method": generation_method,
+                        "fallback_reason": failure_reason,
+                        "voice_direction": audio_direction,
+                        **media_quality,
+                    }
+                    scene_result["voice_metric"] = {
+                        "scene_id": scene["scene_id"],
+                        "voice_id": (
+                            os.getenv("AUDIO_LOCAL_TTS_VOICE", "Luciana")
+                            if generation_method == "local_tts"
+                            else "none"
+                        ),
+                        "model_id": generation_method,
+                        "text_characters": text_characters,
+                        "voice_direction": audio_direction,
+                        "premium_audio": media_quality.get(
+                            "premium_audio",
+                            False,
+                        ),
+                        "quality_score": media_quality.get("quality_score", 0),
+                        "issues": media_quality.get("issues", []),
+                        "fallback_reason": failure_reason,
+                    }
 
                 except (
                     OSError,
@@ -6977,7 +8224,39 @@ Retorne em formato JSON:
                     requests.RequestException,
                 ) as e:
                     print(f"⚠️ Erro ao gerar áudio para cena {scene['scene_id']}: {e}")
-                    # Continue with next scene
+                return scene_result
+
+            def synthesize_and_notify(
+                job: tuple[Dict[str, Any], str, tuple[bool, int | None]],
+            ) -> Dict[str, Any]:
+                scene_result = synthesize_scene_audio(job)
+                if on_scene_ready is not None:
+                    on_scene_ready(job[0].get("scene_id"), scene_result["audio_file"])
+                return scene_result
+
+            # Each worker synthesizes and then post-processes its own scene, so
+            # one scene's enhancement and loudness probing overlap the next
+            # scene's ElevenLabs request.
+            scene_results = _run_scene_jobs(
+                list(zip(audio_scenes, narration_texts, reservations)),
+                synthesize_and_notify,
+                max_in_flight=_audio_generation_max_in_flight(),
+            )
+            for scene_result in scene_results:
+                if scene_result["audio_file"] is not None:
+                    audio_files.append(scene_result["audio_file"])
+                if scene_result["audio_metric"] is not None:
+                    audio_metrics.append(scene_result["audio_metric"])
+                    voice_metrics.append(scene_result["voice_metric"])
+                used_characters = scene_result["elevenlabs_characters"]
+                estimated_elevenlabs_cost += (
+                    used_characters / 1000 * elevenlabs_usd_per_1k_chars
+                )
+                if elevenlabs_remaining_chars is not None:
+                    elevenlabs_remaining_chars = max(
+                        0,
+                        elevenlabs_remaining_chars - used_characters,
+                    )
 
             state.update(
                 {
@@ -7001,22 +8280,318 @@ Retorne em formato JSON:
             print(f"✅ {len(audio_files)} áudios gerados")
             return state
 
+        def stream_scenes(state: Open3DAgentState) -> Open3DAgentState:
+            """Run images and narration side by side, animating each scene once both land.
+
+            Only the final concat/mux in ``compile_video`` and the cross-scene
+            consistency check inside ``generate_images`` wait for every scene.
+            """
+            print("🌊 Modo scene_streaming: imagem, áudio e clipe por cena...")
+            started_at = time.monotonic()
+            output_root = _output_root(state)
+            output_root.mkdir(parents=True, exist_ok=True)
+            render_profile_key = _video_render_profile_key(
+                state.get("video_render_profile")
+            )
+            video_provider = os.getenv("VIDEO_GENERATION_PROVIDER", "runway").lower()
+            prerender = (
+                video_provider != "runway" and shutil.which("ffmpeg") is not None
+            )
+            if not prerender:
+                # Only local ffmpeg clips can start before compile_video; with
+                # Runway (the default) this mode just overlaps image and audio.
+                reason = (
+                    "VIDEO_GENERATION_PROVIDER=runway"
+                    if video_provider == "runway"
+                    else "ffmpeg ausente"
+                )
+                print(
+                    "⚠️ scene_streaming sem clipes antecipados "
+                    f"({reason}); os clipes saem só no compile_video"
+                )
+            ready_lock = threading.Lock()
+            ready_images: Dict[str, Dict[str, Any]] = {}
+            ready_audio: Dict[str, Dict[str, Any] | None] = {}
+            clip_futures: Dict[str, Future[Dict[str, Any] | None]] = {}
+            first_clip_seconds: List[float] = []
+            clip_executor = ThreadPoolExecutor(
+                max_workers=_ffmpeg_max_parallel_encodes(),
+                thread_name_prefix="ai-film-clip",
+            )
+
+            def prerender_clip(
+                img: Dict[str, Any],
+                audio_file: Dict[str, Any] | None,
+                fingerprint: List[int],
+            ) -> Dict[str, Any] | None:
+                duration = _scene_clip_duration(img, [audio_file] if audio_file else [])
+                scene_video = _render_ffmpeg_motion_clip(
+                    img,
+                    duration,
+                    render_profile_key,
+                    output_root,
+                )
+                if scene_video is None:
+                    return None
+                with ready_lock:
+                    if not first_clip_seconds:
+                        first_clip_seconds.append(
+                            round(time.monotonic() - started_at, 3)
+                        )
+                print(
+                    f"🎬 Cena {img.get('scene_id')} pronta para revisão: "
+                    f"{scene_video['video_path']}"
+                )
+                return {
+                    "image_path": img["image_path"],
+                    "image_fingerprint": fingerprint,
+                    "render_profile": render_profile_key,
+                    "duration": duration,
+                    "scene_video": scene_video,
+                }
+
+            def submit_when_ready(scene_key: str) -> None:
+                # Caller holds ready_lock.
+                if (
+                    not prerender
+                    or scene_key in clip_futures
+                    or scene_key not in ready_images
+                    or scene_key not in ready_audio
+                ):
+                    return
+                img = ready_images[scene_key]
+                fingerprint = _image_fingerprint(img["image_path"])
+                if fingerprint is None:
+                    return
+                clip_futures[scene_key] = clip_executor.submit(
+                    prerender_clip,
+                    img,
+                    ready_audio[scene_key],
+                    fingerprint,
+                )
+
+            def on_image_ready(image_record: Dict[str, Any]) -> None:
+                scene_key = str(image_record.get("scene_id"))
+                with ready_lock:
+                    ready_images[scene_key] = image_record
+                    submit_when_ready(scene_key)
+
+            def on_audio_ready(
+                scene_id: Any, audio_file: Dict[str, Any] | None
+            ) -> None:
+                scene_key = str(scene_id)
+                with ready_lock:
+                    ready_audio[scene_key] = audio_file
+                    submit_when_ready(scene_key)
+
+            try:
+                with ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="ai-film-audio",
+                ) as audio_runner:
+                    audio_future = audio_runner.submit(
+                        contextvars.copy_context().run,
+                        generate_audio,
+                        dict(state),
+                        on_audio_ready,
+                    )
+                    image_state = generate_images(dict(state), on_image_ready)
+                    audio_state = audio_future.result()
+                prerendered_clips: Dict[str, Dict[str, Any]] = {}
+                for scene_key, clip_future in clip_futures.items():
+                    prerendered = clip_future.result()
+                    if prerendered is not None:
+                        prerendered_clips[scene_key] = prerendered
+            finally:
+                clip_executor.shutdown(wait=True)
+
+            image_quality = image_state.get("quality_metrics", {})
+            audio_quality = audio_state.get("quality_metrics", {})
+            state.update(
+                {
+                    **image_state,
+                    "audio_files": audio_state.get("audio_files", []),
+                    "audio_count": audio_state.get("audio_count", 0),
+                    "quality_metrics": {
+                        **image_quality,
+                        "audio": audio_quality.get("audio", []),
+                        "voices": audio_quality.get("voices", []),
+                        "scene_streaming": {
+                            "first_clip_seconds": (
+                                first_clip_seconds[0] if first_clip_seconds else None
+                            ),
+                            "media_wall_seconds": round(
+                                time.monotonic() - started_at, 3
+                            ),
+                            "prerendered_clips": len(prerendered_clips),
+                            "clip_prerender_enabled": prerender,
+                        },
+                    },
+                    "cost_estimate": {
+                        **image_state.get("cost_estimate", {}),
+                        **audio_state.get("cost_estimate", {}),
+                    },
+                    "prerendered_clips": prerendered_clips,
+                    "current_step": "scenes_streamed",
+                }
+            )
+            return state
+
         def compile_video(state: Open3DAgentState) -> Open3DAgentState:
             """Compile final video using real provider clips with FFmpeg fallback."""
             scene_images = state.get("scene_images", [])
+            output_root = _output_root(state)
             audio_files = state.get("audio_files", [])
             runpod_jobs = list(state.get("runpod_jobs", []))
             scene_videos: List[Dict[str, Any]] = []
             video_provider = os.getenv("VIDEO_GENERATION_PROVIDER", "runway").lower()
             used_runway = False
+            render_profile_key = _video_render_profile_key(
+                state.get("video_render_profile")
+            )
+            render_profile = VIDEO_RENDER_PROFILES[render_profile_key]
+            prerendered_clips = state.get("prerendered_clips") or {}
+
+            def render_scene_clip(
+                clip_job: tuple[int, Dict[str, Any], float],
+            ) -> Dict[str, Any]:
+                index, img, duration = clip_job
+                rendered: Dict[str, Any] = {
+                    "clip_path": None,
+                    "temporary": False,
+                    "scene_video": None,
+                    "runpod_job": None,
+                }
+                if video_provider == "runway":
+                    runway_clip_path = str(
+                        output_root / f"scene_{img['scene_id']}_runway.mp4"
+                    )
+                    job_monitor, runway_ok = _generate_runway_clip(
+                        img,
+                        runway_clip_path,
+                        duration,
+                    )
+                    rendered["runpod_job"] = job_monitor
+                    if runway_ok and os.path.exists(runway_clip_path):
+                        rendered["clip_path"] = runway_clip_path
+                        rendered["scene_video"] = {
+                            "scene_id": img.get("scene_id", index),
+                            "video_path": runway_clip_path,
+                            "provider": "runway",
+                            "job_id": job_monitor.get("job_id"),
+                            "duration": duration,
+                            "quality_score": job_monitor.get("quality_score", 0),
+                        }
+                        return rendered
+                    print(
+                        "⚠️ Runway indisponível para cena "
+                        f"{img.get('scene_id')}: {job_monitor.get('error')}"
+                    )
+
+                # Scene streaming may already have animated this exact still;
+                # a consistency repair changes the fingerprint and forces a re-render.
+                prerendered = prerendered_clips.get(str(img.get("scene_id")))
+                if (
+                    prerendered
+                    and prerendered.get("image_path") == img.get("image_path")
+                    and prerendered.get("image_fingerprint")
+                    == _image_fingerprint(img["image_path"])
+                    and prerendered.get("render_profile") == render_profile_key
+                    and abs(_safe_float(prerendered.get("duration")) - duration) < 0.01
+                    and os.path.exists(prerendered["scene_video"]["video_path"])
+                ):
+                    rendered["clip_path"] = prerendered["scene_video"]["video_path"]
+                    rendered["temporary"] = True
+                    rendered["scene_video"] = {
+                        **prerendered["scene_video"],
+                        "prerendered": True,
+                    }
+                    return rendered
+
+                scene_video = _render_ffmpeg_motion_clip(
+                    img,
+                    duration,
+                    render_profile_key,
+                    output_root,
+                    index,
+                )
+                if scene_video is not None:
+                    rendered["clip_path"] = scene_video["video_path"]
+                    rendered["temporary"] = True
+                    rendered["scene_video"] = scene_video
+                return rendered
+
+            def assemble_single_pass(
+                clip_jobs: List[tuple[int, Dict[str, Any], float]],
+            ) -> bool:
+                scene_inputs = []
+                for index, img, duration in clip_jobs:
+                    audio_path = next(
+                        (
+                            audio["audio_path"]
+                            for audio in audio_files
+                            if audio.get("scene_id") == img.get("scene_id")
+                            and os.path.exists(audio.get("audio_path", ""))
+                            and os.path.getsize(audio["audio_path"]) > 1000
+                        ),
+                        None,
+                    )
+                    scene_inputs.append(
+                        (
+                            img["image_path"],
+                            {
+                                "scene_id": img.get("scene_id", index),
+                                "camera_motion": img.get("camera_motion", ""),
+                            },
+                            duration,
+                            audio_path,
+                        )
+                    )
+                print(
+                    f"🎞️ Montando {len(scene_inputs)} cenas em passo único "
+                    f"(perfil {render_profile_key})"
+                )
+                result = _run_ffmpeg_with_progress(
+                    _ffmpeg_single_pass_command(
+                        scene_inputs,
+                        video_path,
+                        render_profile,
+                        _video_transition_seconds(),
+                    ),
+                    label="vídeo final",
+                    duration=sum(duration for _, _, duration in clip_jobs),
+                )
+                if result.returncode != 0 or not os.path.exists(video_path):
+                    print(
+                        "⚠️ Montagem em passo único falhou, usando multi-pass: "
+                        f"{result.stderr[:500]}"
+                    )
+                    return False
+                media_quality = _probe_media_quality(video_path, "video")
+                # No per-scene clip exists in this mode (video_path None);
+                # curation renders one from the still when it recompiles.
+                for index, img, duration in clip_jobs:
+                    scene_videos.append(
+                        {
+                            "scene_id": img.get("scene_id", index),
+                            "video_path": None,
+                            "provider": "ffmpeg_camera_motion",
+                            "render_profile": render_profile_key,
+                            "assembly": "single_pass",
+                            "duration": duration,
+                            "quality_score": media_quality.get("quality_score", 0),
+                        }
+                    )
+                print(f"✅ Vídeo FFmpeg compilado em passo único: {video_path}")
+                return True
 
             print("🎬 Compilando vídeo final com FFmpeg...")
 
-            video_path = "output/final_video.mp4"
+            video_path = str(output_root / "final_video.mp4")
 
             try:
                 # Create output directory
-                os.makedirs("output", exist_ok=True)
+                output_root.mkdir(parents=True, exist_ok=True)
 
                 # Check if FFmpeg is available
                 try:
@@ -7031,8 +8606,7 @@ Retorne em formato JSON:
                 if ffmpeg_available and scene_images:
                     print("🔧 Usando FFmpeg real com animação de câmera...")
 
-                    clip_paths = []
-                    temporary_clip_paths = []
+                    clip_jobs = []
                     for index, img in enumerate(scene_images, 1):
                         img_path = img["image_path"]
                         if not (
@@ -7041,234 +8615,180 @@ Retorne em formato JSON:
                         ):
                             continue
 
-                        audio_duration = _scene_audio_duration(
-                            audio_files,
-                            img.get("scene_id"),
-                        )
-                        duration = max(
-                            3.0,
-                            audio_duration,
-                            _safe_float(img.get("duration"), 5.0),
+                        duration = _scene_clip_duration(img, audio_files)
+                        clip_jobs.append((index, img, duration))
+
+                    # One ffmpeg graph renders, crossfades and mixes everything;
+                    # the clip -> concat -> loudnorm -> mux chain is the fallback
+                    # and also reuses clips that scene streaming already rendered.
+                    single_pass_done = bool(
+                        clip_jobs
+                        and video_provider != "runway"
+                        and not prerendered_clips
+                        and _video_assembly_engine() == "single_pass"
+                        and assemble_single_pass(clip_jobs)
+                    )
+                    if not single_pass_done:
+                        max_parallel_encodes = _ffmpeg_max_parallel_encodes()
+                        print(
+                            f"🎞️ Renderizando {len(clip_jobs)} clipes "
+                            f"(perfil {render_profile_key}, "
+                            f"{max_parallel_encodes} encodes em paralelo, "
+                            f"{_ffmpeg_threads_per_encode()} threads cada)"
                         )
-                        if video_provider == "runway":
-                            runway_clip_path = (
-                                f"output/scene_{img['scene_id']}_runway.mp4"
-                            )
-                            job_monitor, runway_ok = _generate_runway_clip(
-                                img,
-                                runway_clip_path,
-                                duration,
-                            )
-                            runpod_jobs.append(job_monitor)
-                            if runway_ok and os.path.exists(runway_clip_path):
-                                clip_paths.append(runway_clip_path)
-                                used_runway = True
-                                scene_videos.append(
-                                    {
-                                        "scene_id": img.get("scene_id", index),
-                                        "video_path": runway_clip_path,
-                                        "provider": "runway",
-                                        "job_id": job_monitor.get("job_id"),
-                                        "duration": duration,
-                                        "quality_score": job_monitor.get(
-                                            "quality_score",
-                                            0,
-                                        ),
-                                    }
-                                )
+                        clip_paths = []
+                        temporary_clip_paths = []
+                        # Clips render concurrently; concat only sees them in scene order.
+                        for rendered in _run_scene_jobs(
+                            clip_jobs,
+                            render_scene_clip,
+                            max_in_flight=max_parallel_encodes,
+                        ):
+                            if rendered["runpod_job"] is not None:
+                                runpod_jobs.append(rendered["runpod_job"])
+                            if rendered["clip_path"] is None:
                                 continue
-                            print(
-                                "⚠️ Runway indisponível para cena "
-                                f"{img.get('scene_id')}: {job_monitor.get('error')}"
-                            )
-
-                        clip_path = f"output/scene_{img['scene_id']}_motion.mp4"
-                        scene_for_motion = {
-                            "scene_id": img.get("scene_id", index),
-                            "camera_motion": img.get("camera_motion", ""),
-                        }
-                        motion_filter = _ffmpeg_zoompan_filter(
-                            scene_for_motion,
-                            duration,
-                        )
-                        cmd = [
-                            "ffmpeg",
-                            "-y",
-                            "-loop",
-                            "1",
-                            "-i",
-                            img_path,
-                            "-vf",
-                            motion_filter,
-                            "-t",
-                            str(duration),
-                            "-r",
-                            "30",
-                            "-c:v",
-                            "libx264",
-                            "-preset",
-                            "slow",
-                            "-crf",
-                            "18",
-                            "-profile:v",
-                            "high",
-                            "-pix_fmt",
-                            "yuv420p",
-                            "-movflags",
-                            "+faststart",
-                            clip_path,
-                        ]
-                        result = subprocess.run(cmd, capture_output=True, text=True)
-                        if result.returncode == 0 and os.path.exists(clip_path):
-                            clip_paths.append(clip_path)
-                            temporary_clip_paths.append(clip_path)
-                            media_quality = _probe_media_quality(clip_path, "video")
-                            scene_videos.append(
-                                {
-                                    "scene_id": img.get("scene_id", index),
-                                    "video_path": clip_path,
-                                    "provider": "ffmpeg_camera_motion",
-                                    "duration": duration,
-                                    "quality_score": media_quality.get(
-                                        "quality_score",
-                                        0,
-                                    ),
-                                }
-                            )
-                        else:
-                            print(
-                                "⚠️ Erro ao animar cena "
-                                f"{img.get('scene_id')}: {result.stderr[:500]}"
-                            )
+                            clip_paths.append(rendered["clip_path"])
+                            if rendered["temporary"]:
+                                temporary_clip_paths.append(rendered["clip_path"])
+                            if rendered["scene_video"]["provider"] == "runway":
+                                used_runway = True
+                            scene_videos.append(rendered["scene_video"])
 
-                    filelist_path = "output/filelist.txt"
-                    with open(filelist_path, "w") as f:
-                        for clip_path in clip_paths:
-                            f.write(f"file '{os.path.abspath(clip_path)}'\n")
+                        filelist_path = str(output_root / "filelist.txt")
+                        with open(filelist_path, "w") as f:
+                            for clip_path in clip_paths:
+                                f.write(f"file '{os.path.abspath(clip_path)}'\n")
 
-                    # Compile video with images
-                    if (
-                        os.path.exists(filelist_path)
-                        and os.path.getsize(filelist_path) > 0
-                    ):
-                        temp_video = "output/temp_video.mp4"
-
-                        # Create video from images
-                        cmd = [
-                            "ffmpeg",
-                            "-y",  # Overwrite output file
-                            "-f",
-                            "concat",  # Concat demuxer
-                            "-safe",
-                            "0",  # Allow unsafe paths
-                            "-i",
-                            filelist_path,  # Input file list
-                            "-c:v",
-                            "copy",  # Clips are already encoded consistently
-                            "-pix_fmt",
-                            "yuv420p",  # Pixel format for compatibility
-                            temp_video,
-                        ]
-
-                        result = subprocess.run(cmd, capture_output=True, text=True)
-
-                        if result.returncode == 0 and audio_files:
-                            # Concatenate every valid scene narration before muxing.
-                            audio_list_path = "output/audio_filelist.txt"
-                            valid_audio_paths = [
-                                audio["audio_path"]
-                                for audio in audio_files
-                                if os.path.exists(audio.get("audio_path", ""))
-                                and os.path.getsize(audio["audio_path"]) > 1000
+                        # Compile video with images
+                        if (
+                            os.path.exists(filelist_path)
+                            and os.path.getsize(filelist_path) > 0
+                        ):
+                            temp_video = str(output_root / "temp_video.mp4")
+
+                            # Create video from images
+                            cmd = [
+                                "ffmpeg",
+                                "-y",  # Overwrite output file
+                                "-f",
+                                "concat",  # Concat demuxer
+                                "-safe",
+                                "0",  # Allow unsafe paths
+                                "-i",
+                                filelist_path,  # Input file list
+                                "-c:v",
+                                "copy",  # Clips are already encoded consistently
+                                "-pix_fmt",
+                                "yuv420p",  # Pixel format for compatibility
+                                temp_video,
                             ]
-                            combined_audio_path = "output/combined_audio.m4a"
-                            with open(audio_list_path, "w") as audio_list:
-                                for audio_path in valid_audio_paths:
-                                    audio_list.write(
-                                        f"file '{os.path.abspath(audio_path)}'\n"
-                                    )
 
-                            if valid_audio_paths:
-                                audio_cmd = [
-                                    "ffmpeg",
-                                    "-y",
-                                    "-f",
-                                    "concat",
-                                    "-safe",
-                                    "0",
-                                    "-i",
-                                    audio_list_path,
-                                    "-af",
-                                    f"loudnorm=I={_audio_loudness_target_lufs():.1f}:TP=-1.5:LRA=11",
-                                    "-c:a",
-                                    "aac",
-                                    "-b:a",
-                                    "160k",
-                                    combined_audio_path,
-                                ]
-                                audio_result = subprocess.run(
-                                    audio_cmd,
-                                    capture_output=True,
-                                    text=True,
+                            result = subprocess.run(cmd, capture_output=True, text=True)
+
+                            if result.returncode == 0 and audio_files:
+                                # Concatenate every valid scene narration before muxing.
+                                audio_list_path = str(
+                                    output_root / "audio_filelist.txt"
                                 )
-                                if audio_result.returncode != 0:
-                                    print(
-                                        "⚠️ Erro ao concatenar áudios: "
-                                        f"{audio_result.stderr[:500]}"
-                                    )
-                                    combined_audio_path = valid_audio_paths[0]
-
-                                cmd = [
-                                    "ffmpeg",
-                                    "-y",
-                                    "-i",
-                                    temp_video,  # Video input
-                                    "-i",
-                                    combined_audio_path,  # Audio input
-                                    "-c:v",
-                                    "copy",  # Copy video stream
-                                    "-c:a",
-                                    "aac",  # Audio codec
-                                    "-shortest",  # Match shortest stream
-                                    video_path,
+                                valid_audio_paths = [
+                                    audio["audio_path"]
+                                    for audio in audio_files
+                                    if os.path.exists(audio.get("audio_path", ""))
+                                    and os.path.getsize(audio["audio_path"]) > 1000
                                 ]
-
-                                result = subprocess.run(
-                                    cmd, capture_output=True, text=True
+                                combined_audio_path = str(
+                                    output_root / "combined_audio.m4a"
                                 )
+                                with open(audio_list_path, "w") as audio_list:
+                                    for audio_path in valid_audio_paths:
+                                        audio_list.write(
+                                            f"file '{os.path.abspath(audio_path)}'\n"
+                                        )
 
-                                if result.returncode == 0:
-                                    # Clean up temp file
-                                    os.remove(temp_video)
-                                    for clip_path in temporary_clip_paths:
-                                        if os.path.exists(clip_path):
-                                            os.remove(clip_path)
-                                    for temp_path in (
+                                if valid_audio_paths:
+                                    audio_cmd = [
+                                        "ffmpeg",
+                                        "-y",
+                                        "-f",
+                                        "concat",
+                                        "-safe",
+                                        "0",
+                                        "-i",
                                         audio_list_path,
-                                        "output/combined_audio.m4a",
-                                    ):
-                                        if os.path.exists(temp_path):
-                                            os.remove(temp_path)
-                                    print(
-                                        f"✅ Vídeo FFmpeg compilado com áudio: {video_path}"
+                                        "-af",
+                                        f"loudnorm=I={_audio_loudness_target_lufs():.1f}:TP=-1.5:LRA=11",
+                                        "-c:a",
+                                        "aac",
+                                        "-b:a",
+                                        "160k",
+                                        combined_audio_path,
+                                    ]
+                                    audio_result = subprocess.run(
+                                        audio_cmd,
+                                        capture_output=True,
+                                        text=True,
+                                    )
+                                    if audio_result.returncode != 0:
+                                        print(
+                                            "⚠️ Erro ao concatenar áudios: "
+                                            f"{audio_result.stderr[:500]}"
+                                        )
+                                        combined_audio_path = valid_audio_paths[0]
+
+                                    cmd = [
+                                        "ffmpeg",
+                                        "-y",
+                                        "-i",
+                                        temp_video,  # Video input
+                                        "-i",
+                                        combined_audio_path,  # Audio input
+                                        "-c:v",
+                                        "copy",  # Copy video stream
+                                        "-c:a",
+                                        "aac",  # Audio codec
+                                        "-shortest",  # Match shortest stream
+                                        video_path,
+                                    ]
+
+                                    result = subprocess.run(
+                                        cmd, capture_output=True, text=True
                                     )
+
+                                    if result.returncode == 0:
+                                        # Clean up temp file
+                                        os.remove(temp_video)
+                                        for clip_path in temporary_clip_paths:
+                                            if os.path.exists(clip_path):
+                                                os.remove(clip_path)
+                                        for temp_path in (
+                                            audio_list_path,
+                                            str(output_root / "combined_audio.m4a"),
+                                        ):
+                                            if os.path.exists(temp_path):
+                                                os.remove(temp_path)
+                                        print(
+                                            f"✅ Vídeo FFmpeg compilado com áudio: {video_path}"
+                                        )
+                                    else:
+                                        print(
+                                            f"⚠️ Erro ao adicionar áudio: {result.stderr}"
+                                        )
+                                        # Use video without audio
+                                        os.rename(temp_video, video_path)
                                 else:
-                                    print(f"⚠️ Erro ao adicionar áudio: {result.stderr}")
-                                    # Use video without audio
+                                    # No valid audio found, use video only
                                     os.rename(temp_video, video_path)
+                                    print(
+                                        f"✅ Vídeo FFmpeg compilado (sem áudio): {video_path}"
+                                    )
                             else:
-                                # No valid audio found, use video only
-                                os.rename(temp_video, video_path)
-                                print(
-                                    f"✅ Vídeo FFmpeg compilado (sem áudio): {video_path}"
-                                )
+                                print(f"⚠️ Erro na compilação FFmpeg: {result.stderr}")
+                                # Fallback to mock
+                                raise RuntimeError("FFmpeg compilation failed")
                         else:
-                            print(f"⚠️ Erro na compilação FFmpeg: {result.stderr}")
-                            # Fallback to mock
-                            raise RuntimeError("FFmpeg compilation failed")
-                    else:
-                        print("⚠️ Nenhuma imagem válida encontrada para FFmpeg")
-                        raise RuntimeError("No valid images for FFmpeg")
+                            print("⚠️ Nenhuma imagem válida encontrada para FFmpeg")
+                            raise RuntimeError("No valid images for FFmpeg")
 
                 else:
                     # Fallback to mock
@@ -7288,6 +8808,7 @@ Retorne em formato JSON:
                             else "ffmpeg_camera_motion"
                         ),
                         "scene_videos": scene_videos,
+                        "video_render_profile": render_profile_key,
                         "runpod_jobs": runpod_jobs,
                         "current_step": "video_compiled",
                         "status": "completed",
@@ -7317,6 +8838,7 @@ Retorne em formato JSON:
                         "video_size": os.path.getsize(video_path),
                         "generation_method": "mock",
                         "scene_videos": scene_videos,
+                        "video_render_profile": render_profile_key,
                         "runpod_jobs": runpod_jobs,
                         "current_step": "video_compiled",
                         "status": "completed",
@@ -7380,23 +8902,51 @@ Retorne em formato JSON:
             print(f"✅ Vídeo finalizado: {video_path}")
             return state
 
+        def with_stage_events(
+            stage: str,
+            node: Callable[[Open3DAgentState], Open3DAgentState],
+        ) -> Callable[[Open3DAgentState], Open3DAgentState]:
+            def run_stage(state: Open3DAgentState) -> Open3DAgentState:
+                emit_progress("stage", stage=stage, status="started")
+                result = node(state)
+                emit_progress("stage", stage=stage, status="completed")
+                if result.get("cost_estimate"):
+                    emit_progress("cost", **result["cost_estimate"])
+                return result
+
+            return run_stage
+
         # Create workflow graph
         workflow = StateGraph(Open3DAgentState)
 
         # Add nodes
-        workflow.add_node("extract_story", extract_story)
-        workflow.add_node("generate_scenes", generate_scenes)
-        workflow.add_node("generate_images", generate_images)
-        workflow.add_node("generate_audio", generate_audio)
-        workflow.add_node("compile_video", compile_video)
+        for stage, node in (
+            ("extract_story", extract_story),
+            ("generate_scenes", generate_scenes),
+            ("generate_images", generate_images),
+            ("generate_audio", generate_audio),
+            ("stream_scenes", stream_scenes),
+            ("compile_video", compile_video),
+        ):
+            workflow.add_node(stage, with_stage_events(stage, node))
 
         # Set entry point
         workflow.set_entry_point("extract_story")
 
         # Add edges
         workflow.add_edge("extract_story", "generate_scenes")
-        workflow.add_edge("generate_scenes", "generate_images")
+        workflow.add_conditional_edges(
+            "generate_scenes",
+            lambda state: _pipeline_execution_mode(
+                state.get("pipeline_execution_mode")
+            ),
+            {
+                "staged": "generate_images",
+                "scene_streaming": "stream_scenes",
+            },
+        )
         workflow.add_edge("generate_images", "generate_audio")
+        workflow.add_edge("stream_scenes", "compile_video")
         workflow.add_edge("generate_audio", "compile_video")
         workflow.add_edge("compile_video", END)
 
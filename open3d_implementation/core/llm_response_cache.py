@@ -0,0 +1,88 @@
+"""Disk cache for deterministic text-LLM responses (story prompt and scene split)."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Mapping
+
+from open3d_implementation.core.semantic_qa_cache import SemanticQACache
+
+
+def llm_response_cache_key(
+    *,
+    provider: str,
+    model: str,
+    generation_config: Mapping[str, Any],
+    prompt: str,
+) -> str:
+    """Key one response by the exact model call that would produce it."""
+
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    config_json = json.dumps(generation_config, sort_keys=True, default=str)
+    return hashlib.sha256(
+        "\n".join([provider, model, config_json, prompt_hash]).encode("utf-8")
+    ).hexdigest()
+
+
+class LLMResponseCache(SemanticQACache):
+    """Semantic QA cache layout plus a time-to-live per entry.
+
+    Hits refresh the file mtime for LRU eviction, so expiry reads the write
+    time stored inside the entry instead.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, ttl_seconds: float) -> None:
+        super().__init__(root, max_bytes)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        try:
+            stored_at = float(entry.get("stored_at") or 0)
+        except (TypeError, ValueError):
+            stored_at = 0.0
+        if time.time() - stored_at > self.ttl_seconds:
+            try:
+                self._entry_path(key).unlink()
+            except OSError:
+                pass
+            return None
+        value = entry.get("value")
+        return value if isinstance(value, dict) else None
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        super().put(key, {"stored_at": time.time(), "value": dict(value)})
+
+
+def default_llm_response_cache() -> LLMResponseCache | None:
+    if os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true").strip().lower() in {
+        "0",
+        "false",
+        "no",
+    }:
+        return None
+    root = Path(
+        os.getenv(
+            "LLM_RESPONSE_CACHE_DIR",
+            str(Path.home() / ".cache" / "ai_film" / "llm_responses"),
+        )
+    ).expanduser()
+    try:
+        max_mb = float(os.getenv("LLM_RESPONSE_CACHE_MAX_MB", "16"))
+    except ValueError:
+        max_mb = 16.0
+    try:
+        ttl_hours = float(os.getenv("LLM_RESPONSE_CACHE_TTL_HOURS", "168"))
+    except ValueError:
+        ttl_hours = 168.0
+    return LLMResponseCache(
+        root,
+        int(max(1.0, max_mb) * 1024 * 1024),
+        max(0.0, ttl_hours) * 3600,
+    )
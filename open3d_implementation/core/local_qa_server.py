@@ -0,0 +1,305 @@
+"""Long-lived localhost server that owns the local visual QA models.
+
+Pipeline threads, selective retries and smoke scripts point
+``LOCAL_VISION_QA_SERVER_URL`` at this process instead of loading SmolVLM and
+FairFace themselves. One worker thread owns the models; checklist requests
+that arrive together from concurrent runs are evaluated in shared batches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Mapping
+
+from open3d_implementation.core.local_visual_qa import (
+    DEFAULT_LOCAL_AGE_QA_MODEL,
+    DEFAULT_LOCAL_VISION_QA_MODEL,
+    LocalVisualCriterion,
+    LocalVisualQAError,
+    evaluate_local_age_classification,
+    evaluate_local_visual_checklists,
+)
+
+
+@dataclass
+class _PendingRequest:
+    kind: str
+    payload: Mapping[str, Any]
+    future: Future[dict[str, Any]] = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _checklist_criteria(payload: Mapping[str, Any]) -> list[LocalVisualCriterion]:
+    raw_criteria = payload.get("criteria")
+    if not isinstance(raw_criteria, list) or not raw_criteria:
+        raise LocalVisualQAError("local_vlm:empty_criteria")
+    try:
+        return [
+            LocalVisualCriterion(
+                code=str(item["code"]),
+                question=str(item["question"]),
+                expected="no" if item.get("expected") == "no" else "yes",
+                weight=float(item.get("weight", 1.0)),
+                critical=bool(item.get("critical", False)),
+                hero_object=bool(item.get("hero_object", False)),
+            )
+            for item in raw_criteria[:16]
+        ]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise LocalVisualQAError("local_qa_server:invalid_criteria") from exc
+
+
+class LocalQAServer:
+    """Queue-backed owner of the local QA models behind a localhost endpoint."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8767,
+        max_batch_requests: int = 4,
+        batch_window_seconds: float = 0.05,
+        request_timeout_seconds: float = 540.0,
+    ) -> None:
+        self.max_batch_requests = max(1, max_batch_requests)
+        self.batch_window_seconds = max(0.0, batch_window_seconds)
+        # Below the client's LOCAL_VISION_QA_SERVER_TIMEOUT so callers get an
+        # error reply and fall back instead of hitting their own timeout.
+        self.request_timeout_seconds = max(1.0, request_timeout_seconds)
+        self._queue: queue.Queue[_PendingRequest] = queue.Queue()
+        self._latencies_ms: deque[float] = deque(maxlen=200)
+        self._stats_lock = threading.Lock()
+        self._processed = 0
+        self._batches = 0
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    def submit(self, kind: str, payload: Mapping[str, Any]) -> dict[str, Any]:
+        pending = _PendingRequest(kind=kind, payload=payload)
+        self._queue.put(pending)
+        try:
+            return pending.future.result(timeout=self.request_timeout_seconds)
+        except FutureTimeoutError:
+            return {"error": "local_qa_server:timeout"}
+
+    def health(self) -> dict[str, Any]:
+        with self._stats_lock:
+            latencies = list(self._latencies_ms)
+            processed = self._processed
+            batches = self._batches
+        worker_alive = self._worker.ident is None or self._worker.is_alive()
+        return {
+            "status": "ok" if worker_alive else "worker_stopped",
+            "queue_depth": self._queue.qsize(),
+            "processed": processed,
+            "batches": batches,
+            "latency_ms": {
+                "last": round(latencies[-1], 1) if latencies else None,
+                "p50": round(statistics.median(latencies), 1) if latencies else None,
+                "max": round(max(latencies), 1) if latencies else None,
+            },
+        }
+
+    def serve_forever(self) -> None:
+        self._worker.start()
+        self._httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _next_batch(self) -> list[_PendingRequest]:
+        batch = [self._queue.get()]
+        if batch[0].kind != "checklist":
+            return batch
+        deadline = time.monotonic() + self.batch_window_seconds
+        while len(batch) < self.max_batch_requests:
+            try:
+                pending = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if pending.kind != "checklist" or any(
+                pending.payload.get(key) != batch[0].payload.get(key)
+                for key in ("model_name", "backend")
+            ):
+                # Different models cannot share a generate batch; run it next.
+                self._process([pending])
+                continue
+            batch.append(pending)
+        return batch
+
+    def _work(self) -> None:
+        while True:
+            self._process(self._next_batch())
+
+    def _process(self, batch: list[_PendingRequest]) -> None:
+        try:
+            if batch[0].kind == "checklist":
+                results = self._run_checklists(batch)
+            else:
+                results = [self._run_age(pending) for pending in batch]
+        except Exception as exc:
+            # Model loaders can raise anything; the worker must outlive it
+            # and every waiting request must get an answer.
+            error = f"local_qa_server:internal_error:{type(exc).__name__}:{exc}"
+            results = [{"error": error[:300]} for _ in batch]
+        finished_at = time.monotonic()
+        with self._stats_lock:
+            self._batches += 1
+            for pending, result in zip(batch, results):
+                latency_ms = (finished_at - pending.enqueued_at) * 1000
+                self._latencies_ms.append(latency_ms)
+                self._processed += 1
+                result["latency_ms"] = round(latency_ms, 1)
+                result["batch_requests"] = len(batch)
+                if not pending.future.done():
+                    pending.future.set_result(result)
+
+    def _run_checklists(self, batch: list[_PendingRequest]) -> list[dict[str, Any]]:
+        first = batch[0].payload
+        try:
+            grouped = evaluate_local_visual_checklists(
+                checklists=[
+                    (
+                        Path(str(pending.payload.get("image_path", ""))),
+                        _checklist_criteria(pending.payload),
+                    )
+                    for pending in batch
+                ],
+                model_name=str(
+                    first.get("model_name") or DEFAULT_LOCAL_VISION_QA_MODEL
+                ),
+                backend=first.get("backend") or None,
+            )
+        except LocalVisualQAError as exc:
+            if len(batch) == 1:
+                return [{"error": str(exc)}]
+            # Isolate the failing request instead of failing its neighbours.
+            return [self._run_checklists([pending])[0] for pending in batch]
+        return [
+            {
+                "answers": [
+                    {
+                        "code": answer.criterion.code,
+                        "answer": answer.answer,
+                        "raw_response": answer.raw_response,
+                        "backend": answer.backend,
+                    }
+                    for answer in answers
+                ]
+            }
+            for answers in grouped
+        ]
+
+    def _run_age(self, pending: _PendingRequest) -> dict[str, Any]:
+        payload = pending.payload
+        try:
+            raw_box = payload.get("crop_box")
+            if not isinstance(raw_box, list) or len(raw_box) != 4:
+                raise LocalVisualQAError("local_age:invalid_crop_box")
+            estimate = evaluate_local_age_classification(
+                image_path=Path(str(payload.get("image_path", ""))),
+                crop_box=(
+                    float(raw_box[0]),
+                    float(raw_box[1]),
+                    float(raw_box[2]),
+                    float(raw_box[3]),
+                ),
+                model_name=str(payload.get("model_name") or DEFAULT_LOCAL_AGE_QA_MODEL),
+                backend=payload.get("backend") or None,
+            )
+        except (LocalVisualQAError, TypeError, ValueError) as exc:
+            return {"error": str(exc)}
+        return {
+            "predicted_label": estimate.predicted_label,
+            "probabilities": dict(estimate.probabilities),
+            "backend": estimate.backend,
+        }
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: Mapping[str, Any]) -> None:
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path != "/health":
+                    self._reply(404, {"error": "not_found"})
+                    return
+                self._reply(200, server.health())
+
+            def do_POST(self) -> None:  # noqa: N802
+                kind = {"/checklist": "checklist", "/age": "age"}.get(self.path)
+                if kind is None:
+                    self._reply(404, {"error": "not_found"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", "0"))
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._reply(400, {"error": "local_qa_server:invalid_json"})
+                    return
+                if not isinstance(payload, dict):
+                    self._reply(400, {"error": "local_qa_server:invalid_json"})
+                    return
+                result = server.submit(kind, payload)
+                self._reply(422 if "error" in result else 200, result)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--host", default=os.getenv("LOCAL_VISION_QA_SERVER_HOST", "127.0.0.1")
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("LOCAL_VISION_QA_SERVER_PORT", "8767")),
+    )
+    parser.add_argument("--max-batch-requests", type=int, default=4)
+    parser.add_argument("--batch-window-seconds", type=float, default=0.05)
+    parser.add_argument("--request-timeout-seconds", type=float, default=540.0)
+    args = parser.parse_args()
+    # This process owns the models; it must never forward requests to itself.
+    os.environ.pop("LOCAL_VISION_QA_SERVER_URL", None)
+    server = LocalQAServer(
+        host=args.host,
+        port=args.port,
+        max_batch_requests=args.max_batch_requests,
+        batch_window_seconds=args.batch_window_seconds,
+        request_timeout_seconds=args.request_timeout_seconds,
+    )
+    print(f"local QA server listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
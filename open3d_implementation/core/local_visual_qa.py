@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import json
 import os
 import re
-from dataclasses import dataclass
+import threading
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import Literal, Mapping, Protocol, Sequence, cast
@@ -15,6 +19,10 @@ DEFAULT_LOCAL_VISION_QA_MODEL = "HuggingFaceTB/SmolVLM-500M-Instruct"
 DEFAULT_LOCAL_AGE_QA_MODEL = "dima806/fairface_age_image_detection"
 DEFAULT_LOCAL_VISION_QA_REVISION = "a7da5b986cb59b408707209984f360a5f4ad7e47"
 DEFAULT_LOCAL_AGE_QA_REVISION = "4e02ab8057ea7fd74b1670940995c5dfda3e6ec0"
+LOCAL_QA_BACKENDS = ("float32", "bfloat16", "int8")
+
+_PARITY_LOCK = threading.Lock()
+_PARITY_STATE: dict[tuple[str, str], dict[str, int | bool]] = {}
 
 
 class LocalVisualQAError(RuntimeError):
@@ -43,6 +51,7 @@ class LocalVisualAnswer:
     criterion: LocalVisualCriterion
     answer: LocalVisualAnswerValue
     raw_response: str
+    backend: str = "float32"
 
     @property
     def matched(self) -> bool:
@@ -57,6 +66,7 @@ class LocalAgeEstimate:
     probabilities: Mapping[str, float]
     crop_box: tuple[float, float, float, float]
     model_name: str
+    backend: str = "float32"
 
 
 class _TensorLike(Protocol):
@@ -66,6 +76,8 @@ class _TensorLike(Protocol):
 
 
 class _Processor(Protocol):
+    tokenizer: object
+
     def apply_chat_template(
         self,
         conversation: list[dict[str, object]],
@@ -76,8 +88,9 @@ class _Processor(Protocol):
     def __call__(
         self,
         *,
-        text: str,
-        images: list[Image.Image],
+        text: list[str],
+        images: list[list[Image.Image]],
+        padding: bool,
         return_tensors: str,
     ) -> dict[str, object]: ...
 
@@ -100,6 +113,8 @@ class _ClassifierConfig(Protocol):
 
 
 class _ProbabilityTensor(Protocol):
+    def float(self) -> "_ProbabilityTensor": ...
+
     def softmax(self, dim: int) -> "_ProbabilityTensor": ...
 
     def __getitem__(self, key: object) -> "_ProbabilityTensor": ...
@@ -145,6 +160,71 @@ def _local_longest_edge() -> int:
     return max(512, min(1536, value))
 
 
+def _local_batch_size() -> int:
+    raw_value = os.getenv("LOCAL_VISION_QA_BATCH_SIZE", "8").strip()
+    try:
+        value = int(raw_value)
+    except ValueError:
+        value = 8
+    return max(1, min(16, value))
+
+
+def _local_backend() -> str:
+    backend = os.getenv("LOCAL_VISION_QA_BACKEND", "float32").strip().lower()
+    return backend if backend in LOCAL_QA_BACKENDS else "float32"
+
+
+def _local_parity_checks() -> int:
+    raw_value = os.getenv("LOCAL_VISION_QA_PARITY_CHECKS", "3").strip()
+    try:
+        value = int(raw_value)
+    except ValueError:
+        value = 3
+    return max(0, min(50, value))
+
+
+def _trusted_backend(kind: str, backend: str) -> str:
+    """Return float32 once a reduced backend has disagreed with it."""
+
+    if backend == "float32":
+        return backend
+    with _PARITY_LOCK:
+        diverged = _PARITY_STATE.get((kind, backend), {}).get("diverged", False)
+    return "float32" if diverged else backend
+
+
+def _parity_check_due(kind: str, backend: str) -> bool:
+    if backend == "float32":
+        return False
+    with _PARITY_LOCK:
+        state = _PARITY_STATE.setdefault(
+            (kind, backend), {"checked": 0, "diverged": False}
+        )
+        if int(state["checked"]) >= _local_parity_checks():
+            return False
+        state["checked"] = int(state["checked"]) + 1
+    return True
+
+
+def _record_parity_divergence(kind: str, backend: str) -> None:
+    with _PARITY_LOCK:
+        _PARITY_STATE.setdefault((kind, backend), {"checked": 0})["diverged"] = True
+
+
+def _apply_local_backend(model: object, backend: str) -> object:
+    import torch
+
+    if backend == "int8":
+        return torch.ao.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+    if backend == "bfloat16":
+        return cast(torch.nn.Module, model).to(torch.bfloat16)
+    return model
+
+
 def _model_revision(
     *,
     model_name: str,
@@ -160,11 +240,48 @@ def _model_revision(
     raise LocalVisualQAError(f"local_model:revision_required:{env_name}")
 
 
-@lru_cache(maxsize=2)
+def _local_qa_server_url() -> str:
+    return os.getenv("LOCAL_VISION_QA_SERVER_URL", "").strip().rstrip("/")
+
+
+def _post_local_qa_server(
+    route: str, payload: Mapping[str, object]
+) -> dict[str, object] | None:
+    """Send one request to the local QA server.
+
+    Returns ``None`` when the server is unreachable so callers can evaluate
+    in-process; evaluation errors reported by the server are raised.
+    """
+
+    request = urllib.request.Request(
+        f"{_local_qa_server_url()}{route}",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        timeout = float(os.getenv("LOCAL_VISION_QA_SERVER_TIMEOUT", "600"))
+    except ValueError:
+        timeout = 600.0
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return cast(dict[str, object], json.loads(response.read()))
+    except urllib.error.HTTPError as exc:
+        try:
+            error = str(json.loads(exc.read()).get("error") or exc.reason)
+        except (ValueError, AttributeError):
+            error = f"local_qa_server:http_{exc.code}"
+        raise LocalVisualQAError(error) from exc
+    except (urllib.error.URLError, OSError):
+        return None
+
+
+@lru_cache(maxsize=4)
 def _load_local_vision_model(
     model_name: str,
     revision: str,
     longest_edge: int,
+    backend: str = "float32",
 ) -> tuple[_Processor, _Model]:
     try:
         import torch
@@ -179,14 +296,17 @@ def _load_local_vision_model(
             size={"longest_edge": longest_edge},
             local_files_only=_local_files_only(),
         )
+        # Batched generation continues every row from its right edge.
+        processor.tokenizer.padding_side = "left"
         model = AutoModelForVision2Seq.from_pretrained(
             model_name,
             revision=revision,
-            torch_dtype=torch.float32,
+            torch_dtype=torch.bfloat16 if backend == "bfloat16" else torch.float32,
             _attn_implementation="eager",
             low_cpu_mem_usage=True,
             local_files_only=_local_files_only(),
         )
+        model = _apply_local_backend(model, backend)
         model.eval()
     except (ImportError, OSError, RuntimeError, TypeError, ValueError) as exc:
         raise LocalVisualQAError(
@@ -195,10 +315,11 @@ def _load_local_vision_model(
     return cast(_Processor, processor), cast(_Model, model)
 
 
-@lru_cache(maxsize=2)
+@lru_cache(maxsize=4)
 def _load_local_age_model(
     model_name: str,
     revision: str,
+    backend: str = "float32",
 ) -> tuple[_ImageProcessor, _ImageClassifierModel]:
     try:
         from transformers import ViTForImageClassification, ViTImageProcessor
@@ -216,6 +337,7 @@ def _load_local_age_model(
             revision=revision,
             local_files_only=_local_files_only(),
         )
+        model = _apply_local_backend(model, backend)
         model.eval()
     except (ImportError, OSError, RuntimeError, TypeError, ValueError) as exc:
         raise LocalVisualQAError(
@@ -236,36 +358,41 @@ def _load_rgb_image(image_path: Path) -> Image.Image:
         ) from exc
 
 
-def _run_local_visual_prompt(
+def _run_local_visual_prompts(
     *,
     processor: _Processor,
     model: _Model,
-    image: Image.Image,
-    prompt: str,
+    images: Sequence[Image.Image],
+    prompts: Sequence[str],
     max_new_tokens: int,
-) -> str:
+) -> list[str]:
+    """Answer one prompt per image row in a single padded generate call."""
+
     try:
         import torch
     except ImportError as exc:
         raise LocalVisualQAError("local_vlm:torch_unavailable") from exc
 
-    messages: list[dict[str, object]] = [
-        {
-            "role": "user",
-            "content": [
-                {"type": "image"},
-                {"type": "text", "text": prompt},
-            ],
-        }
-    ]
     try:
-        chat_prompt = processor.apply_chat_template(
-            messages,
-            add_generation_prompt=True,
-        )
+        chat_prompts = [
+            processor.apply_chat_template(
+                [
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "image"},
+                            {"type": "text", "text": prompt},
+                        ],
+                    }
+                ],
+                add_generation_prompt=True,
+            )
+            for prompt in prompts
+        ]
         inputs = processor(
-            text=chat_prompt,
-            images=[image],
+            text=chat_prompts,
+            images=[[image] for image in images],
+            padding=True,
             return_tensors="pt",
         )
         input_ids = cast(_TensorLike, inputs["input_ids"])
@@ -289,10 +416,29 @@ def _run_local_visual_prompt(
             f"local_vlm:inference_failed:{type(exc).__name__}:{str(exc)[:240]}"
         ) from exc
 
-    response = responses[0].strip() if responses else ""
-    if not response:
+    if len(responses) != len(prompts):
+        raise LocalVisualQAError("local_vlm:batch_size_mismatch")
+    stripped = [response.strip() for response in responses]
+    if not all(stripped):
         raise LocalVisualQAError("local_vlm:empty_response")
-    return response
+    return stripped
+
+
+def _run_local_visual_prompt(
+    *,
+    processor: _Processor,
+    model: _Model,
+    image: Image.Image,
+    prompt: str,
+    max_new_tokens: int,
+) -> str:
+    return _run_local_visual_prompts(
+        processor=processor,
+        model=model,
+        images=[image],
+        prompts=[prompt],
+        max_new_tokens=max_new_tokens,
+    )[0]
 
 
 def _normalize_binary_answer(response: str) -> LocalVisualAnswerValue:
@@ -333,78 +479,158 @@ def evaluate_local_visual_qa(
     )
 
 
-def evaluate_local_visual_checklist(
+def _evaluate_checklists_with_backend(
     *,
-    image_path: Path,
-    criteria: Sequence[LocalVisualCriterion],
-    model_name: str = DEFAULT_LOCAL_VISION_QA_MODEL,
-) -> list[LocalVisualAnswer]:
-    """Evaluate bounded atomic criteria while loading the image and model once."""
+    checklists: Sequence[tuple[Image.Image, Sequence[LocalVisualCriterion]]],
+    model_name: str,
+    revision: str,
+    backend: str,
+) -> list[list[LocalVisualAnswer]]:
+    processor, model = _load_local_vision_model(
+        model_name,
+        revision,
+        _local_longest_edge(),
+        backend,
+    )
+    rows = [
+        (image, criterion) for image, criteria in checklists for criterion in criteria
+    ]
+    batch_size = _local_batch_size()
+    responses: list[str] = []
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start : start + batch_size]
+        responses.extend(
+            _run_local_visual_prompts(
+                processor=processor,
+                model=model,
+                images=[image for image, _ in chunk],
+                prompts=[
+                    (
+                        "Inspect the full image. Answer only yes, no, or uncertain. "
+                        f"{criterion.question}"
+                    )
+                    for _, criterion in chunk
+                ],
+                max_new_tokens=8,
+            )
+        )
+    answers = [
+        LocalVisualAnswer(
+            criterion=criterion,
+            answer=_normalize_binary_answer(response),
+            raw_response=response[:120],
+            backend=backend,
+        )
+        for (_, criterion), response in zip(rows, responses)
+    ]
+    grouped: list[list[LocalVisualAnswer]] = []
+    offset = 0
+    for _, criteria in checklists:
+        grouped.append(answers[offset : offset + len(criteria)])
+        offset += len(criteria)
+    return grouped
 
-    bounded_criteria = list(criteria[:16])
-    if not bounded_criteria:
-        raise LocalVisualQAError("local_vlm:empty_criteria")
-    image = _load_rgb_image(image_path)
+
+def evaluate_local_visual_checklists(
+    *,
+    checklists: Sequence[tuple[Path, Sequence[LocalVisualCriterion]]],
+    model_name: str = DEFAULT_LOCAL_VISION_QA_MODEL,
+    backend: str | None = None,
+) -> list[list[LocalVisualAnswer]]:
+    """Evaluate several images' checklists in this process, sharing batches.
+
+    Reduced-precision backends are compared against float32 on the first
+    checklists of the process; one disagreement pins the process to float32.
+    """
+
+    loaded: list[tuple[Image.Image, Sequence[LocalVisualCriterion]]] = []
+    for image_path, criteria in checklists:
+        bounded_criteria = list(criteria[:16])
+        if not bounded_criteria:
+            raise LocalVisualQAError("local_vlm:empty_criteria")
+        loaded.append((_load_rgb_image(image_path), bounded_criteria))
     revision = _model_revision(
         model_name=model_name,
         env_name="LOCAL_VISION_QA_REVISION",
         default_model=DEFAULT_LOCAL_VISION_QA_MODEL,
         default_revision=DEFAULT_LOCAL_VISION_QA_REVISION,
     )
-    processor, model = _load_local_vision_model(
-        model_name,
-        revision,
-        _local_longest_edge(),
+    active_backend = _trusted_backend("vision", backend or _local_backend())
+    answers = _evaluate_checklists_with_backend(
+        checklists=loaded,
+        model_name=model_name,
+        revision=revision,
+        backend=active_backend,
     )
-    answers: list[LocalVisualAnswer] = []
-    for criterion in bounded_criteria:
-        response = _run_local_visual_prompt(
-            processor=processor,
-            model=model,
-            image=image,
-            prompt=(
-                "Inspect the full image. Answer only yes, no, or uncertain. "
-                f"{criterion.question}"
-            ),
-            max_new_tokens=8,
-        )
-        answers.append(
-            LocalVisualAnswer(
-                criterion=criterion,
-                answer=_normalize_binary_answer(response),
-                raw_response=response[:120],
-            )
-        )
+    if not _parity_check_due("vision", active_backend):
+        return answers
+    reference = _evaluate_checklists_with_backend(
+        checklists=loaded,
+        model_name=model_name,
+        revision=revision,
+        backend="float32",
+    )
+    if [[answer.answer for answer in group] for group in answers] != [
+        [answer.answer for answer in group] for group in reference
+    ]:
+        _record_parity_divergence("vision", active_backend)
+        return reference
     return answers
 
 
-def evaluate_local_age_classification(
+def evaluate_local_visual_checklist(
     *,
     image_path: Path,
-    crop_box: tuple[float, float, float, float],
-    model_name: str = DEFAULT_LOCAL_AGE_QA_MODEL,
-) -> LocalAgeEstimate:
-    """Classify one fictional-character face crop without transmitting the frame."""
-
-    left, top, right, bottom = crop_box
-    if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
-        raise LocalVisualQAError("local_age:invalid_crop_box")
-    image = _load_rgb_image(image_path)
-    crop = image.crop(
-        (
-            round(image.width * left),
-            round(image.height * top),
-            round(image.width * right),
-            round(image.height * bottom),
+    criteria: Sequence[LocalVisualCriterion],
+    model_name: str = DEFAULT_LOCAL_VISION_QA_MODEL,
+    backend: str | None = None,
+) -> list[LocalVisualAnswer]:
+    """Evaluate bounded atomic criteria in padded batches over one loaded image.
+
+    When ``LOCAL_VISION_QA_SERVER_URL`` points at a running local QA server the
+    request is answered there, so the models are loaded once per machine.
+    """
+
+    if _local_qa_server_url():
+        response = _post_local_qa_server(
+            "/checklist",
+            {
+                "image_path": str(Path(image_path).resolve()),
+                "criteria": [asdict(criterion) for criterion in criteria[:16]],
+                "model_name": model_name,
+                "backend": backend,
+            },
         )
-    )
-    revision = _model_revision(
+        if response is not None:
+            bounded_criteria = list(criteria[:16])
+            remote_answers = response.get("answers", [])
+            if len(remote_answers) != len(bounded_criteria):
+                raise LocalVisualQAError("local_qa_server:answer_count_mismatch")
+            return [
+                LocalVisualAnswer(
+                    criterion=criterion,
+                    answer=_normalize_binary_answer(str(remote.get("answer", ""))),
+                    raw_response=str(remote.get("raw_response", ""))[:120],
+                    backend=str(remote.get("backend", "float32")),
+                )
+                for criterion, remote in zip(bounded_criteria, remote_answers)
+            ]
+    return evaluate_local_visual_checklists(
+        checklists=[(image_path, criteria)],
         model_name=model_name,
-        env_name="LOCAL_AGE_QA_REVISION",
-        default_model=DEFAULT_LOCAL_AGE_QA_MODEL,
-        default_revision=DEFAULT_LOCAL_AGE_QA_REVISION,
-    )
-    processor, model = _load_local_age_model(model_name, revision)
+        backend=backend,
+    )[0]
+
+
+def _classify_age_crop(
+    *,
+    crop: Image.Image,
+    crop_box: tuple[float, float, float, float],
+    model_name: str,
+    revision: str,
+    backend: str,
+) -> LocalAgeEstimate:
+    processor, model = _load_local_age_model(model_name, revision, backend)
     try:
         import torch
     except ImportError as exc:
@@ -412,9 +638,13 @@ def evaluate_local_age_classification(
 
     try:
         inputs = processor(images=crop, return_tensors="pt")
+        if backend == "bfloat16":
+            inputs["pixel_values"] = cast(torch.Tensor, inputs["pixel_values"]).to(
+                torch.bfloat16
+            )
         with torch.inference_mode():
             output = model(**inputs)
-        probability_values = output.logits.softmax(dim=-1)[0].tolist()
+        probability_values = output.logits.float().softmax(dim=-1)[0].tolist()
     except (OSError, RuntimeError, TypeError, ValueError) as exc:
         raise LocalVisualQAError(
             f"local_age:inference_failed:{type(exc).__name__}:{str(exc)[:240]}"
@@ -431,4 +661,81 @@ def evaluate_local_age_classification(
         probabilities=probabilities,
         crop_box=crop_box,
         model_name=model_name,
+        backend=backend,
+    )
+
+
+def evaluate_local_age_classification(
+    *,
+    image_path: Path,
+    crop_box: tuple[float, float, float, float],
+    model_name: str = DEFAULT_LOCAL_AGE_QA_MODEL,
+    backend: str | None = None,
+) -> LocalAgeEstimate:
+    """Classify one fictional-character face crop without transmitting the frame."""
+
+    left, top, right, bottom = crop_box
+    if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
+        raise LocalVisualQAError("local_age:invalid_crop_box")
+    if _local_qa_server_url():
+        response = _post_local_qa_server(
+            "/age",
+            {
+                "image_path": str(Path(image_path).resolve()),
+                "crop_box": list(crop_box),
+                "model_name": model_name,
+                "backend": backend,
+            },
+        )
+        if response is not None:
+            return LocalAgeEstimate(
+                predicted_label=str(response.get("predicted_label", "")),
+                probabilities={
+                    str(label): float(value)
+                    for label, value in cast(
+                        dict[str, float], response.get("probabilities", {})
+                    ).items()
+                },
+                crop_box=crop_box,
+                model_name=model_name,
+                backend=str(response.get("backend", "float32")),
+            )
+    image = _load_rgb_image(image_path)
+    crop = image.crop(
+        (
+            round(image.width * left),
+            round(image.height * top),
+            round(image.width * right),
+            round(image.height * bottom),
+        )
+    )
+    revision = _model_revision(
+        model_name=model_name,
+        env_name="LOCAL_AGE_QA_REVISION",
+        default_model=DEFAULT_LOCAL_AGE_QA_MODEL,
+        default_revision=DEFAULT_LOCAL_AGE_QA_REVISION,
+    )
+    active_backend = _trusted_backend("age", backend or _local_backend())
+    estimate = _classify_age_crop(
+        crop=crop,
+        crop_box=crop_box,
+        model_name=model_name,
+        revision=revision,
+        backend=active_backend,
+    )
+    if not _parity_check_due("age", active_backend):
+        return estimate
+    reference = _classify_age_crop(
+        crop=crop,
+        crop_box=crop_box,
+        model_name=model_name,
+        revision=revision,
+        backend="float32",
     )
+    if estimate.predicted_label != reference.predicted_label or any(
+        abs(estimate.probabilities.get(label, 0.0) - probability) > 0.1
+        for label, probability in reference.probabilities.items()
+    ):
+        _record_parity_divergence("age", active_backend)
+        return reference
+    return estimate
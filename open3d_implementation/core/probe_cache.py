@@ -0,0 +1,137 @@
+"""File-identity keyed cache for ffprobe and PIL measurements.
+
+Entries are keyed by ``(path, size, mtime_ns, kind)``, so a rewritten file
+misses on its own. Each run's ``output`` directory holds one SQLite file, which
+the pipeline, selective retries and later processes reopening the run share;
+a bounded in-process layer in front of it makes repeat probes free.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+PROBE_CACHE_FILENAME = ".probe_cache.sqlite"
+_MEMORY_LIMIT = 2048
+_MEMORY: OrderedDict[tuple[str, int, int, str], dict[str, Any]] = OrderedDict()
+_MEMORY_LOCK = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (path, size, mtime_ns, kind)
+)
+"""
+
+
+def probe_cache_enabled() -> bool:
+    return os.getenv("PROBE_CACHE_ENABLED", "true").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+def probe_cache_path(media_path: Path) -> Path:
+    """The run's ``output`` directory, or the file's own directory outside one."""
+    for parent in media_path.parents:
+        if parent.name == "output":
+            return parent / PROBE_CACHE_FILENAME
+    return media_path.parent / PROBE_CACHE_FILENAME
+
+
+def _db_get(db_path: Path, key: tuple[str, int, int, str]) -> dict[str, Any] | None:
+    if not db_path.exists():
+        return None
+    connection = sqlite3.connect(db_path, timeout=10)
+    try:
+        row = connection.execute(
+            "SELECT result FROM probes "
+            "WHERE path = ? AND size = ? AND mtime_ns = ? AND kind = ?",
+            key,
+        ).fetchone()
+    finally:
+        connection.close()
+    return json.loads(row[0]) if row else None
+
+
+def _db_put(
+    db_path: Path, key: tuple[str, int, int, str], value: dict[str, Any]
+) -> None:
+    connection = sqlite3.connect(db_path, timeout=10)
+    try:
+        with connection:
+            connection.execute(_SCHEMA)
+            # Rows for earlier versions of the same file can never hit again.
+            connection.execute(
+                "DELETE FROM probes WHERE path = ? AND kind = ?", (key[0], key[3])
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?)",
+                (*key, json.dumps(value, ensure_ascii=False, default=str)),
+            )
+    finally:
+        connection.close()
+
+
+def _remember(key: tuple[str, int, int, str], value: dict[str, Any]) -> None:
+    with _MEMORY_LOCK:
+        _MEMORY[key] = value
+        _MEMORY.move_to_end(key)
+        while len(_MEMORY) > _MEMORY_LIMIT:
+            _MEMORY.popitem(last=False)
+
+
+def cached_probe(
+    media_path: Path,
+    kind: str,
+    probe: Callable[[], dict[str, Any] | None],
+) -> dict[str, Any] | None:
+    """Return ``probe()`` for this exact file version, measuring at most once.
+
+    ``None`` results are never cached, so a probe that failed because a file
+    was still being written is retried on the next call.
+    """
+    if not probe_cache_enabled():
+        return probe()
+    try:
+        resolved = media_path.resolve()
+        stat = resolved.stat()
+    except OSError:
+        return probe()
+    db_path = probe_cache_path(resolved)
+    memory_key = (str(resolved), stat.st_size, stat.st_mtime_ns, kind)
+    with _MEMORY_LOCK:
+        if memory_key in _MEMORY:
+            _MEMORY.move_to_end(memory_key)
+            return dict(_MEMORY[memory_key])
+    # Stored relative to the run's output directory so copied runs still hit.
+    db_key = (
+        resolved.relative_to(db_path.parent).as_posix(),
+        stat.st_size,
+        stat.st_mtime_ns,
+        kind,
+    )
+    try:
+        value = _db_get(db_path, db_key)
+    except (OSError, ValueError, sqlite3.Error):
+        value = None
+    if value is None:
+        value = probe()
+        if value is None:
+            return None
+        try:
+            _db_put(db_path, db_key, value)
+        except (OSError, sqlite3.Error):
+            pass
+    _remember(memory_key, value)
+    return dict(value)
@@ -0,0 +1,100 @@
+"""Per-run progress events with resumable ids, fed to the UI's SSE stream.
+
+The UI server owns one :class:`RunEventLog` per run. Pipeline code never sees
+the UI: it calls :func:`emit_progress`, which forwards to whatever sink the
+caller installed with :func:`progress_sink` and is a no-op otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Mapping
+
+ProgressSink = Callable[[str, Mapping[str, Any]], None]
+
+_PROGRESS_SINK: ContextVar[ProgressSink | None] = ContextVar(
+    "ai_film_progress_sink", default=None
+)
+
+
+@dataclass(frozen=True)
+class RunEvent:
+    id: int
+    kind: str
+    data: Mapping[str, Any]
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.kind}\ndata: {payload}\n\n"
+
+
+class RunEventLog:
+    """Bounded, thread-safe event buffer that readers resume by event id.
+
+    Ids grow monotonically for the life of the process. A reader whose last
+    id has already been evicted, or that comes from an earlier process, gets
+    ``gap=True`` and should refetch the full run once. A closed log (its run
+    was evicted) wakes waiting readers so their streams can end.
+    """
+
+    def __init__(self, max_events: int = 500) -> None:
+        self._events: deque[RunEvent] = deque(maxlen=max(1, max_events))
+        self._last_id = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def last_id(self) -> int:
+        with self._condition:
+            return self._last_id
+
+    @property
+    def closed(self) -> bool:
+        with self._condition:
+            return self._closed
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def publish(self, kind: str, data: Mapping[str, Any]) -> int:
+        with self._condition:
+            self._last_id += 1
+            self._events.append(RunEvent(self._last_id, kind, dict(data)))
+            self._condition.notify_all()
+            return self._last_id
+
+    def since(
+        self, last_id: int, timeout: float | None = None
+    ) -> tuple[list[RunEvent], bool]:
+        """Return events after ``last_id``, waiting up to ``timeout`` for one."""
+        with self._condition:
+            if last_id == self._last_id and timeout:
+                self._condition.wait_for(
+                    lambda: self._last_id > last_id or self._closed, timeout=timeout
+                )
+            oldest_id = self._events[0].id if self._events else self._last_id + 1
+            gap = last_id > self._last_id or last_id + 1 < oldest_id
+            start = 0 if gap else last_id
+            return [event for event in self._events if event.id > start], gap
+
+
+@contextmanager
+def progress_sink(sink: ProgressSink) -> Iterator[None]:
+    token = _PROGRESS_SINK.set(sink)
+    try:
+        yield
+    finally:
+        _PROGRESS_SINK.reset(token)
+
+
+def emit_progress(kind: str, **data: Any) -> None:
+    sink = _PROGRESS_SINK.get()
+    if sink is not None:
+        sink(kind, data)
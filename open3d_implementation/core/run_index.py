@@ -0,0 +1,190 @@
+"""SQLite index of pipeline runs so the UI never globs every summary per request."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+from open3d_implementation.core.summary_journal import load_summary, summary_mtime
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    image_style TEXT,
+    image_quality_preset TEXT,
+    video_render_profile TEXT,
+    total_usd REAL NOT NULL DEFAULT 0,
+    quality_score REAL NOT NULL DEFAULT 0,
+    summary_path TEXT NOT NULL,
+    summary_mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_mtime ON runs (summary_mtime DESC);
+CREATE INDEX IF NOT EXISTS runs_by_status ON runs (status, summary_mtime DESC);
+"""
+
+_FILTER_COLUMNS = ("status", "image_style", "image_quality_preset")
+
+
+@dataclass(frozen=True)
+class RunIndexRecord:
+    run_id: str
+    status: str
+    created_at: str
+    updated_at: str
+    image_style: str | None
+    image_quality_preset: str | None
+    video_render_profile: str | None
+    total_usd: float
+    quality_score: float
+    summary_path: str
+    summary_mtime: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def record_from_summary(
+    run_id: str,
+    summary: Mapping[str, Any],
+    summary_path: Path,
+    *,
+    status: str | None = None,
+    created_at: str | None = None,
+) -> RunIndexRecord:
+    mtime = summary_mtime(summary_path)
+    return RunIndexRecord(
+        run_id=run_id,
+        status=str(status or summary.get("status") or "completed"),
+        created_at=created_at
+        or datetime.fromtimestamp(summary_path.parent.stat().st_mtime).isoformat(),
+        updated_at=datetime.fromtimestamp(mtime).isoformat(),
+        image_style=summary.get("image_style"),
+        image_quality_preset=summary.get("image_quality_preset"),
+        video_render_profile=summary.get("video_render_profile"),
+        total_usd=_float((summary.get("cost_estimate") or {}).get("total_usd")),
+        quality_score=_float(
+            (summary.get("quality_metrics") or {}).get("overall_score")
+        ),
+        summary_path=str(summary_path),
+        summary_mtime=mtime,
+    )
+
+
+class RunIndex:
+    """One row per run that has a ``pipeline_summary.json`` on disk.
+
+    Every operation opens its own short-lived connection, so request threads,
+    pipeline workers and retry threads can share one instance.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _rows(self, query: str, params: tuple[Any, ...]) -> list[sqlite3.Row]:
+        with self._connect() as connection:
+            return connection.execute(query, params).fetchall()
+
+    def upsert(self, record: RunIndexRecord) -> None:
+        values = record.to_dict()
+        columns = ", ".join(values)
+        placeholders = ", ".join(f":{column}" for column in values)
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})",
+                values,
+            )
+
+    def get(self, run_id: str) -> RunIndexRecord | None:
+        for row in self._rows("SELECT * FROM runs WHERE run_id = ?", (run_id,)):
+            return RunIndexRecord(**dict(row))
+        return None
+
+    def latest(self) -> RunIndexRecord | None:
+        for row in self._rows(
+            "SELECT * FROM runs ORDER BY summary_mtime DESC LIMIT 1", ()
+        ):
+            return RunIndexRecord(**dict(row))
+        return None
+
+    def list(
+        self,
+        *,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Mapping[str, str] | None = None,
+    ) -> tuple[list[RunIndexRecord], int]:
+        clauses = []
+        params: list[Any] = []
+        for column in _FILTER_COLUMNS:
+            value = (filters or {}).get(column)
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        total = self._rows(
+            f"SELECT COUNT(*) AS total FROM runs {where}", tuple(params)
+        )[0]["total"]
+        records = [
+            RunIndexRecord(**dict(row))
+            for row in self._rows(
+                f"SELECT * FROM runs {where} "
+                "ORDER BY summary_mtime DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            )
+        ]
+        return records, int(total)
+
+    def sync(self, runs_root: Path) -> int:
+        """Index summaries written while the server was down; returns rows touched."""
+        indexed = {
+            row["run_id"]: row["summary_mtime"]
+            for row in self._rows("SELECT run_id, summary_mtime FROM runs", ())
+        }
+        touched = 0
+        for summary_path in runs_root.glob("*/pipeline_summary.json"):
+            run_id = summary_path.parent.name
+            try:
+                if indexed.pop(run_id, None) == summary_mtime(summary_path):
+                    continue
+                summary, _ = load_summary(summary_path)
+                self.upsert(record_from_summary(run_id, summary, summary_path))
+            except (OSError, ValueError):
+                continue
+            touched += 1
+        if indexed:
+            with self._lock, self._connect() as connection:
+                connection.executemany(
+                    "DELETE FROM runs WHERE run_id = ?",
+                    [(run_id,) for run_id in indexed],
+                )
+            touched += len(indexed)
+        return touched
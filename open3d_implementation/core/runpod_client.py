@@ -0,0 +1,435 @@
+"""Shared RunPod Serverless job client with adaptive status polling."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Mapping, Protocol, TypeVar
+
+import requests
+
+RUNPOD_TERMINAL_STATUSES = frozenset({"COMPLETED", "FAILED", "CANCELLED", "TIMED_OUT"})
+
+_T = TypeVar("_T")
+
+
+class RunPodClientError(RuntimeError):
+    """Raised when the RunPod transport cannot complete a request."""
+
+
+class RunPodSubmitTimeout(RunPodClientError):
+    """The request timed out; RunPod may still have accepted (and bill) the job."""
+
+
+class _HTTPResponse(Protocol):
+    status_code: int
+    text: str
+
+    def json(self) -> Any: ...
+
+
+@dataclass(frozen=True)
+class RunPodPoll:
+    """One status observation for a RunPod job."""
+
+    wait_seconds: float
+    http_status: int | None
+    payload: Mapping[str, Any] | None
+    error: str | None = None
+
+    @property
+    def status(self) -> str:
+        return str((self.payload or {}).get("status") or "")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+def runpod_min_poll_seconds() -> float:
+    return max(0.1, min(2.0, _env_float("RUNPOD_POLL_MIN_SECONDS", 0.5)))
+
+
+def runpod_max_poll_seconds() -> float:
+    return max(
+        runpod_min_poll_seconds(),
+        min(15.0, _env_float("RUNPOD_POLL_MAX_SECONDS", 5.0)),
+    )
+
+
+def runpod_runsync_max_expected_seconds() -> float:
+    return max(0.0, min(90.0, _env_float("RUNPOD_RUNSYNC_MAX_EXPECTED_SECONDS", 20.0)))
+
+
+def runpod_poll_interval(
+    *,
+    status: str,
+    previous_interval: float,
+    execution_seconds: float | None,
+    expected_execution_seconds: float | None,
+) -> float:
+    """Back off while queued; poll near the expected finish once running.
+
+    ``execution_seconds`` comes from RunPod's ``executionTime`` telemetry and
+    ``expected_execution_seconds`` from recent completions on the endpoint.
+    """
+    minimum = runpod_min_poll_seconds()
+    maximum = runpod_max_poll_seconds()
+    backoff = min(maximum, max(minimum, previous_interval * 1.6))
+    if status != "IN_PROGRESS" or not expected_execution_seconds:
+        return round(backoff, 3)
+    remaining = expected_execution_seconds - (execution_seconds or 0.0)
+    if remaining <= 0:
+        return round(minimum, 3)
+    return round(max(minimum, min(backoff, remaining / 2)), 3)
+
+
+class _ExecutionClock:
+    """Exponential moving averages of execution and queue delay per endpoint."""
+
+    def __init__(self, smoothing: float = 0.4) -> None:
+        self._smoothing = smoothing
+        self._lock = threading.Lock()
+        self._expected: dict[str, float] = {}
+        self._delay: dict[str, float] = {}
+
+    def _smooth(self, averages: dict[str, float], key: str, value: float) -> None:
+        previous = averages.get(key)
+        averages[key] = (
+            value
+            if previous is None
+            else previous + self._smoothing * (value - previous)
+        )
+
+    def record(
+        self,
+        endpoint_id: str,
+        execution_seconds: float,
+        delay_seconds: float | None = None,
+    ) -> None:
+        if not endpoint_id or execution_seconds <= 0:
+            return
+        with self._lock:
+            self._smooth(self._expected, endpoint_id, execution_seconds)
+            if delay_seconds is not None:
+                self._smooth(self._delay, endpoint_id, max(0.0, delay_seconds))
+
+    def record_submit_timeout(self, endpoint_id: str, waited_seconds: float) -> None:
+        """Count a timed-out submit as queue delay so /runsync is avoided."""
+        with self._lock:
+            self._delay[endpoint_id] = max(
+                self._delay.get(endpoint_id, 0.0), waited_seconds
+            )
+
+    def expected(self, endpoint_id: str) -> float | None:
+        with self._lock:
+            return self._expected.get(endpoint_id)
+
+    def expected_turnaround(self, endpoint_id: str) -> float | None:
+        """Expected queue delay (cold start included) plus execution seconds."""
+        with self._lock:
+            execution = self._expected.get(endpoint_id)
+            if execution is None:
+                return None
+            return execution + self._delay.get(endpoint_id, 0.0)
+
+
+EXECUTION_CLOCK = _ExecutionClock()
+
+
+def _execution_seconds(payload: Mapping[str, Any] | None) -> float | None:
+    raw_value = (payload or {}).get("executionTime")
+    if raw_value is None:
+        return None
+    try:
+        return max(0.0, float(raw_value)) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+def _delay_seconds(payload: Mapping[str, Any] | None) -> float | None:
+    raw_value = (payload or {}).get("delayTime")
+    if raw_value is None:
+        return None
+    try:
+        return max(0.0, float(raw_value)) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+def runpod_submit_url(endpoint_id: str) -> str:
+    """Use ``/runsync`` when recent jobs on the endpoint are queued and finish fast.
+
+    ``?wait=`` makes RunPod answer with the job id once the threshold passes,
+    well inside :func:`runpod_submit_timeout`, so a slow job falls back to
+    status polling instead of a client-side timeout.
+    """
+    expected = EXECUTION_CLOCK.expected_turnaround(endpoint_id)
+    threshold = runpod_runsync_max_expected_seconds()
+    if expected is not None and threshold > 0 and expected <= threshold:
+        wait_ms = max(1000, int(threshold * 1000))
+        return f"https://api.runpod.ai/v2/{endpoint_id}/runsync?wait={wait_ms}"
+    return f"https://api.runpod.ai/v2/{endpoint_id}/run"
+
+
+def is_runsync_url(run_url: str) -> bool:
+    return "/runsync" in run_url
+
+
+def runpod_submit_timeout(run_url: str) -> float:
+    # /runsync holds the request open for up to ?wait= while the worker runs.
+    if is_runsync_url(run_url):
+        return runpod_runsync_max_expected_seconds() + 30.0
+    return 30.0
+
+
+class RunPodBlockingClient:
+    """``requests`` transport used when no asyncio HTTP client is installed."""
+
+    transport = "requests"
+
+    def post(
+        self,
+        url: str,
+        *,
+        json: Mapping[str, object],
+        headers: Mapping[str, str],
+        timeout: float,
+    ) -> _HTTPResponse:
+        try:
+            return requests.post(url, json=json, headers=headers, timeout=timeout)
+        except requests.ConnectTimeout as exc:
+            raise RunPodClientError(f"{type(exc).__name__}: {exc}") from exc
+        except requests.Timeout as exc:
+            raise RunPodSubmitTimeout(f"{type(exc).__name__}: {exc}") from exc
+        except requests.RequestException as exc:
+            raise RunPodClientError(f"{type(exc).__name__}: {exc}") from exc
+
+    def wait_for_job(
+        self,
+        *,
+        endpoint_id: str,
+        status_url: str,
+        headers: Mapping[str, str],
+        max_wait_seconds: float,
+        on_poll: Callable[[RunPodPoll], None],
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Mapping[str, Any] | None:
+        started_at = time.monotonic()
+        interval = runpod_min_poll_seconds()
+        execution_seconds: float | None = None
+        status = "IN_QUEUE"
+        while True:
+            elapsed = time.monotonic() - started_at
+            if elapsed + interval > max_wait_seconds:
+                return None
+            if should_stop is not None and should_stop():
+                return None
+            time.sleep(interval)
+            wait_seconds = round(time.monotonic() - started_at, 1)
+            try:
+                response = requests.get(status_url, headers=headers, timeout=10)
+            except requests.RequestException as exc:
+                on_poll(RunPodPoll(wait_seconds, None, None, type(exc).__name__))
+            else:
+                poll = _poll_from_response(wait_seconds, response)
+                on_poll(poll)
+                if poll.payload is not None:
+                    status = poll.status
+                    execution_seconds = _execution_seconds(poll.payload)
+                    if status in RUNPOD_TERMINAL_STATUSES:
+                        record_runpod_completion(endpoint_id, poll.payload)
+                        return poll.payload
+            interval = runpod_poll_interval(
+                status=status,
+                previous_interval=interval,
+                execution_seconds=execution_seconds,
+                expected_execution_seconds=EXECUTION_CLOCK.expected(endpoint_id),
+            )
+
+    def close(self) -> None:
+        return None
+
+
+class RunPodAsyncClient:
+    """One event loop and one keep-alive ``httpx`` pool shared by all scenes.
+
+    Scene threads block on futures while every poll timer and HTTP request is
+    multiplexed on the client's loop.
+    """
+
+    transport = "httpx_async"
+
+    def __init__(self, *, max_connections: int = 16) -> None:
+        import httpx
+
+        self._httpx = httpx
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="runpod-client",
+            daemon=True,
+        )
+        self._thread.start()
+        self._session = self._run(self._open_session(max_connections))
+
+    async def _open_session(self, max_connections: int) -> Any:
+        return self._httpx.AsyncClient(
+            limits=self._httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60.0,
+            ),
+        )
+
+    def _run(
+        self,
+        coroutine: Coroutine[Any, Any, _T],
+        timeout: float | None = None,
+    ) -> _T:
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        return future.result(timeout)
+
+    def post(
+        self,
+        url: str,
+        *,
+        json: Mapping[str, object],
+        headers: Mapping[str, str],
+        timeout: float,
+    ) -> _HTTPResponse:
+        try:
+            return self._run(
+                self._session.post(
+                    url, json=dict(json), headers=dict(headers), timeout=timeout
+                )
+            )
+        except (self._httpx.ConnectTimeout, self._httpx.PoolTimeout) as exc:
+            # Never reached RunPod, so nothing was queued.
+            raise RunPodClientError(f"{type(exc).__name__}: {exc}") from exc
+        except self._httpx.TimeoutException as exc:
+            raise RunPodSubmitTimeout(f"{type(exc).__name__}: {exc}") from exc
+        except self._httpx.HTTPError as exc:
+            raise RunPodClientError(f"{type(exc).__name__}: {exc}") from exc
+
+    def wait_for_job(
+        self,
+        *,
+        endpoint_id: str,
+        status_url: str,
+        headers: Mapping[str, str],
+        max_wait_seconds: float,
+        on_poll: Callable[[RunPodPoll], None],
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Mapping[str, Any] | None:
+        return self._run(
+            self._wait_for_job(
+                endpoint_id=endpoint_id,
+                status_url=status_url,
+                headers=dict(headers),
+                max_wait_seconds=max_wait_seconds,
+                on_poll=on_poll,
+                should_stop=should_stop,
+            )
+        )
+
+    async def _wait_for_job(
+        self,
+        *,
+        endpoint_id: str,
+        status_url: str,
+        headers: dict[str, str],
+        max_wait_seconds: float,
+        on_poll: Callable[[RunPodPoll], None],
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Mapping[str, Any] | None:
+        started_at = time.monotonic()
+        interval = runpod_min_poll_seconds()
+        execution_seconds: float | None = None
+        status = "IN_QUEUE"
+        while True:
+            elapsed = time.monotonic() - started_at
+            if elapsed + interval > max_wait_seconds:
+                return None
+            if should_stop is not None and should_stop():
+                return None
+            await asyncio.sleep(interval)
+            wait_seconds = round(time.monotonic() - started_at, 1)
+            try:
+                response = await self._session.get(
+                    status_url, headers=headers, timeout=10.0
+                )
+            except self._httpx.HTTPError as exc:
+                on_poll(RunPodPoll(wait_seconds, None, None, type(exc).__name__))
+            else:
+                poll = _poll_from_response(wait_seconds, response)
+                on_poll(poll)
+                if poll.payload is not None:
+                    status = poll.status
+                    execution_seconds = _execution_seconds(poll.payload)
+                    if status in RUNPOD_TERMINAL_STATUSES:
+                        record_runpod_completion(endpoint_id, poll.payload)
+                        return poll.payload
+            interval = runpod_poll_interval(
+                status=status,
+                previous_interval=interval,
+                execution_seconds=execution_seconds,
+                expected_execution_seconds=EXECUTION_CLOCK.expected(endpoint_id),
+            )
+
+    def close(self) -> None:
+        try:
+            self._run(self._session.aclose(), timeout=5)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def _poll_from_response(wait_seconds: float, response: _HTTPResponse) -> RunPodPoll:
+    if response.status_code != 200:
+        return RunPodPoll(wait_seconds, response.status_code, None)
+    try:
+        payload = response.json()
+    except ValueError:
+        return RunPodPoll(wait_seconds, response.status_code, None, "InvalidJSON")
+    if not isinstance(payload, Mapping):
+        return RunPodPoll(wait_seconds, response.status_code, None, "InvalidJSON")
+    return RunPodPoll(wait_seconds, response.status_code, payload)
+
+
+def record_runpod_completion(endpoint_id: str, payload: Mapping[str, Any]) -> None:
+    """Feed a completed job into the endpoint execution and delay estimates."""
+    execution_seconds = _execution_seconds(payload)
+    if payload.get("status") == "COMPLETED" and execution_seconds:
+        EXECUTION_CLOCK.record(endpoint_id, execution_seconds, _delay_seconds(payload))
+
+
+_CLIENT_LOCK = threading.Lock()
+_CLIENT: RunPodAsyncClient | RunPodBlockingClient | None = None
+
+
+def _async_client_enabled() -> bool:
+    return os.getenv("RUNPOD_ASYNC_CLIENT", "true").strip().lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+def get_runpod_client() -> RunPodAsyncClient | RunPodBlockingClient:
+    """Return the process-wide client, preferring the asyncio transport."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = RunPodBlockingClient()
+            if _async_client_enabled():
+                try:
+                    _CLIENT = RunPodAsyncClient()
+                except ImportError:
+                    pass
+        return _CLIENT
@@ -0,0 +1,132 @@
+"""Content-addressed disk cache for semantic image QA verdicts."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Mapping
+
+_EVICTION_LOCK = threading.Lock()
+# Bump when the verdict parsing or local checklist changes shape, so older
+# entries stop matching instead of replaying stale verdicts.
+SEMANTIC_QA_CACHE_KEY_VERSION = "2"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def semantic_qa_cache_key(
+    *,
+    image_sha256: str,
+    contract: Mapping[str, Any],
+    prompt: str,
+    provider: str,
+    model: str,
+    revision: str,
+) -> str:
+    """Key one verdict by image bytes, scene contract, QA prompt and model."""
+
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    contract_hash = hashlib.sha256(
+        json.dumps(contract, sort_keys=True, ensure_ascii=False, default=str).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+    return hashlib.sha256(
+        "\n".join(
+            [
+                SEMANTIC_QA_CACHE_KEY_VERSION,
+                image_sha256,
+                contract_hash,
+                prompt_hash,
+                provider,
+                model,
+                revision,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class SemanticQACache:
+    """JSON-file cache under one directory with least-recently-used eviction.
+
+    Entries are touched on every hit, so file modification time is the LRU
+    order; the oldest files go first once the directory exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry_path = self._entry_path(key)
+        try:
+            value = json.loads(entry_path.read_text(encoding="utf-8"))
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return value if isinstance(value, dict) else None
+
+    def put(self, key: str, value: Mapping[str, Any]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            entry_path = self._entry_path(key)
+            temp_path = entry_path.with_suffix(f".{threading.get_ident()}.tmp")
+            temp_path.write_text(
+                json.dumps(value, ensure_ascii=False, default=str),
+                encoding="utf-8",
+            )
+            os.replace(temp_path, entry_path)
+        except OSError:
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        with _EVICTION_LOCK:
+            entries = []
+            for entry_path in self.root.glob("*.json"):
+                try:
+                    stat = entry_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    entry_path.unlink()
+                except OSError:
+                    continue
+                total -= size
+
+
+def default_semantic_qa_cache() -> SemanticQACache | None:
+    if os.getenv("SEMANTIC_QA_CACHE_ENABLED", "true").strip().lower() in {
+        "0",
+        "false",
+        "no",
+    }:
+        return None
+    root = Path(
+        os.getenv(
+            "SEMANTIC_QA_CACHE_DIR",
+            str(Path.home() / ".cache" / "ai_film" / "semantic_qa"),
+        )
+    ).expanduser()
+    try:
+        max_mb = float(os.getenv("SEMANTIC_QA_CACHE_MAX_MB", "64"))
+    except ValueError:
+        max_mb = 64.0
+    return SemanticQACache(root, int(max(1.0, max_mb) * 1024 * 1024))
@@ -0,0 +1,161 @@
+"""Snapshot plus append-only journal persistence for run summaries.
+
+``pipeline_summary.json`` stays the compacted snapshot. Each later change is
+one JSON line in ``pipeline_summary.journal.jsonl`` holding only the paths
+that changed (lists that only grew are stored as their new tail), and loading
+replays the journal over the snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+
+
+def journal_path(summary_path: Path) -> Path:
+    return summary_path.with_name(f"{summary_path.stem}.journal.jsonl")
+
+
+def summary_patch(
+    before: Mapping[str, Any],
+    after: Mapping[str, Any],
+    prefix: tuple[str, ...] = (),
+) -> list[dict[str, Any]]:
+    """Describe ``after`` relative to ``before``; nested dicts diff per key.
+
+    A list whose old value is a prefix of the new one becomes an ``extend``
+    op with only the appended items; any other list change replaces it.
+    """
+    ops: list[dict[str, Any]] = [
+        {"op": "unset", "path": [*prefix, key]} for key in before if key not in after
+    ]
+    for key, value in after.items():
+        previous = before.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            ops.extend(summary_patch(previous, value, (*prefix, key)))
+        elif (
+            isinstance(value, list)
+            and isinstance(previous, list)
+            and len(previous) < len(value)
+            and value[: len(previous)] == previous
+        ):
+            ops.append(
+                {
+                    "op": "extend",
+                    "path": [*prefix, key],
+                    "value": value[len(previous) :],
+                }
+            )
+        elif key not in before or previous != value:
+            ops.append({"op": "set", "path": [*prefix, key], "value": value})
+    return ops
+
+
+def apply_patch(summary: dict[str, Any], ops: list[dict[str, Any]]) -> None:
+    for op in ops:
+        *parents, leaf = op["path"]
+        target = summary
+        for key in parents:
+            child = target.get(key)
+            if not isinstance(child, dict):
+                child = target[key] = {}
+            target = child
+        if op["op"] == "unset":
+            target.pop(leaf, None)
+        elif op["op"] == "extend" and isinstance(target.get(leaf), list):
+            target[leaf].extend(op["value"])
+        else:
+            target[leaf] = op["value"]
+
+
+def write_snapshot(summary_path: Path, summary: Mapping[str, Any]) -> None:
+    """Rewrite the full snapshot and drop the journal it now contains."""
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = summary_path.with_suffix(".json.tmp")
+    temp_path.write_text(
+        json.dumps(summary, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    temp_path.replace(summary_path)
+    journal_path(summary_path).unlink(missing_ok=True)
+
+
+def _repair_journal_tail(journal: Path) -> None:
+    """Drop a torn trailing line, or finish a whole one missing its newline."""
+    try:
+        with journal.open("rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            size = handle.tell()
+            if size == 0:
+                return
+            handle.seek(size - 1)
+            if handle.read(1) == b"\n":
+                return
+            handle.seek(0)
+            data = handle.read()
+    except FileNotFoundError:
+        return
+    good_offset = data.rfind(b"\n") + 1
+    try:
+        json.loads(data[good_offset:])
+    except ValueError:
+        with journal.open("r+b") as handle:
+            handle.truncate(good_offset)
+            handle.flush()
+            os.fsync(handle.fileno())
+    else:
+        with journal.open("ab") as handle:
+            handle.write(b"\n")
+
+
+def append_patch(summary_path: Path, ops: list[dict[str, Any]]) -> None:
+    """Append one journal line; callers serialize writers per summary.
+
+    A crash mid-append can leave a torn last line, and appending after it
+    would hide every later entry from replay, so the tail is repaired first.
+    """
+    line = json.dumps(
+        {"at": datetime.now(timezone.utc).isoformat(), "ops": ops},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    journal_file = journal_path(summary_path)
+    _repair_journal_tail(journal_file)
+    with journal_file.open("a", encoding="utf-8") as journal:
+        journal.write(line + "\n")
+        journal.flush()
+        os.fsync(journal.fileno())
+
+
+def load_summary(summary_path: Path) -> tuple[dict[str, Any], int]:
+    """Return the snapshot with the journal replayed, and the events replayed.
+
+    Read-only: replay stops at the first unreadable line, which may be a
+    concurrent append in progress. ``append_patch`` repairs a torn tail
+    under the writer's lock.
+    """
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    events = 0
+    try:
+        lines = journal_path(summary_path).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return summary, events
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            break
+        apply_patch(summary, entry.get("ops", []))
+        events += 1
+    return summary, events
+
+
+def summary_mtime(summary_path: Path) -> float:
+    mtime = summary_path.stat().st_mtime
+    try:
+        return max(mtime, journal_path(summary_path).stat().st_mtime)
+    except FileNotFoundError:
+        return mtime
@@ -1,9 +1,12 @@
 """Configuração mínima de LLM para o pipeline open3d."""
 
 import os
+import threading
+import time
 from types import SimpleNamespace
 
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
 
 GEMINI_TEXT_MODEL = os.getenv(
     "GEMINI_TEXT_MODEL",
@@ -19,6 +22,46 @@ GEMINI_IMAGE_QUALITY_MODEL = os.getenv(
 )
 
 
+# Um cliente por modelo no processo; após uma falha de transporte, 5xx ou 429
+# o Gemini fica em cooldown e as chamadas falham na hora em vez de esperar
+# outro timeout. Erros de um prompt (ex.: resposta bloqueada) não abrem o
+# circuito, senão um prompt ruim degradaria todas as runs do processo.
+_CLIENTS: dict[str, "_GeminiChat"] = {}
+_CLIENTS_LOCK = threading.Lock()
+_COOLDOWN_UNTIL = 0.0
+
+
+def _provider_cooldown_seconds() -> float:
+    try:
+        return max(0.0, float(os.getenv("LLM_PROVIDER_COOLDOWN_SECONDS", "300")))
+    except ValueError:
+        return 300.0
+
+
+def record_provider_failure(provider: str = "gemini") -> None:
+    global _COOLDOWN_UNTIL
+    with _CLIENTS_LOCK:
+        _COOLDOWN_UNTIL = time.monotonic() + _provider_cooldown_seconds()
+
+
+def provider_available(provider: str = "gemini") -> bool:
+    with _CLIENTS_LOCK:
+        return time.monotonic() >= _COOLDOWN_UNTIL
+
+
+def _is_provider_outage(exc: Exception) -> bool:
+    return isinstance(
+        exc,
+        (
+            google_exceptions.ServerError,
+            google_exceptions.TooManyRequests,
+            google_exceptions.RetryError,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
 class _GeminiChat:
     def __init__(self, model_name: str):
         api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
@@ -26,23 +69,48 @@ class _GeminiChat:
         self._model = genai.GenerativeModel(model_name)
 
     def invoke(self, prompt: str):
-        response = self._model.generate_content(prompt)
-        return SimpleNamespace(content=response.text)
+        if not provider_available():
+            raise RuntimeError("Gemini em cooldown após falha recente")
+        try:
+            response = self._model.generate_content(prompt)
+            return SimpleNamespace(content=response.text)
+        except Exception as exc:
+            if _is_provider_outage(exc):
+                record_provider_failure()
+            raise
 
 
 def get_llm(use_pro_model: bool = False):
     """Retorna um cliente com interface .invoke(prompt) -> objeto com .content"""
     model_name = GEMINI_TEXT_MODEL
-    return _GeminiChat(model_name)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(model_name)
+        if client is None:
+            client = _CLIENTS[model_name] = _GeminiChat(model_name)
+        return client
 
 
-def generate_cinematic_prompt(story_text: str, use_pro_model: bool = False) -> str:
-    """Resume o tom visual/cinematográfico da história para guiar a geração de imagens."""
-    llm = get_llm(use_pro_model=use_pro_model)
-    instruction = (
+def describe_llm(provider: str | None = None, with_fallback: bool = False) -> dict:
+    """Identifica o modelo de get_llm sem instanciar o cliente (chave de cache)."""
+    return {"provider": "gemini", "model": GEMINI_TEXT_MODEL, "generation_config": {}}
+
+
+def build_cinematic_prompt_request(story_text: str) -> str:
+    """Texto enviado ao LLM por generate_cinematic_prompt."""
+    return (
         "Resuma o tom visual e cinematográfico desta história em até 3 frases, "
         "sugerindo paleta de cores, iluminação e atmosfera para gerar imagens de cena:\n\n"
         f"{story_text[:4000]}"
     )
-    response = llm.invoke(instruction)
+
+
+def fallback_cinematic_prompt(story_text: str) -> str:
+    """Mesmo contrato do módulo completo; aqui generate_cinematic_prompt propaga erros."""
+    return f"Cinematic scene based on: {story_text[:100]}..., photorealistic, highly detailed, 8K"
+
+
+def generate_cinematic_prompt(story_text: str, use_pro_model: bool = False) -> str:
+    """Resume o tom visual/cinematográfico da história para guiar a geração de imagens."""
+    llm = get_llm(use_pro_model=use_pro_model)
+    response = llm.invoke(build_cinematic_prompt_request(story_text))
     return response.content
@@ -11,17 +11,19 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import queue
+import sqlite3
 import subprocess
 import sys
 import threading
 import traceback
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import requests
-from dagster._core.errors import DagsterError
 from dotenv import load_dotenv
 from flask import Flask, Response, jsonify, redirect, request, send_file
 
@@ -44,6 +46,7 @@ ALLOWED_IMAGE_STYLES = {
     "anime_cinematic",
 }
 ALLOWED_IMAGE_QUALITY_PRESETS = {"balanced", "high", "turbo"}
+ALLOWED_VIDEO_RENDER_PROFILES = {"draft", "review", "master"}
 ALLOWED_CURATION_STATUSES = {
     "approved",
     "rejected",
@@ -75,6 +78,62 @@ RUNS_ROOT.mkdir(parents=True, exist_ok=True)
 
 RUNS: dict[str, dict[str, Any]] = {}
 RUN_LOCK = threading.Lock()
+ACTIVE_RUN_STATUSES = {"queued", "running"}
+RUN_QUEUE: queue.Queue[tuple[Any, ...]] = queue.Queue()
+RUN_WORKERS: list[threading.Thread] = []
+# Run ids still waiting in RUN_QUEUE, oldest first; guarded by RUN_LOCK.
+QUEUED_RUN_IDS: list[str] = []
+# Background retries and uploads per run; those runs are never evicted.
+RUN_JOBS: dict[str, int] = {}
+RUN_INDEX_LOCK = threading.Lock()
+RUN_INDEX: Any = None
+# Last persisted summary per run, the base for the next journal patch.
+SUMMARY_LOCK = threading.Lock()
+SUMMARY_BASELINES: dict[str, dict[str, Any]] = {}
+# Progress events per run for /api/runs/<run_id>/events. RUN_EVENTS_LOCK is
+# a leaf lock, so events can be published while RUN_LOCK is held.
+RUN_EVENTS_LOCK = threading.Lock()
+RUN_EVENTS: dict[str, Any] = {}
+RUN_EVENT_KEEPALIVE_SECONDS = 15.0
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+THUMBNAIL_WIDTHS = (160, 320, 640)
+THUMBNAIL_IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+THUMBNAIL_VIDEO_SUFFIXES = {".mp4", ".mov", ".webm"}
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Filesystem roots owned by one pipeline run.
+
+    Runs share one server process, so nothing here may touch the working
+    directory or ``os.environ``; every path is handed to the pipeline explicitly.
+    """
+
+    run_id: str
+    run_dir: Path
+
+    @property
+    def output_root(self) -> Path:
+        return self.run_dir / "output"
+
+    @property
+    def dagster_home(self) -> Path:
+        return self.run_dir / "dagster_home"
+
+    @property
+    def story_file_path(self) -> Path:
+        return self.run_dir / "historia.txt"
+
+    def prepare(self, story_text: str, *, with_dagster_home: bool = True) -> None:
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        self.story_file_path.write_text(story_text, encoding="utf-8")
+        if not with_dagster_home:
+            return
+        self.dagster_home.mkdir(exist_ok=True)
+        (self.dagster_home / "dagster.yaml").write_text(
+            "telemetry:\n  enabled: false\n",
+            encoding="utf-8",
+        )
 
 
 def _utc_now_iso() -> str:
@@ -254,6 +313,14 @@ INDEX_HTML = r"""<!doctype html>
         <option value="turbo">Turbo SDXL</option>
         <option value="balanced">Balanceada</option>
       </select>
+      <label for="renderProfile">Render do vídeo</label>
+      <select id="renderProfile">
+        <option value="">Padrão do servidor (VIDEO_RENDER_PROFILE)</option>
+        <option value="master">Master (1080p, slow)</option>
+        <option value="review">Revisão (720p, veryfast)</option>
+        <option value="draft">Rascunho (540p, ultrafast)</option>
+      </select>
+      <label><input id="bypassCache" type="checkbox"> Ignorar cache do LLM</label>
       <input id="file" type="file" accept=".txt,.md,text/plain" style="margin-bottom:12px">
       <textarea id="story" spellcheck="false"></textarea>
     </section>
@@ -269,6 +336,7 @@ INDEX_HTML = r"""<!doctype html>
       </div>
       <div id="curation" class="curation"></div>
       <div id="log" class="log"></div>
+      <div id="liveJobs"></div>
       <div id="monitoring"></div>
       <div id="assets" class="assets"></div>
     </section>
@@ -276,7 +344,8 @@ INDEX_HTML = r"""<!doctype html>
 </main>
 <script>
 let currentRun = null;
-let pollTimer = null;
+let runEvents = null;
+let liveJobs = {};
 let comparisonSelections = {};
 
 const $ = (id) => document.getElementById(id);
@@ -348,8 +417,26 @@ function findByScene(items, sceneId) {
   return (items || []).find(item => String(item.scene_id) === String(sceneId)) || {};
 }
 
-function mediaUrl(run, path) {
-  return `/api/runs/${run.id}/file?path=${encodeURIComponent(path)}`;
+// Attempt records carry a size/mtime version per file; versioned URLs are
+// served as immutable, so the browser reuses them without revalidating.
+function mediaVersion(run, path) {
+  for (const review of Object.values(run.summary?.curation?.scenes || {})) {
+    for (const attempt of review.attempts || []) {
+      for (const [key, version] of Object.entries(attempt.media_versions || {})) {
+        if (attempt[key] === path) return version;
+      }
+    }
+  }
+  return '';
+}
+
+function mediaUrl(run, path, endpoint = 'file', width = 0) {
+  const version = mediaVersion(run, path);
+  return `/api/runs/${run.id}/${endpoint}?path=${encodeURIComponent(path)}${version ? `&v=${version}` : ''}${width ? `&width=${width}` : ''}`;
+}
+
+function thumbnailUrl(run, path, width = 320) {
+  return mediaUrl(run, path, 'thumbnail', width);
 }
 
 function activeAttempt(review) {
@@ -369,8 +456,8 @@ function attemptOptions(attempts, selected) {
 }
 
 function attemptMedia(run, attempt) {
-  const image = attempt.image_path ? `<img src="${mediaUrl(run, attempt.image_path)}" alt="${escapeHtml(attempt.id)} imagem">` : '<div class="asset-meta">sem imagem nesta tentativa</div>';
-  const video = attempt.video_path ? `<video controls src="${mediaUrl(run, attempt.video_path)}"></video>` : '<div class="asset-meta">sem vídeo nesta tentativa</div>';
+  const image = attempt.image_path ? `<a href="${mediaUrl(run, attempt.image_path)}" target="_blank"><img loading="lazy" src="${thumbnailUrl(run, attempt.image_path, 640)}" alt="${escapeHtml(attempt.id)} imagem"></a>` : '<div class="asset-meta">sem imagem nesta tentativa</div>';
+  const video = attempt.video_path ? `<video controls preload="metadata" poster="${thumbnailUrl(run, attempt.video_path, 640)}" src="${mediaUrl(run, attempt.video_path)}"></video>` : '<div class="asset-meta">sem vídeo nesta tentativa</div>';
   const audio = attempt.audio_path ? `<audio controls src="${mediaUrl(run, attempt.audio_path)}"></audio>` : '<div class="asset-meta">sem áudio nesta tentativa</div>';
   return `${image}${video}${audio}`;
 }
@@ -586,11 +673,11 @@ function renderCuration(run) {
       <div class="review-card">
         <div class="review-grid">
           <div>
-            <img src="/api/runs/${run.id}/file?path=${encodeURIComponent(img.image_path)}" alt="Cena ${escapeHtml(sceneId)}">
+            <a href="${mediaUrl(run, img.image_path)}" target="_blank"><img loading="lazy" src="${thumbnailUrl(run, img.image_path, 640)}" alt="Cena ${escapeHtml(sceneId)}"></a>
           </div>
           <div>
-            ${clip.video_path ? `<video controls src="/api/runs/${run.id}/file?path=${encodeURIComponent(clip.video_path)}"></video>` : `<div class="asset-meta">clipe ainda indisponível</div>`}
-            ${audio.audio_path ? `<audio controls src="/api/runs/${run.id}/file?path=${encodeURIComponent(audio.audio_path)}" style="width:100%; margin-top:8px"></audio>` : ''}
+            ${clip.video_path ? `<video controls preload="metadata" poster="${thumbnailUrl(run, clip.video_path, 640)}" src="${mediaUrl(run, clip.video_path)}"></video>` : clip.assembly === 'single_pass' ? `<div class="asset-meta">cena montada direto no vídeo final (passo único); o clipe é renderizado ao recompilar</div>` : `<div class="asset-meta">clipe ainda indisponível</div>`}
+            ${audio.audio_path ? `<audio controls preload="metadata" src="${mediaUrl(run, audio.audio_path)}" style="width:100%; margin-top:8px"></audio>` : ''}
           </div>
           <div class="review-meta">
             <strong>Cena ${escapeHtml(sceneId)}</strong>
@@ -644,7 +731,7 @@ function renderCuration(run) {
         <div class="curation-sub">YouTube: ${escapeHtml(publication.status || 'not_started')}${publication.url ? ` · <a href="${escapeHtml(publication.url)}" target="_blank">${escapeHtml(publication.url)}</a>` : ''}${publication.error ? ` · ${escapeHtml(publication.error)}` : ''}</div>
         ${production.published_current === false && publication.status === 'published' ? `<div class="curation-sub warn">O vídeo publicado não corresponde ao corte final atual.</div>` : ''}
       </div>
-      ${summary.video_path ? `<video controls onplay="markFinalVideoViewed()" src="/api/runs/${run.id}/file?path=${encodeURIComponent('output/final_video.mp4')}"></video>` : `<span class="badge pending_review">sem vídeo</span>`}
+      ${summary.video_path ? `<video controls preload="metadata" onplay="markFinalVideoViewed()" src="${mediaUrl(run, 'output/final_video.mp4')}"></video>` : `<span class="badge pending_review">sem vídeo</span>`}
       <div class="final-actions">
         <button onclick="authenticateYoutube().catch(err => logLine(err.message))">Autenticar YouTube</button>
         <button onclick="approveFinalCut()" ${curation.can_final_approve ? '' : 'disabled'}>Aprovar corte final</button>
@@ -663,9 +750,13 @@ function renderRun(run) {
   $('audio').textContent = run.summary?.audio_count ?? 0;
   $('quality').textContent = run.summary?.quality_metrics?.overall_score ?? 0;
   $('cost').textContent = `$${(run.summary?.cost_estimate?.total_usd ?? 0).toFixed(4)}`;
-  $('retryBtn').disabled = !currentRun || run.status === 'running';
-  $('runBtn').disabled = run.status === 'running';
+  $('retryBtn').disabled = !currentRun || ['queued', 'running'].includes(run.status);
+  $('runBtn').disabled = ['queued', 'running'].includes(run.status);
   $('log').textContent = (run.log || []).join('\n');
+  if (!['queued', 'running'].includes(run.status)) {
+    liveJobs = {};
+    renderLiveJobs();
+  }
   renderCuration(run);
 
   const monitoring = $('monitoring');
@@ -710,8 +801,8 @@ function renderRun(run) {
       const sceneId = String(img.scene_id);
       const review = curation[sceneId] || {status: 'pending_review', note: ''};
       div.innerHTML = `
-        <img src="/api/runs/${run.id}/file?path=${encodeURIComponent(img.image_path)}" alt="Cena ${escapeHtml(sceneId)}">
-        <a href="/api/runs/${run.id}/file?path=${encodeURIComponent(img.image_path)}" target="_blank">Cena ${escapeHtml(sceneId)} · ${escapeHtml(img.camera_motion || 'motion')}</a>
+        <img loading="lazy" src="${thumbnailUrl(run, img.image_path)}" alt="Cena ${escapeHtml(sceneId)}">
+        <a href="${mediaUrl(run, img.image_path)}" target="_blank">Cena ${escapeHtml(sceneId)} · ${escapeHtml(img.camera_motion || 'motion')}</a>
         <div class="asset-meta"><span class="badge ${escapeHtml(review.status)}">${escapeHtml(review.status)}</span></div>`;
       assets.appendChild(div);
     }
@@ -720,14 +811,14 @@ function renderRun(run) {
     if (clip.video_path) {
       const div = document.createElement('div');
       div.className = 'asset';
-      div.innerHTML = `<video controls src="/api/runs/${run.id}/file?path=${encodeURIComponent(clip.video_path)}"></video><a href="/api/runs/${run.id}/file?path=${encodeURIComponent(clip.video_path)}" target="_blank">Clipe cena ${escapeHtml(clip.scene_id)} · ${escapeHtml(clip.provider || 'video')}</a><div class="asset-meta">score ${escapeHtml(clip.quality_score || 0)} · ${escapeHtml(clip.duration || 0)}s</div>`;
+      div.innerHTML = `<video controls preload="metadata" poster="${thumbnailUrl(run, clip.video_path)}" src="${mediaUrl(run, clip.video_path)}"></video><a href="${mediaUrl(run, clip.video_path)}" target="_blank">Clipe cena ${escapeHtml(clip.scene_id)} · ${escapeHtml(clip.provider || 'video')}</a><div class="asset-meta">score ${escapeHtml(clip.quality_score || 0)} · ${escapeHtml(clip.duration || 0)}s</div>`;
       assets.appendChild(div);
     }
   }
   if (summary.video_path) {
     const div = document.createElement('div');
     div.className = 'asset';
-    div.innerHTML = `<video controls src="/api/runs/${run.id}/file?path=${encodeURIComponent('output/final_video.mp4')}"></video><a href="/api/runs/${run.id}/file?path=${encodeURIComponent('output/final_video.mp4')}" target="_blank">Vídeo final</a>`;
+    div.innerHTML = `<video controls preload="metadata" src="${mediaUrl(run, 'output/final_video.mp4')}"></video><a href="${mediaUrl(run, 'output/final_video.mp4')}" target="_blank">Vídeo final</a>`;
     assets.appendChild(div);
   }
 }
@@ -797,8 +888,7 @@ async function requestSceneRetry(sceneId) {
   currentRun = data.id;
   logLine(`retry ${scope} iniciado para cena ${sceneId}: ${currentRun}`);
   await poll();
-  clearInterval(pollTimer);
-  pollTimer = setInterval(poll, 2000);
+  watchRun();
 }
 
 async function markFinalVideoViewed() {
@@ -829,8 +919,6 @@ async function publishGate() {
   } else if (result.status === 'queued' || result.status === 'uploading') {
     if (result.run) renderRun(result.run);
     logLine('upload YouTube iniciado');
-    clearInterval(pollTimer);
-    pollTimer = setInterval(poll, 3000);
   } else {
     logLine(`publicação: ${result.status || 'ok'}`);
   }
@@ -846,18 +934,61 @@ async function authenticateYoutube() {
 async function poll() {
   if (!currentRun) return;
   try {
-    const run = await api(`/api/runs/${currentRun}`);
-    renderRun(run);
-    const publicationStatus = run.summary?.publication?.status || '';
-    if ((run.status === 'completed' || run.status === 'failed') && !['queued', 'uploading'].includes(publicationStatus)) {
-      clearInterval(pollTimer);
-      pollTimer = null;
-    }
+    renderRun(await api(`/api/runs/${currentRun}`));
   } catch (err) {
     logLine(`erro ao consultar status: ${err.message}`);
   }
 }
 
+function renderLiveJobs() {
+  const jobs = Object.values(liveJobs);
+  $('liveJobs').innerHTML = jobs.length ? `
+    <table>
+      <thead><tr><th>Cena</th><th>Tentativa</th><th>Provider job</th><th>Status</th><th>Tempo</th><th>Custo</th></tr></thead>
+      <tbody>${jobs.map(job => `<tr><td>${escapeHtml(job.scene_id)}</td><td>${escapeHtml(job.attempt)}</td><td>${escapeHtml(job.job_id || '-')}</td><td>${escapeHtml(job.status || '-')}</td><td>${job.elapsed_seconds || 0}s · fila ${job.queue_seconds || 0}s</td><td>${job.estimated_cost_usd === null || job.estimated_cost_usd === undefined ? 'n/d' : `$${Number(job.estimated_cost_usd).toFixed(4)}`}</td></tr>`).join('')}</tbody>
+    </table>` : '';
+}
+
+// Progress arrives over SSE; full run JSON is refetched only when the
+// summary changes, the run finishes or the stream reports missed events.
+function watchRun() {
+  if (runEvents) runEvents.close();
+  runEvents = null;
+  if (!currentRun) return;
+  const rendered = window.lastRenderedRun?.id === currentRun ? window.lastRenderedRun : null;
+  const source = new EventSource(`/api/runs/${encodeURIComponent(currentRun)}/events?last_event_id=${rendered?.last_event_id || 0}`);
+  runEvents = source;
+  const data = (event) => JSON.parse(event.data);
+  source.addEventListener('log', (event) => {
+    const el = $('log');
+    el.textContent += `${el.textContent ? '\n' : ''}${data(event).message}`;
+    el.scrollTop = el.scrollHeight;
+  });
+  source.addEventListener('stage', (event) => {
+    const stage = data(event);
+    $('state').textContent = `${stage.stage} · ${stage.status}`;
+  });
+  source.addEventListener('scene_job', (event) => {
+    const job = data(event);
+    liveJobs[`${job.scene_id}:${job.attempt}:${job.job_id}`] = job;
+    renderLiveJobs();
+  });
+  source.addEventListener('cost', (event) => {
+    const cost = data(event);
+    const total = cost.total_usd ?? cost.provider_jobs_usd;
+    if (total !== undefined) $('cost').textContent = `$${Number(total).toFixed(4)}`;
+  });
+  source.addEventListener('status', (event) => {
+    const status = data(event).status;
+    $('state').textContent = status;
+    if (!['queued', 'running'].includes(status)) poll();
+  });
+  source.addEventListener('summary', (event) => {
+    if (data(event).updated_at !== window.lastRenderedRun?.updated_at) poll();
+  });
+  source.addEventListener('reset', () => poll());
+}
+
 async function startRun(retry = false) {
   const story = $('story').value.trim();
   if (!story) {
@@ -873,14 +1004,15 @@ async function startRun(retry = false) {
       story_text: story,
       image_style: $('style').value,
       image_quality_preset: $('qualityPreset').value,
+      video_render_profile: $('renderProfile').value,
+      bypass_cache: $('bypassCache').checked,
       retry_of: retry ? currentRun : null
     })
   });
   currentRun = data.id;
   logLine(`run iniciado: ${currentRun}`);
   await poll();
-  clearInterval(pollTimer);
-  pollTimer = setInterval(poll, 2000);
+  watchRun();
 }
 
 async function loadLatestRun() {
@@ -888,6 +1020,7 @@ async function loadLatestRun() {
     const run = await api('/api/runs/latest');
     currentRun = run.id;
     renderRun(run);
+    watchRun();
     logLine(`último run carregado: ${currentRun}`);
   } catch (err) {
     logLine('nenhum run anterior carregado');
@@ -917,6 +1050,52 @@ loadLatestRun();
 """
 
 
+def _run_event_buffer_size() -> int:
+    try:
+        size = int(os.getenv("AI_FILM_RUN_EVENT_BUFFER", "500"))
+    except ValueError:
+        size = 500
+    return max(50, size)
+
+
+def _run_events(run_id: str) -> Any:
+    from open3d_implementation.core.run_events import RunEventLog
+
+    with RUN_EVENTS_LOCK:
+        events = RUN_EVENTS.get(run_id)
+        if events is None:
+            events = RUN_EVENTS[run_id] = RunEventLog(_run_event_buffer_size())
+        return events
+
+
+def _publish_run_event(run: dict[str, Any], kind: str, data: dict[str, Any]) -> None:
+    # The stored id lets a page that fetched this run resume the stream from it.
+    run["last_event_id"] = _run_events(str(run["id"])).publish(kind, data)
+
+
+def _pipeline_progress_sink(run_id: str) -> Any:
+    """Forward adapter progress to the run's event stream with running job cost."""
+    job_costs: dict[tuple[Any, ...], float] = {}
+    costs_lock = threading.Lock()
+
+    def sink(kind: str, data: dict[str, Any]) -> None:
+        with RUN_LOCK:
+            run = RUNS.get(run_id)
+        if run is None:
+            return
+        _publish_run_event(run, kind, dict(data))
+        if kind != "scene_job" or data.get("estimated_cost_usd") is None:
+            return
+        with costs_lock:
+            job_costs[
+                (data.get("scene_id"), data.get("attempt"), data.get("job_id"))
+            ] = float(data["estimated_cost_usd"])
+            provider_usd = round(sum(job_costs.values()), 4)
+        _publish_run_event(run, "cost", {"provider_jobs_usd": provider_usd})
+
+    return sink
+
+
 def _append_log(run_id: str, message: str) -> None:
     with RUN_LOCK:
         run = RUNS.get(run_id)
@@ -924,12 +1103,107 @@ def _append_log(run_id: str, message: str) -> None:
             return
         run.setdefault("log", []).append(message)
         run["updated_at"] = _utc_now_iso()
+        _publish_run_event(run, "log", {"message": message})
 
 
 def _set_run(run_id: str, **updates: Any) -> None:
     with RUN_LOCK:
-        RUNS[run_id].update(updates)
-        RUNS[run_id]["updated_at"] = _utc_now_iso()
+        run = RUNS[run_id]
+        run.update(updates)
+        run["updated_at"] = _utc_now_iso()
+        if "status" in updates:
+            _publish_run_event(run, "status", {"status": run["status"]})
+        if "summary" in updates:
+            _publish_run_event(
+                run, "cost", dict(run["summary"].get("cost_estimate") or {})
+            )
+
+
+def _media_version(path: Path) -> str:
+    """Validator for one media file; changes whenever its bytes are replaced."""
+    stat = path.stat()
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def _attempt_media_versions(attempt: dict[str, Any], run_dir: Path) -> dict[str, str]:
+    versions = {}
+    for key in ("image_path", "video_path", "audio_path"):
+        value = attempt.get(key)
+        if not value:
+            continue
+        try:
+            versions[key] = _media_version(run_dir / value)
+        except OSError:
+            continue
+    return versions
+
+
+def _send_run_media(path: Path, *, immutable: bool) -> Response:
+    """Serve ``path`` with byte ranges and validators.
+
+    URLs carrying the file's current version never change content, so they
+    are cached for a year; unversioned URLs must revalidate, which costs a
+    304 instead of a full download.
+    """
+    response = send_file(
+        path,
+        conditional=True,
+        etag=_media_version(path),
+        last_modified=path.stat().st_mtime,
+    )
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.max_age = MEDIA_IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
+def _thumbnail_width(requested: str | None) -> int:
+    try:
+        width = int(requested or THUMBNAIL_WIDTHS[1])
+    except ValueError:
+        width = THUMBNAIL_WIDTHS[1]
+    return next(
+        (size for size in THUMBNAIL_WIDTHS if size >= width), THUMBNAIL_WIDTHS[-1]
+    )
+
+
+def _render_thumbnail(source: Path, target: Path, width: int) -> None:
+    """Write a JPEG preview of an image, or a poster frame of a video."""
+    from PIL import Image
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_suffix(f".{threading.get_ident()}.tmp.jpg")
+    suffix = source.suffix.lower()
+    if suffix in THUMBNAIL_IMAGE_SUFFIXES:
+        with Image.open(source) as image:
+            preview = image.convert("RGB")
+            preview.thumbnail((width, width * 4))
+            preview.save(temp_path, "JPEG", quality=82)
+    elif suffix in THUMBNAIL_VIDEO_SUFFIXES:
+        result = subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-i",
+                str(source),
+                "-vf",
+                f"thumbnail,scale={width}:-2",
+                "-frames:v",
+                "1",
+                str(temp_path),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg_poster_failed:{result.stderr[-300:]}")
+    else:
+        raise ValueError(f"no thumbnail for {suffix or 'extensionless'} files")
+    temp_path.replace(target)
 
 
 def _safe_file(run: dict[str, Any], requested: str) -> Path:
@@ -942,7 +1216,24 @@ def _safe_file(run: dict[str, Any], requested: str) -> Path:
     return path
 
 
+def _run_relative_paths(value: Any, run_dir: Path) -> Any:
+    """Rewrite artifact paths under ``run_dir`` as run-relative strings."""
+    if isinstance(value, dict):
+        return {key: _run_relative_paths(item, run_dir) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_run_relative_paths(item, run_dir) for item in value]
+    prefix = f"{run_dir}{os.sep}"
+    if isinstance(value, str) and value.startswith(prefix):
+        return value[len(prefix) :]
+    return value
+
+
 def _build_summary(run_dir: Path, final_state: dict[str, Any]) -> dict[str, Any]:
+    from open3d_implementation.core.langgraph_adapter import _ffprobe_format
+
+    # The adapter writes under <run_dir>/output with absolute paths; the UI,
+    # curation and /file all expect the run-relative ``output/...`` form.
+    final_state = _run_relative_paths(final_state, run_dir)
     video_path = run_dir / final_state.get("video_path", "output/final_video.mp4")
     if not video_path.is_absolute():
         video_path = run_dir / video_path
@@ -968,23 +1259,10 @@ def _build_summary(run_dir: Path, final_state: dict[str, Any]) -> dict[str, Any]
         "curation": {"status": "pending_review", "scenes": {}},
     }
     if video_path.exists():
-        probe = subprocess.run(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration,size",
-                "-of",
-                "json",
-                str(video_path),
-            ],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if probe.returncode == 0:
-            summary["ffprobe"] = json.loads(probe.stdout)
+        # compile_video already probed this file; the probe cache answers.
+        video_format = _ffprobe_format(video_path)
+        if video_format is not None:
+            summary["ffprobe"] = {"format": video_format}
     return summary
 
 
@@ -1318,6 +1596,9 @@ def _apply_curation_summary(
                 }
             )
         scene_review.setdefault("active_attempt_id", attempt_id)
+        if run_dir is not None:
+            for attempt in attempts:
+                attempt["media_versions"] = _attempt_media_versions(attempt, run_dir)
         active_attempt = next(
             (
                 attempt
@@ -1435,18 +1716,150 @@ def _apply_curation_summary(
     return summary
 
 
+def _summary_compact_events() -> int:
+    try:
+        events = int(os.getenv("AI_FILM_SUMMARY_COMPACT_EVENTS", "50"))
+    except ValueError:
+        events = 50
+    return max(1, events)
+
+
 def _persist_summary(run: dict[str, Any]) -> None:
+    """Journal only what changed since the last write; compact periodically."""
+    from open3d_implementation.core.summary_journal import (
+        append_patch,
+        summary_mtime,
+        summary_patch,
+        write_snapshot,
+    )
+
     summary = run.get("summary", {})
     if not summary:
         return
     summary_path = Path(run["run_dir"]) / "pipeline_summary.json"
-    summary_path.parent.mkdir(parents=True, exist_ok=True)
-    temp_path = summary_path.with_suffix(".json.tmp")
-    temp_path.write_text(
-        json.dumps(summary, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    temp_path.replace(summary_path)
+    current = json.loads(json.dumps(summary, ensure_ascii=False, default=str))
+    with SUMMARY_LOCK:
+        baseline = SUMMARY_BASELINES.get(str(run["id"]))
+        if (
+            baseline is None
+            or baseline["events"] >= _summary_compact_events()
+            or not summary_path.exists()
+        ):
+            write_snapshot(summary_path, current)
+            events = 0
+        else:
+            ops = summary_patch(baseline["summary"], current)
+            if not ops:
+                return
+            append_patch(summary_path, ops)
+            events = baseline["events"] + 1
+        SUMMARY_BASELINES[str(run["id"])] = {"summary": current, "events": events}
+    run["summary_mtime"] = summary_mtime(summary_path)
+    _index_run(run)
+    _publish_run_event(run, "summary", {"updated_at": run.get("updated_at")})
+    if baseline is None or current.get("cost_estimate") != baseline["summary"].get(
+        "cost_estimate"
+    ):
+        _publish_run_event(run, "cost", dict(current.get("cost_estimate") or {}))
+
+
+def _run_index() -> Any:
+    """Return the run index under RUNS_ROOT, backfilling it on first use."""
+    from open3d_implementation.core.run_index import RunIndex
+
+    global RUN_INDEX
+    with RUN_INDEX_LOCK:
+        db_path = RUNS_ROOT / "run_index.sqlite3"
+        if RUN_INDEX is None or RUN_INDEX.db_path != db_path:
+            RUN_INDEX = RunIndex(db_path)
+            RUN_INDEX.sync(RUNS_ROOT)
+        return RUN_INDEX
+
+
+def _index_run(run: dict[str, Any]) -> None:
+    from open3d_implementation.core.run_index import record_from_summary
+
+    summary_path = Path(run["run_dir"]) / "pipeline_summary.json"
+    try:
+        _run_index().upsert(
+            record_from_summary(
+                str(run["id"]),
+                run.get("summary") or {},
+                summary_path,
+                status=run.get("status"),
+                created_at=run.get("created_at"),
+            )
+        )
+    except (OSError, sqlite3.Error) as exc:
+        print(f"⚠️ Falha ao indexar run {run.get('id')}: {exc}")
+
+
+def _max_hydrated_runs() -> int:
+    try:
+        limit = int(os.getenv("AI_FILM_MAX_HYDRATED_RUNS", "32"))
+    except ValueError:
+        limit = 32
+    return max(4, limit)
+
+
+def _remember_run(run: dict[str, Any]) -> None:
+    """Insert ``run`` as most recently used and evict idle hydrated runs."""
+    with RUN_EVENTS_LOCK:
+        events = RUN_EVENTS.get(run["id"])
+    if events is not None:
+        run["last_event_id"] = events.last_id
+    with RUN_LOCK:
+        RUNS.pop(run["id"], None)
+        RUNS[run["id"]] = run
+        for run_id in list(RUNS):
+            if len(RUNS) <= _max_hydrated_runs():
+                break
+            if RUNS[run_id].get("status") in ACTIVE_RUN_STATUSES or RUN_JOBS.get(
+                run_id
+            ):
+                continue
+            del RUNS[run_id]
+            with RUN_EVENTS_LOCK:
+                evicted_events = RUN_EVENTS.pop(run_id, None)
+            if evicted_events is not None:
+                evicted_events.close()
+            with SUMMARY_LOCK:
+                SUMMARY_BASELINES.pop(run_id, None)
+
+
+def _ensure_run_loaded(run_id: str) -> None:
+    """Mark ``run_id`` recently used, rehydrating it if it was evicted."""
+    with RUN_LOCK:
+        run = RUNS.get(run_id)
+        if run is not None:
+            RUNS[run_id] = RUNS.pop(run_id)
+            return
+    if Path(run_id).name != run_id or run_id in {".", ".."}:
+        return
+    summary_path = _summary_path_for_run(run_id)
+    if not summary_path.exists():
+        return
+    try:
+        _hydrate_run_from_summary(summary_path)
+    except (OSError, ValueError):
+        return
+
+
+def _start_run_job(run_id: str, target: Any, *args: Any) -> None:
+    def run_job() -> None:
+        try:
+            target(*args)
+        finally:
+            with RUN_LOCK:
+                remaining = RUN_JOBS.get(run_id, 1) - 1
+                if remaining > 0:
+                    RUN_JOBS[run_id] = remaining
+                else:
+                    RUN_JOBS.pop(run_id, None)
+
+    with RUN_LOCK:
+        RUN_JOBS[run_id] = RUN_JOBS.get(run_id, 0) + 1
+    threading.Thread(target=run_job, daemon=True).start()
 
 
 def _run_path(run: dict[str, Any], media_path: str | None) -> Path | None:
@@ -1801,21 +2214,174 @@ def _ffmpeg_concat_file(filelist_path: Path, paths: list[Path]) -> None:
     )
 
 
+def _upsert_scene_video(run: dict[str, Any], record: dict[str, Any]) -> None:
+    """Keep one run-relative ``scene_videos`` record per scene."""
+    record = _run_relative_paths(record, Path(run["run_dir"]))
+    scene_videos = run.setdefault("summary", {}).setdefault("scene_videos", [])
+    for index, item in enumerate(scene_videos):
+        if str(item.get("scene_id")) == str(record["scene_id"]):
+            scene_videos[index] = record
+            return
+    scene_videos.append(record)
+
+
+def _concat_video_command(
+    clip_paths: list[Path],
+    video_list: Path,
+    temp_video: Path,
+    render_profile_key: str,
+) -> list[str]:
+    """Stream-copy uniform clips; normalise mixed ones to the run's profile."""
+    from open3d_implementation.core.langgraph_adapter import (
+        VIDEO_RENDER_PROFILES,
+        _ffmpeg_threads_per_encode,
+        _ffprobe_video_stream,
+    )
+
+    stream_keys = ("codec_name", "width", "height", "r_frame_rate", "pix_fmt")
+    streams = [_ffprobe_video_stream(path) for path in clip_paths]
+    signatures = {
+        tuple(stream.get(key) for key in stream_keys) if stream else None
+        for stream in streams
+    }
+    if None not in signatures and len(signatures) == 1:
+        _ffmpeg_concat_file(video_list, clip_paths)
+        return [
+            "ffmpeg",
+            "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(video_list),
+            "-c:v",
+            "copy",
+            str(temp_video),
+        ]
+
+    profile = VIDEO_RENDER_PROFILES[render_profile_key]
+    width, height, fps = profile["width"], profile["height"], profile["fps"]
+    inputs: list[str] = []
+    filters: list[str] = []
+    for index, path in enumerate(clip_paths):
+        inputs.extend(["-i", str(path)])
+        filters.append(
+            f"[{index}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,fps={fps},setsar=1,"
+            f"format=yuv420p[v{index}]"
+        )
+    joined = "".join(f"[v{index}]" for index in range(len(clip_paths)))
+    filters.append(f"{joined}concat=n={len(clip_paths)}:v=1:a=0[video]")
+    return [
+        "ffmpeg",
+        "-y",
+        *inputs,
+        "-filter_complex",
+        ";".join(filters),
+        "-map",
+        "[video]",
+        "-c:v",
+        "libx264",
+        "-preset",
+        str(profile["preset"]),
+        "-crf",
+        str(profile["crf"]),
+        "-threads",
+        str(_ffmpeg_threads_per_encode()),
+        "-pix_fmt",
+        "yuv420p",
+        str(temp_video),
+    ]
+
+
+def _render_curation_motion_clip(
+    run: dict[str, Any], scene_id: str, render_profile_key: str
+) -> Path | None:
+    from open3d_implementation.core.langgraph_adapter import (
+        VIDEO_RENDER_PROFILES,
+        _ffmpeg_motion_clip_command,
+        _run_ffmpeg_with_progress,
+        _scene_audio_duration,
+    )
+
+    summary = run.get("summary", {})
+    image_path = _run_path(run, _active_attempt(summary, scene_id).get("image_path"))
+    if not image_path or not image_path.exists():
+        image_path = _run_path(
+            run,
+            next(
+                (
+                    item.get("image_path")
+                    for item in summary.get("scene_images", [])
+                    if str(item.get("scene_id")) == scene_id
+                ),
+                "",
+            ),
+        )
+    if not image_path or not image_path.exists():
+        return None
+    scene = _summary_scene(summary, scene_id)
+    duration = max(
+        3.0,
+        _scene_audio_duration(summary.get("audio_files", []), scene_id),
+        float(scene.get("duration") or 5),
+    )
+    clip_path = Path(run["run_dir"]) / "output" / f"scene_{scene_id}_motion.mp4"
+    result = _run_ffmpeg_with_progress(
+        _ffmpeg_motion_clip_command(
+            str(image_path),
+            str(clip_path),
+            {"scene_id": scene_id, "camera_motion": scene.get("camera_motion", "")},
+            duration,
+            VIDEO_RENDER_PROFILES[render_profile_key],
+        ),
+        label=f"cena {scene_id}",
+        duration=duration,
+    )
+    if result.returncode != 0 or not clip_path.exists():
+        _append_log(
+            str(run.get("id", "")),
+            f"falha ao renderizar clipe da cena {scene_id}: {result.stderr[:300]}",
+        )
+        return None
+    _upsert_scene_video(
+        run,
+        {
+            "scene_id": scene_id,
+            "video_path": str(clip_path),
+            "provider": "ffmpeg_camera_motion",
+            "render_profile": render_profile_key,
+            "duration": duration,
+        },
+    )
+    return clip_path
+
+
 def _recompile_final_video_from_attempts(run: dict[str, Any]) -> dict[str, Any]:
     from open3d_implementation.core.langgraph_adapter import (
         _audio_loudness_target_lufs,
         _probe_media_quality,
+        _video_render_profile_key,
     )
 
     run_dir = Path(run["run_dir"])
     output_dir = run_dir / "output"
     summary = run.get("summary", {})
+    # Motion clips are temporary after compile, so curation re-renders them
+    # with the run's profile instead of always paying the master encode.
+    render_profile_key = _video_render_profile_key(
+        run.get("video_render_profile") or summary.get("video_render_profile")
+    )
     scene_ids = [
         str(item.get("scene_id"))
         for item in summary.get("scene_images", [])
         if item.get("scene_id") is not None
     ]
     clip_paths: list[Path] = []
+    # Single-pass assembly records scenes with video_path None and multi-pass
+    # deletes its temporary ffmpeg clips, so a missing clip falls through to
+    # the on-disk candidates and finally to a fresh motion render.
     for scene_id in scene_ids:
         attempt = _active_attempt(summary, scene_id)
         clip_path = _run_path(run, attempt.get("video_path"))
@@ -1846,7 +2412,8 @@ def _recompile_final_video_from_attempts(run: dict[str, Any]) -> dict[str, Any]:
         ):
             if candidate.exists() and candidate.stat().st_size > 1000:
                 clip_paths.append(candidate)
-                summary.setdefault("scene_videos", []).append(
+                _upsert_scene_video(
+                    run,
                     {
                         "scene_id": scene_id,
                         "video_path": str(candidate),
@@ -1855,9 +2422,15 @@ def _recompile_final_video_from_attempts(run: dict[str, Any]) -> dict[str, Any]:
                             if candidate.name.endswith("_runway.mp4")
                             else "ffmpeg_camera_motion"
                         ),
-                    }
+                    },
                 )
                 break
+        else:
+            rendered_clip = _render_curation_motion_clip(
+                run, scene_id, render_profile_key
+            )
+            if rendered_clip is not None:
+                clip_paths.append(rendered_clip)
 
     if not clip_paths:
         raise RuntimeError("no_scene_clips_available")
@@ -1866,23 +2439,8 @@ def _recompile_final_video_from_attempts(run: dict[str, Any]) -> dict[str, Any]:
     video_list = output_dir / "curation_video_filelist.txt"
     temp_video = output_dir / "curation_temp_video.mp4"
     final_video = output_dir / "final_video.mp4"
-    _ffmpeg_concat_file(video_list, clip_paths)
     result = subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            str(video_list),
-            "-c:v",
-            "copy",
-            "-pix_fmt",
-            "yuv420p",
-            str(temp_video),
-        ],
+        _concat_video_command(clip_paths, video_list, temp_video, render_profile_key),
         capture_output=True,
         text=True,
         check=False,
@@ -1984,6 +2542,7 @@ def _recompile_final_video_from_attempts(run: dict[str, Any]) -> dict[str, Any]:
 
     video_metric = _probe_media_quality(str(final_video), "video")
     summary["video_path"] = str(final_video)
+    summary["video_render_profile"] = render_profile_key
     summary["video_exists"] = final_video.exists()
     summary["video_size"] = final_video.stat().st_size if final_video.exists() else 0
     quality_metrics = summary.setdefault("quality_metrics", {})
@@ -2988,13 +3547,15 @@ def _start_pipeline_run(
     image_quality_preset: str,
     retry_of: str | None = None,
     target_scene_id: str | None = None,
+    video_render_profile: str | None = None,
+    bypass_cache: bool = False,
 ) -> dict[str, Any]:
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:8]
     run_dir = RUNS_ROOT / run_id
     with RUN_LOCK:
         RUNS[run_id] = {
             "id": run_id,
-            "status": "running",
+            "status": "queued",
             "run_dir": str(run_dir),
             "created_at": _utc_now_iso(),
             "updated_at": _utc_now_iso(),
@@ -3002,23 +3563,108 @@ def _start_pipeline_run(
             "target_scene_id": target_scene_id,
             "image_style": image_style,
             "image_quality_preset": image_quality_preset,
+            "video_render_profile": video_render_profile,
+            "bypass_cache": bypass_cache,
             "log": ["run recebido pela UI"],
             "summary": {},
         }
 
-    thread = threading.Thread(
-        target=_run_pipeline,
-        args=(run_id, story_text, image_style, image_quality_preset),
-        daemon=True,
-    )
-    thread.start()
+    _ensure_run_workers()
+    with RUN_LOCK:
+        QUEUED_RUN_IDS.append(run_id)
+        queued_ahead = QUEUED_RUN_IDS.index(run_id)
+        RUNS[run_id]["queue_position"] = queued_ahead
+        RUN_QUEUE.put(
+            (
+                run_id,
+                story_text,
+                image_style,
+                image_quality_preset,
+                video_render_profile,
+                bypass_cache,
+            )
+        )
+    if queued_ahead > 0:
+        _append_log(run_id, f"na fila: {queued_ahead} run(s) à frente")
     return RUNS[run_id]
 
 
+def _max_concurrent_runs() -> int:
+    try:
+        limit = int(os.getenv("AI_FILM_MAX_CONCURRENT_RUNS", "2"))
+    except ValueError:
+        limit = 2
+    return max(1, min(8, limit))
+
+
+def _pipeline_engine() -> str:
+    """``direct`` runs the assets' logic in-process; ``dagster`` materializes them."""
+    engine = os.getenv("AI_FILM_PIPELINE_ENGINE", "direct").strip().lower()
+    return engine if engine in {"direct", "dagster"} else "direct"
+
+
+def _run_worker(run_queue: queue.Queue[tuple[Any, ...]]) -> None:
+    while True:
+        job = run_queue.get()
+        with RUN_LOCK:
+            if job[0] in QUEUED_RUN_IDS:
+                QUEUED_RUN_IDS.remove(job[0])
+            if job[0] in RUNS:
+                RUNS[job[0]]["queue_position"] = None
+            for position, queued_id in enumerate(QUEUED_RUN_IDS):
+                if queued_id in RUNS:
+                    RUNS[queued_id]["queue_position"] = position
+        try:
+            _run_pipeline(*job)
+        except Exception as exc:
+            # Anything _run_pipeline did not handle must not strand the run as
+            # "running" or shrink the worker pool.
+            _append_log(job[0], f"falha inesperada: {type(exc).__name__}: {exc}")
+            with RUN_LOCK:
+                run = RUNS.get(job[0])
+            if run is not None:
+                _set_run(
+                    job[0],
+                    status="failed",
+                    error=str(exc),
+                    traceback=traceback.format_exc(),
+                )
+        finally:
+            run_queue.task_done()
+
+
+def _ensure_run_workers() -> None:
+    """Start the fixed pool that drains RUN_QUEUE in submission order."""
+    with RUN_LOCK:
+        RUN_WORKERS[:] = [worker for worker in RUN_WORKERS if worker.is_alive()]
+        missing = _max_concurrent_runs() - len(RUN_WORKERS)
+        for _ in range(missing):
+            worker = threading.Thread(
+                target=_run_worker,
+                args=(RUN_QUEUE,),
+                name=f"ai-film-run-{len(RUN_WORKERS) + 1}",
+                daemon=True,
+            )
+            RUN_WORKERS.append(worker)
+            worker.start()
+
+
 def _hydrate_run_from_summary(summary_path: Path) -> dict[str, Any]:
+    from open3d_implementation.core.summary_journal import (
+        load_summary,
+        summary_mtime,
+    )
+
     run_dir = summary_path.parent
     run_id = run_dir.name
-    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    # Under the writers' lock, so the baseline matches what is on disk and
+    # the next patch is never computed against a replay missing an append.
+    with SUMMARY_LOCK:
+        summary, journal_events = load_summary(summary_path)
+        SUMMARY_BASELINES[run_id] = {
+            "summary": json.loads(json.dumps(summary)),
+            "events": journal_events,
+        }
     summary = _apply_curation_summary(summary, run_dir)
     story_path = run_dir / "historia.txt"
     run = {
@@ -3031,14 +3677,14 @@ def _hydrate_run_from_summary(summary_path: Path) -> dict[str, Any]:
         "target_scene_id": None,
         "image_style": summary.get("image_style", "comic_storybook"),
         "image_quality_preset": summary.get("image_quality_preset", "high"),
+        "video_render_profile": summary.get("video_render_profile"),
         "log": ["run carregado de pipeline_summary.json"],
         "summary": summary,
-        "summary_mtime": summary_path.stat().st_mtime,
+        "summary_mtime": summary_mtime(summary_path),
     }
     if story_path.exists():
         run["story_characters"] = len(story_path.read_text(encoding="utf-8"))
-    with RUN_LOCK:
-        RUNS[run_id] = run
+    _remember_run(run)
     return run
 
 
@@ -3047,19 +3693,20 @@ def _summary_path_for_run(run_id: str) -> Path:
 
 
 def _refresh_completed_run_from_disk(run: dict[str, Any]) -> dict[str, Any]:
-    if run.get("status") == "running":
+    from open3d_implementation.core.summary_journal import summary_mtime
+
+    if run.get("status") in ACTIVE_RUN_STATUSES:
         return run
     summary_path = _summary_path_for_run(str(run.get("id", "")))
     if not summary_path.exists():
         return run
     current_mtime = float(run.get("summary_mtime") or 0)
-    if summary_path.stat().st_mtime <= current_mtime:
+    if summary_mtime(summary_path) <= current_mtime:
         return run
     refreshed = _hydrate_run_from_summary(summary_path)
     refreshed_log = [*run.get("log", []), "summary recarregado do disco"]
     refreshed["log"] = refreshed_log[-200:]
-    with RUN_LOCK:
-        RUNS[refreshed["id"]] = refreshed
+    _remember_run(refreshed)
     return refreshed
 
 
@@ -3068,84 +3715,127 @@ def _run_pipeline(
     story_text: str,
     image_style: str,
     image_quality_preset: str,
+    video_render_profile: str | None = None,
+    bypass_cache: bool = False,
 ) -> None:
-    from dagster import DagsterInstance, materialize
-
-    from orchestration.enhanced_dagster_pipeline import (
-        enhanced_langgraph_workflow_asset,
-        enhanced_multimodal_input_asset,
-        enhanced_validation_asset,
-    )
+    from open3d_implementation.core.run_events import progress_sink
+    from open3d_implementation.core.summary_journal import write_snapshot
 
     run = RUNS[run_id]
-    run_dir = Path(run["run_dir"])
-    run_dir.mkdir(parents=True, exist_ok=True)
-    story_file_path = run_dir / "historia.txt"
-    story_file_path.write_text(story_text, encoding="utf-8")
-    output_dir = run_dir / "output"
-    output_dir.mkdir(exist_ok=True)
-    dagster_home = run_dir / "dagster_home"
-    dagster_home.mkdir(exist_ok=True)
-    (dagster_home / "dagster.yaml").write_text(
-        "telemetry:\n  enabled: false\n",
-        encoding="utf-8",
-    )
-
-    cwd = Path.cwd()
-    previous_dagster_home = os.environ.get("DAGSTER_HOME")
+    context = RunContext(run_id=run_id, run_dir=Path(run["run_dir"]).resolve())
+    run_dir = context.run_dir
+    engine = _pipeline_engine()
+    _set_run(run_id, status="running")
     try:
-        os.chdir(run_dir)
-        os.environ["DAGSTER_HOME"] = str(dagster_home)
-        _append_log(run_id, "materializando assets Dagster")
-        assets = [
-            enhanced_multimodal_input_asset,
-            enhanced_langgraph_workflow_asset,
-            enhanced_validation_asset,
-        ]
-        run_config = {
-            "ops": {
-                "enhanced_multimodal_input_asset": {
-                    "config": {
-                        "session_id": run_id,
-                        "story_input": story_text,
-                        "story_file_path": str(story_file_path),
-                        "input_type": "ui",
-                        "max_scenes": 3,
-                        "image_style": image_style,
-                        "image_quality_preset": image_quality_preset,
-                        "quality_threshold": 0.7,
-                        "enable_structured_logging": True,
-                        "log_level": "INFO",
-                    }
-                }
-            }
-        }
-        result = materialize(
-            assets,
-            run_config=run_config,
-            instance=DagsterInstance.local_temp(str(dagster_home)),
-            raise_on_error=True,
+        from open3d_implementation.core.langgraph_adapter import (
+            _video_render_profile_key,
         )
-        final_state = result.output_for_node("enhanced_langgraph_workflow_asset")
-        validation = result.output_for_node("enhanced_validation_asset")
+
+        # An unset profile follows VIDEO_RENDER_PROFILE, like the adapter.
+        video_render_profile = _video_render_profile_key(video_render_profile)
+        _set_run(run_id, video_render_profile=video_render_profile)
+        context.prepare(story_text, with_dagster_home=engine == "dagster")
+        pipeline_config = {
+            "session_id": run_id,
+            "story_input": story_text,
+            "story_file_path": str(context.story_file_path),
+            "input_type": "ui",
+            "max_scenes": 3,
+            "image_style": image_style,
+            "image_quality_preset": image_quality_preset,
+            "video_render_profile": video_render_profile,
+            "bypass_cache": bypass_cache,
+            "run_root": str(run_dir),
+            "quality_threshold": 0.7,
+            "enable_structured_logging": True,
+            "log_level": "INFO",
+        }
+        if engine == "dagster":
+            from dagster import DagsterInstance, materialize
+            from dagster._core.errors import DagsterError
+
+            from orchestration.enhanced_dagster_pipeline import (
+                enhanced_langgraph_workflow_asset,
+                enhanced_multimodal_input_asset,
+                enhanced_validation_asset,
+            )
+
+            _append_log(run_id, "materializando assets Dagster")
+            assets = [
+                enhanced_multimodal_input_asset,
+                enhanced_langgraph_workflow_asset,
+                enhanced_validation_asset,
+            ]
+            run_config = {
+                "ops": {"enhanced_multimodal_input_asset": {"config": pipeline_config}}
+            }
+            try:
+                with progress_sink(_pipeline_progress_sink(run_id)):
+                    result = materialize(
+                        assets,
+                        run_config=run_config,
+                        instance=DagsterInstance.local_temp(str(context.dagster_home)),
+                        raise_on_error=True,
+                    )
+            except DagsterError as exc:
+                raise RuntimeError(f"{type(exc).__name__}: {exc}") from exc
+            final_state = result.output_for_node("enhanced_langgraph_workflow_asset")
+            validation = result.output_for_node("enhanced_validation_asset")
+            orchestration = {
+                "engine": engine,
+                "success": result.success,
+                "run_id": result.run_id,
+                "validation": validation,
+            }
+        else:
+            from orchestration.enhanced_dagster_pipeline import (
+                AIFilmPipelineConfig,
+                run_pipeline_direct,
+            )
+
+            _append_log(run_id, "executando pipeline em processo (sem Dagster)")
+            try:
+                with progress_sink(_pipeline_progress_sink(run_id)):
+                    direct = run_pipeline_direct(
+                        AIFilmPipelineConfig(**pipeline_config)
+                    )
+            except Exception as exc:
+                # materialize wraps step failures in DagsterError; do the same
+                # here so provider/SDK errors fail the run like under Dagster.
+                raise RuntimeError(f"{type(exc).__name__}: {exc}") from exc
+            final_state = direct["final_state"]
+            validation = direct["validation"]
+            orchestration = {
+                "engine": engine,
+                "success": True,
+                "run_id": None,
+                "validation": validation,
+                "asset_metadata": direct["metadata"],
+            }
         summary = _build_summary(run_dir=run_dir, final_state=final_state)
         summary = _apply_curation_summary(summary, run_dir)
         summary["image_style"] = image_style
         summary["image_quality_preset"] = image_quality_preset
-        summary["dagster"] = {
-            "success": result.success,
-            "run_id": result.run_id,
-            "validation": validation,
-        }
-
-        (run_dir / "pipeline_summary.json").write_text(
-            json.dumps(summary, ensure_ascii=False, indent=2),
-            encoding="utf-8",
+        summary["video_render_profile"] = video_render_profile
+        summary["dagster"] = orchestration
+
+        write_snapshot(run_dir / "pipeline_summary.json", summary)
+        with SUMMARY_LOCK:
+            SUMMARY_BASELINES[run_id] = {
+                "summary": json.loads(json.dumps(summary, default=str)),
+                "events": 0,
+            }
+        _append_log(
+            run_id,
+            (
+                f"Dagster run concluído: {orchestration['run_id']}"
+                if engine == "dagster"
+                else "execução direta concluída"
+            ),
         )
-        _append_log(run_id, f"Dagster run concluído: {result.run_id}")
         _set_run(run_id, status="completed", summary=summary)
+        _index_run(run)
     except (
-        DagsterError,
         ImportError,
         KeyError,
         OSError,
@@ -3158,12 +3848,6 @@ def _run_pipeline(
         _set_run(
             run_id, status="failed", error=str(exc), traceback=traceback.format_exc()
         )
-    finally:
-        if previous_dagster_home is None:
-            os.environ.pop("DAGSTER_HOME", None)
-        else:
-            os.environ["DAGSTER_HOME"] = previous_dagster_home
-        os.chdir(cwd)
 
 
 @app.get("/")
@@ -3190,9 +3874,10 @@ def health() -> Response:
             },
             "image_provider": os.getenv("IMAGE_GENERATION_PROVIDER", "comfyui"),
             "video_provider": os.getenv("VIDEO_GENERATION_PROVIDER", "runway"),
-            "orchestrator": "dagster",
+            "orchestrator": _pipeline_engine(),
             "image_styles": sorted(ALLOWED_IMAGE_STYLES),
             "image_quality_presets": sorted(ALLOWED_IMAGE_QUALITY_PRESETS),
+            "video_render_profiles": sorted(ALLOWED_VIDEO_RENDER_PROFILES),
             "youtube": _youtube_auth_status(),
             "keys": {
                 "gemini": bool(
@@ -3241,18 +3926,30 @@ def create_run() -> Response:
         return jsonify({"error": "story_text is required"}), 400
     image_style = str(payload.get("image_style", "comic_storybook")).strip()
     image_quality_preset = str(payload.get("image_quality_preset", "high")).strip()
+    video_render_profile = (
+        str(payload.get("video_render_profile") or "").strip() or None
+    )
     if image_style not in ALLOWED_IMAGE_STYLES:
         return jsonify({"error": "invalid image_style"}), 400
     if image_quality_preset not in ALLOWED_IMAGE_QUALITY_PRESETS:
         return jsonify({"error": "invalid image_quality_preset"}), 400
+    if (
+        video_render_profile is not None
+        and video_render_profile not in ALLOWED_VIDEO_RENDER_PROFILES
+    ):
+        return jsonify({"error": "invalid video_render_profile"}), 400
 
     run = _start_pipeline_run(
         story_text=story_text,
         image_style=image_style,
         image_quality_preset=image_quality_preset,
         retry_of=payload.get("retry_of"),
+        video_render_profile=video_render_profile,
+        bypass_cache=bool(payload.get("bypass_cache")),
+    )
+    return jsonify(
+        {"id": run["id"], "status": run["status"], "run_dir": run["run_dir"]}
     )
-    return jsonify({"id": run["id"], "status": "running", "run_dir": run["run_dir"]})
 
 
 @app.post("/api/runs/<run_id>/curation")
@@ -3272,6 +3969,7 @@ def set_run_curation(run_id: str) -> Response:
     if reason and reason not in CURATION_REASONS:
         return jsonify({"error": "invalid curation reason"}), 400
 
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3317,6 +4015,7 @@ def activate_attempt(run_id: str) -> Response:
         return jsonify({"error": "scene_id is required"}), 400
     if not attempt_id:
         return jsonify({"error": "attempt_id is required"}), 400
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3341,6 +4040,7 @@ def approve_attempt(run_id: str) -> Response:
         return jsonify({"error": "scene_id is required"}), 400
     if not attempt_id:
         return jsonify({"error": "attempt_id is required"}), 400
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3358,6 +4058,7 @@ def approve_attempt(run_id: str) -> Response:
 
 @app.post("/api/runs/<run_id>/final-video-viewed")
 def mark_final_video_viewed(run_id: str) -> Response:
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3378,6 +4079,7 @@ def mark_final_video_viewed(run_id: str) -> Response:
 def approve_final_cut(run_id: str) -> Response:
     payload = request.get_json(silent=True) or {}
     note = str(payload.get("note", "")).strip()[:2000]
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3413,6 +4115,7 @@ def approve_final_cut(run_id: str) -> Response:
 
 @app.post("/api/runs/<run_id>/publish-gate")
 def publish_gate(run_id: str) -> Response:
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3466,12 +4169,7 @@ def publish_gate(run_id: str) -> Response:
         )
         run["summary"] = summary
         _persist_summary(run)
-    thread = threading.Thread(
-        target=_run_youtube_upload,
-        args=(run_id,),
-        daemon=True,
-    )
-    thread.start()
+    _start_run_job(run_id, _run_youtube_upload, run_id)
     _append_log(run_id, "upload YouTube enfileirado")
     with RUN_LOCK:
         run = RUNS.get(run_id)
@@ -3511,6 +4209,7 @@ def retry_scene(run_id: str) -> Response:
         return jsonify({"error": "reason or note is required"}), 400
     if reason and reason not in CURATION_REASONS:
         return jsonify({"error": "invalid curation reason"}), 400
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3540,13 +4239,9 @@ def retry_scene(run_id: str) -> Response:
     retry_target = (
         _run_selective_audio_retry if scope == "audio" else _run_selective_visual_retry
     )
-    thread = threading.Thread(
-        target=retry_target,
-        args=(run_id, scene_id, note, reason, scope),
-        daemon=True,
-    )
-    thread.start()
+    _start_run_job(run_id, retry_target, run_id, scene_id, note, reason, scope)
     _append_log(run_id, f"retry seletivo enfileirado para cena {scene_id}: {scope}")
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
         if run is None:
@@ -3569,39 +4264,69 @@ def get_latest_run() -> Response:
             if RUNS
             else None
         )
-    if latest_memory_run and latest_memory_run.get("status") == "running":
+    if latest_memory_run and latest_memory_run.get("status") in ACTIVE_RUN_STATUSES:
         return jsonify(latest_memory_run)
 
-    summary_files = sorted(
-        RUNS_ROOT.glob("*/pipeline_summary.json"),
-        key=lambda item: item.stat().st_mtime,
-        reverse=True,
-    )
+    latest_record = _run_index().latest()
     if latest_memory_run:
-        if not summary_files:
+        if latest_record is None:
             return jsonify(latest_memory_run)
-        latest_summary = summary_files[0]
-        if latest_summary.parent.name == latest_memory_run.get("id"):
+        if latest_record.run_id == latest_memory_run.get("id"):
             try:
                 return jsonify(_refresh_completed_run_from_disk(latest_memory_run))
             except (OSError, ValueError, json.JSONDecodeError) as exc:
                 return jsonify({"error": str(exc)}), 500
 
-    if not summary_files:
+    if latest_record is None:
         return jsonify({"error": "run not found"}), 404
     try:
-        return jsonify(_hydrate_run_from_summary(summary_files[0]))
+        return jsonify(_hydrate_run_from_summary(Path(latest_record.summary_path)))
     except (OSError, ValueError, json.JSONDecodeError) as exc:
         return jsonify({"error": str(exc)}), 500
 
 
+@app.get("/api/runs")
+def list_runs() -> Response:
+    try:
+        limit = max(1, min(100, int(request.args.get("limit", "20"))))
+        offset = max(0, int(request.args.get("offset", "0")))
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+    records, total = _run_index().list(
+        limit=limit,
+        offset=offset,
+        filters={
+            "status": request.args.get("status", ""),
+            "image_style": request.args.get("image_style", ""),
+            "image_quality_preset": request.args.get("image_quality_preset", ""),
+        },
+    )
+    with RUN_LOCK:
+        active_runs = [
+            {key: run.get(key) for key in ("id", "status", "created_at", "updated_at")}
+            for run in RUNS.values()
+            if run.get("status") in ACTIVE_RUN_STATUSES
+        ]
+    return jsonify(
+        {
+            "runs": [record.to_dict() for record in records],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "active": active_runs,
+        }
+    )
+
+
 @app.get("/api/runs/<run_id>")
 def get_run(run_id: str) -> Response:
     with RUN_LOCK:
         run = RUNS.get(run_id)
+        if run is not None:
+            RUNS[run_id] = RUNS.pop(run_id)
     if run is None:
         summary_path = _summary_path_for_run(run_id)
-        if not summary_path.exists():
+        if Path(run_id).name != run_id or not summary_path.exists():
             return jsonify({"error": "run not found"}), 404
         try:
             return jsonify(_hydrate_run_from_summary(summary_path))
@@ -3614,19 +4339,119 @@ def get_run(run_id: str) -> Response:
     return jsonify(run)
 
 
+@app.get("/api/runs/<run_id>/events")
+def stream_run_events(run_id: str) -> Response:
+    """Server-sent progress events; resumes after ``Last-Event-ID``.
+
+    A ``reset`` event means events were missed (buffer overflow or a server
+    restart) and the client should refetch ``/api/runs/<run_id>`` once. The
+    stream ends after a terminal status, when the run is evicted, or when a
+    finished run stays idle for a keepalive window; EventSource reconnects
+    with ``Last-Event-ID``, so no request thread is pinned to an idle run.
+    """
+    _ensure_run_loaded(run_id)
+    with RUN_LOCK:
+        run = RUNS.get(run_id)
+    if run is None:
+        return jsonify({"error": "run not found"}), 404
+    try:
+        last_event_id = int(
+            request.headers.get("Last-Event-ID")
+            or request.args.get("last_event_id")
+            or 0
+        )
+    except ValueError:
+        return jsonify({"error": "last_event_id must be an integer"}), 400
+    events = _run_events(run_id)
+
+    def stream() -> Any:
+        cursor = last_event_id
+        yield "retry: 2000\n\n"
+        while True:
+            batch, gap = events.since(cursor, timeout=RUN_EVENT_KEEPALIVE_SECONDS)
+            if gap:
+                yield f"event: reset\ndata: {json.dumps({'stale_event_id': cursor})}\n\n"
+            for event in batch:
+                yield event.to_sse()
+            if events.closed or any(
+                event.kind == "status"
+                and event.data.get("status") not in ACTIVE_RUN_STATUSES
+                for event in batch
+            ):
+                return
+            if batch:
+                cursor = batch[-1].id
+            elif gap:
+                # Only an empty buffer has nothing to replay; it starts at 0.
+                cursor = 0
+            else:
+                with RUN_LOCK:
+                    status = run.get("status")
+                    background_jobs = RUN_JOBS.get(run_id, 0)
+                if status not in ACTIVE_RUN_STATUSES and not background_jobs:
+                    return
+                yield ": keepalive\n\n"
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/runs/<run_id>/file")
 def get_run_file(run_id: str):
+    _ensure_run_loaded(run_id)
     with RUN_LOCK:
         run = RUNS.get(run_id)
     if run is None:
         return jsonify({"error": "run not found"}), 404
     requested = request.args.get("path", "")
     try:
-        return send_file(_safe_file(run, requested))
+        path = _safe_file(run, requested)
+        return _send_run_media(
+            path, immutable=request.args.get("v") == _media_version(path)
+        )
     except (FileNotFoundError, ValueError) as exc:
         return jsonify({"error": str(exc)}), 404
 
 
+@app.get("/api/runs/<run_id>/thumbnail")
+def get_run_thumbnail(run_id: str):
+    """Downscaled JPEG of a run image, or a poster frame of a run video."""
+    _ensure_run_loaded(run_id)
+    with RUN_LOCK:
+        run = RUNS.get(run_id)
+    if run is None:
+        return jsonify({"error": "run not found"}), 404
+    requested = request.args.get("path", "")
+    width = _thumbnail_width(request.args.get("width"))
+    try:
+        source = _safe_file(run, requested)
+        version = _media_version(source)
+    except (FileNotFoundError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 404
+    # Keyed by source version, so a replaced source never serves a stale preview.
+    path_key = hashlib.sha256(requested.encode("utf-8")).hexdigest()[:16]
+    thumbnail = (
+        Path(run["run_dir"])
+        / "output"
+        / "thumbnails"
+        / f"{path_key}_{version}_{width}.jpg"
+    )
+    if not thumbnail.exists():
+        try:
+            _render_thumbnail(source, thumbnail, width)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 415
+        except (OSError, RuntimeError) as exc:
+            return jsonify({"error": str(exc)}), 404
+        for stale in thumbnail.parent.glob(f"{path_key}_*_{width}.jpg"):
+            if stale != thumbnail:
+                stale.unlink(missing_ok=True)
+    return _send_run_media(thumbnail, immutable=request.args.get("v") == version)
+
+
 @app.get("/status")
 def legacy_status() -> Response:
     return redirect("/api/health")
@@ -3634,6 +4459,8 @@ def legacy_status() -> Response:
 
 def main() -> None:
     port = int(os.getenv("AI_FILM_UI_PORT", "8766"))
+    # Backfill the run index before the first request needs it.
+    _run_index()
     app.run(host="127.0.0.1", port=port, debug=False, threaded=True)
 
 
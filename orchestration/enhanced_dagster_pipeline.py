@@ -6,7 +6,7 @@ Integra o StructuredLogger para rastreabilidade completa e logs detalhados.
 import os
 import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict, List, Mapping
 
 from dagster import (
     asset, 
@@ -28,7 +28,10 @@ root_path = '/usr/local/anaconda3/Agentes_youtube/langgraph_system/LANGGRAPH_MCP
 if root_path not in sys.path:
     sys.path.insert(0, root_path)
 
-from open3d_implementation.core.langgraph_adapter import create_open3d_workflow, Open3DAgentState
+from open3d_implementation.core.langgraph_adapter import (
+    get_open3d_workflow,
+    Open3DAgentState,
+)
 from open3d_implementation.core.structured_logger import StructuredLogger
 
 class AIFilmPipelineConfig(Config):
@@ -40,6 +43,13 @@ class AIFilmPipelineConfig(Config):
     max_scenes: int = 8
     image_style: str = "cinematic_realism"
     image_quality_preset: str = "high"
+    # Vazio usa VIDEO_RENDER_PROFILE (ou master) no adapter.
+    video_render_profile: str = ""
+    pipeline_execution_mode: str = ""
+    # Ignora respostas de LLM em cache nesta run (a resposta nova atualiza o cache).
+    bypass_cache: bool = False
+    # Per-run directory; artifacts go to <run_root>/output instead of ./output.
+    run_root: str = ""
     quality_threshold: float = 0.9
     enable_structured_logging: bool = True
     log_level: str = "INFO"
@@ -70,13 +80,19 @@ def enhanced_multimodal_input_asset(
     """
     Processa entrada multimodal com sistema de logs estruturados completo
     """
+    return _build_multimodal_input(config, context.add_output_metadata)
+
+
+def _build_multimodal_input(
+    config: AIFilmPipelineConfig,
+    add_metadata: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
     start_time = time.time()
     dagster_logger = get_dagster_logger()
     
     # Inicializar logger estruturado
     structured_logger = StructuredLogger(
-        session_id=config.session_id,
-        output_dir=os.getcwd()
+        session_id=config.session_id, output_dir=config.run_root or os.getcwd()
     )
     
     # Log de início do pipeline completo
@@ -113,14 +129,20 @@ def enhanced_multimodal_input_asset(
         
         # Preparar estado inicial como dict (não usar Open3DAgentState)
         initial_state = {
-            'session_id': config.session_id,
-            'story_text': story_text,
-            'input_type': config.input_type,
-            'structured_logger': structured_logger,
-            'max_scenes': config.max_scenes,
-            'image_style': config.image_style,
-            'image_quality_preset': config.image_quality_preset,
-            'metadata': {
+            "session_id": config.session_id,
+            "story_text": story_text,
+            "input_type": config.input_type,
+            "structured_logger": structured_logger,
+            "max_scenes": config.max_scenes,
+            "image_style": config.image_style,
+            "image_quality_preset": config.image_quality_preset,
+            "video_render_profile": config.video_render_profile,
+            "pipeline_execution_mode": config.pipeline_execution_mode,
+            "bypass_cache": config.bypass_cache,
+            "output_root": (
+                os.path.join(config.run_root, "output") if config.run_root else ""
+            ),
+            "metadata": {
                 "input_source": input_source,
                 "story_file_path": config.story_file_path if config.story_file_path else None,
                 "file_format": file_format,
@@ -129,6 +151,7 @@ def enhanced_multimodal_input_asset(
                 "quality_threshold": config.quality_threshold,
                 "image_style": config.image_style,
                 "image_quality_preset": config.image_quality_preset,
+                "video_render_profile": config.video_render_profile,
                 "structured_logging_enabled": config.enable_structured_logging
             }
         }
@@ -139,31 +162,41 @@ def enhanced_multimodal_input_asset(
         structured_logger.log_workflow_stage("PROCESSAMENTO MULTIMODAL", "completed")
         
         # Metadata rica para Dagster
-        context.add_output_metadata({
-            "story_length": len(story_text),
-            "input_source": input_source,
-            "file_format": file_format,
-            "execution_time_seconds": execution_time,
-            "max_scenes": config.max_scenes,
-            "session_id": config.session_id,
-            "structured_logging": "enabled" if config.enable_structured_logging else "disabled"
-        })
-        
-        dagster_logger.info(f"✅ Entrada multimodal processada com sucesso em {execution_time:.2f}s")
-        
+        add_metadata(
+            {
+                "story_length": len(story_text),
+                "input_source": input_source,
+                "file_format": file_format,
+                "execution_time_seconds": execution_time,
+                "max_scenes": config.max_scenes,
+                "session_id": config.session_id,
+                "structured_logging": (
+                    "enabled" if config.enable_structured_logging else "disabled"
+                ),
+            }
+        )
+
+        dagster_logger.info(
+            f"✅ Entrada multimodal processada com sucesso em {execution_time:.2f}s"
+        )
+
         # Retornar como dicionário para compatibilidade com LangGraph
         return {
-            'session_id': initial_state['session_id'],
-            'story_text': initial_state['story_text'],
-            'input_type': initial_state['input_type'],
-            'structured_logger': initial_state.get('structured_logger'),
-            'max_scenes': initial_state.get('max_scenes', 8),
-            'image_style': initial_state.get('image_style', 'cinematic_realism'),
-            'image_quality_preset': initial_state.get('image_quality_preset', 'high'),
-            'metadata': initial_state.get('metadata', {}),
-            'input_source': input_source,
-            'file_format': file_format,
-            'story_length': len(story_text)
+            "session_id": initial_state["session_id"],
+            "story_text": initial_state["story_text"],
+            "input_type": initial_state["input_type"],
+            "structured_logger": initial_state.get("structured_logger"),
+            "max_scenes": initial_state.get("max_scenes", 8),
+            "image_style": initial_state.get("image_style", "cinematic_realism"),
+            "image_quality_preset": initial_state.get("image_quality_preset", "high"),
+            "video_render_profile": initial_state.get("video_render_profile", ""),
+            "pipeline_execution_mode": initial_state.get("pipeline_execution_mode", ""),
+            "bypass_cache": initial_state.get("bypass_cache", False),
+            "output_root": initial_state.get("output_root", ""),
+            "metadata": initial_state.get("metadata", {}),
+            "input_source": input_source,
+            "file_format": file_format,
+            "story_length": len(story_text),
         }
         
     except Exception as e:
@@ -183,6 +216,15 @@ def enhanced_langgraph_workflow_asset(
     """
     Executa workflow LangGraph com sistema de logs estruturados
     """
+    return _run_langgraph_workflow(
+        enhanced_multimodal_input_asset, context.add_output_metadata
+    )
+
+
+def _run_langgraph_workflow(
+    enhanced_multimodal_input_asset: Dict[str, Any],
+    add_metadata: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
     start_time = time.time()
     dagster_logger = get_dagster_logger()
     
@@ -196,8 +238,8 @@ def enhanced_langgraph_workflow_asset(
     try:
         structured_logger.log_workflow_stage("EXECUÇÃO LANGGRAPH")
         
-        # Criar workflow
-        workflow = create_open3d_workflow()
+        # Workflow compilado uma vez por processo e reutilizado entre runs
+        workflow = get_open3d_workflow()
         
         if workflow is None:
             raise ValueError("Não foi possível criar o workflow LangGraph")
@@ -214,15 +256,27 @@ def enhanced_langgraph_workflow_asset(
             dagster_logger.warning(f"⚠️ Conteúdo: {enhanced_multimodal_input_asset}")
         
         initial_state = {
-            'story_text': story_text,
-            'messages': [],
-            'current_step': 'initialized',
-            'scene_data': {},
-            'generated_content': {},
-            'enhanced_multimodal_input_asset': enhanced_multimodal_input_asset,
-            'max_scenes': enhanced_multimodal_input_asset.get('max_scenes', 8),
-            'image_style': enhanced_multimodal_input_asset.get('image_style', 'cinematic_realism'),
-            'image_quality_preset': enhanced_multimodal_input_asset.get('image_quality_preset', 'high')
+            "story_text": story_text,
+            "messages": [],
+            "current_step": "initialized",
+            "scene_data": {},
+            "generated_content": {},
+            "enhanced_multimodal_input_asset": enhanced_multimodal_input_asset,
+            "max_scenes": enhanced_multimodal_input_asset.get("max_scenes", 8),
+            "image_style": enhanced_multimodal_input_asset.get(
+                "image_style", "cinematic_realism"
+            ),
+            "image_quality_preset": enhanced_multimodal_input_asset.get(
+                "image_quality_preset", "high"
+            ),
+            "video_render_profile": enhanced_multimodal_input_asset.get(
+                "video_render_profile", ""
+            ),
+            "pipeline_execution_mode": enhanced_multimodal_input_asset.get(
+                "pipeline_execution_mode", ""
+            ),
+            "bypass_cache": enhanced_multimodal_input_asset.get("bypass_cache", False),
+            "output_root": enhanced_multimodal_input_asset.get("output_root", ""),
         }
         
         # Executar com logs detalhados
@@ -240,7 +294,9 @@ def enhanced_langgraph_workflow_asset(
         # Log estruturado de conclusão do pipeline
         if structured_logger:
             total_files = images_count + audio_count
-            output_dir = final_state.get('output_dirs', {}).get('base', os.getcwd())
+            output_dir = final_state.get("output_dirs", {}).get(
+                "base", final_state.get("output_root") or os.getcwd()
+            )
             
             structured_logger.log_pipeline_completion(
                 total_scenes=scenes_count,
@@ -253,30 +309,42 @@ def enhanced_langgraph_workflow_asset(
         runpod_jobs = final_state.get("runpod_jobs", [])
         quality_metrics = final_state.get("quality_metrics", {})
         cost_estimate = final_state.get("cost_estimate", {})
-        context.add_output_metadata({
-            "scenes_generated": scenes_count,
-            "images_generated": images_count,
-            "audio_files_generated": audio_count,
-            "total_media_files": images_count + audio_count,
-            "execution_time_seconds": execution_time,
-            "workflow_status": "completed",
-            "runpod_jobs": MetadataValue.json(runpod_jobs),
-            "quality_metrics": MetadataValue.json(quality_metrics),
-            "cost_estimate": MetadataValue.json(cost_estimate),
-            "estimated_total_cost_usd": cost_estimate.get("total_usd", 0),
-            "quality_scores": MetadataValue.json({
-                "overall_score": quality_metrics.get("overall_score", 0),
-                "image_score": quality_metrics.get("categories", {}).get("images", 0),
-                "audio_score": quality_metrics.get("categories", {}).get("audio", 0),
-                "video_score": quality_metrics.get("categories", {}).get("video", 0),
-            }),
-            "output_structure": MetadataValue.json({
-                "base_dir": final_state.get('output_dirs', {}).get('base'),
-                "images_dir": final_state.get('output_dirs', {}).get('images'),
-                "audio_dir": final_state.get('output_dirs', {}).get('audio')
-            })
-        })
-        
+        add_metadata(
+            {
+                "scenes_generated": scenes_count,
+                "images_generated": images_count,
+                "audio_files_generated": audio_count,
+                "total_media_files": images_count + audio_count,
+                "execution_time_seconds": execution_time,
+                "workflow_status": "completed",
+                "runpod_jobs": MetadataValue.json(runpod_jobs),
+                "quality_metrics": MetadataValue.json(quality_metrics),
+                "cost_estimate": MetadataValue.json(cost_estimate),
+                "estimated_total_cost_usd": cost_estimate.get("total_usd", 0),
+                "quality_scores": MetadataValue.json(
+                    {
+                        "overall_score": quality_metrics.get("overall_score", 0),
+                        "image_score": quality_metrics.get("categories", {}).get(
+                            "images", 0
+                        ),
+                        "audio_score": quality_metrics.get("categories", {}).get(
+                            "audio", 0
+                        ),
+                        "video_score": quality_metrics.get("categories", {}).get(
+                            "video", 0
+                        ),
+                    }
+                ),
+                "output_structure": MetadataValue.json(
+                    {
+                        "base_dir": final_state.get("output_dirs", {}).get("base"),
+                        "images_dir": final_state.get("output_dirs", {}).get("images"),
+                        "audio_dir": final_state.get("output_dirs", {}).get("audio"),
+                    }
+                ),
+            }
+        )
+
         dagster_logger.info(f"🎉 Workflow LangGraph concluído com sucesso!")
         dagster_logger.info(f"📊 Estatísticas: {scenes_count} cenas, {images_count} imagens, {audio_count} áudios")
         dagster_logger.info(f"⏱️ Tempo total: {execution_time:.2f}s")
@@ -301,6 +369,15 @@ def enhanced_validation_asset(
     """
     Validação final com sistema de logs estruturados e relatórios
     """
+    return _validate_pipeline_output(
+        enhanced_langgraph_workflow_asset, context.add_output_metadata
+    )
+
+
+def _validate_pipeline_output(
+    enhanced_langgraph_workflow_asset: Dict[str, Any],
+    add_metadata: Callable[[Dict[str, Any]], None],
+) -> Dict[str, Any]:
     dagster_logger = get_dagster_logger()
     
     # Obter logger estruturado
@@ -379,30 +456,52 @@ def enhanced_validation_asset(
             structured_logger.log_workflow_stage("PIPELINE COMPLETO", "completed")
         
         # Metadata completa para Dagster
-        context.add_output_metadata({
-            "total_scenes": total_scenes,
-            "approved_scenes": approved_scenes,
-            "approval_rate_percent": (approved_scenes / total_scenes * 100) if total_scenes > 0 else 0,
-            "average_quality_score": average_score,
-            "quality_status": quality_status,
-            "pipeline_success": pipeline_success,
-            "runpod_jobs": MetadataValue.json(runpod_jobs),
-            "quality_metrics": MetadataValue.json(quality_metrics),
-            "cost_estimate": MetadataValue.json(cost_estimate),
-            "estimated_total_cost_usd": cost_estimate.get("total_usd", 0),
-            "total_files_generated": len(file_paths),
-            "file_breakdown": MetadataValue.json({
-                "images": len([f for f in file_paths if f["type"] == "image"]),
-                "audio": len([f for f in file_paths if f["type"] == "audio"]),
-                "video": len([f for f in file_paths if f["type"] == "video"])
-            }),
-            "quality_distribution": MetadataValue.json({
-                "high_quality_images": len([s for s in image_metrics if s.get('quality_score', 0) >= 85]),
-                "medium_quality_images": len([s for s in image_metrics if 70 <= s.get('quality_score', 0) < 85]),
-                "low_quality_images": len([s for s in image_metrics if s.get('quality_score', 0) < 70])
-            })
-        })
-        
+        add_metadata(
+            {
+                "total_scenes": total_scenes,
+                "approved_scenes": approved_scenes,
+                "approval_rate_percent": (
+                    (approved_scenes / total_scenes * 100) if total_scenes > 0 else 0
+                ),
+                "average_quality_score": average_score,
+                "quality_status": quality_status,
+                "pipeline_success": pipeline_success,
+                "runpod_jobs": MetadataValue.json(runpod_jobs),
+                "quality_metrics": MetadataValue.json(quality_metrics),
+                "cost_estimate": MetadataValue.json(cost_estimate),
+                "estimated_total_cost_usd": cost_estimate.get("total_usd", 0),
+                "total_files_generated": len(file_paths),
+                "file_breakdown": MetadataValue.json(
+                    {
+                        "images": len([f for f in file_paths if f["type"] == "image"]),
+                        "audio": len([f for f in file_paths if f["type"] == "audio"]),
+                        "video": len([f for f in file_paths if f["type"] == "video"]),
+                    }
+                ),
+                "quality_distribution": MetadataValue.json(
+                    {
+                        "high_quality_images": len(
+                            [
+                                s
+                                for s in image_metrics
+                                if s.get("quality_score", 0) >= 85
+                            ]
+                        ),
+                        "medium_quality_images": len(
+                            [
+                                s
+                                for s in image_metrics
+                                if 70 <= s.get("quality_score", 0) < 85
+                            ]
+                        ),
+                        "low_quality_images": len(
+                            [s for s in image_metrics if s.get("quality_score", 0) < 70]
+                        ),
+                    }
+                ),
+            }
+        )
+
         validation_summary = {
             "pipeline_success": pipeline_success,
             "quality_status": quality_status,
@@ -429,6 +528,82 @@ def enhanced_validation_asset(
         dagster_logger.error(f"❌ Falha na validação final: {e}")
         raise
 
+def _plain_metadata(metadata: Mapping[str, Any]) -> Dict[str, Any]:
+    """Desembrulha MetadataValue.json(...) para gravar a metadata como JSON."""
+    return {key: getattr(value, "data", value) for key, value in metadata.items()}
+
+
+def _call_with_retry_policy(
+    policy: RetryPolicy | None,
+    asset_name: str,
+    step: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Repete ``step`` com as tentativas e o backoff da RetryPolicy do asset."""
+    max_retries = policy.max_retries if policy is not None else 0
+    attempt = 0
+    while True:
+        try:
+            return step()
+        except Exception as exc:
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            delay = policy.delay or 0
+            if policy.backoff is Backoff.EXPONENTIAL:
+                delay = ((2**attempt) - 1) * delay
+            elif policy.backoff is Backoff.LINEAR:
+                delay = delay * attempt
+            get_dagster_logger().warning(
+                f"🔁 {asset_name}: retry {attempt}/{max_retries} em {delay:.0f}s ({exc})"
+            )
+            time.sleep(delay)
+
+
+def run_pipeline_direct(config: AIFilmPipelineConfig) -> Dict[str, Any]:
+    """
+    Executa os três assets em processo, sem DagsterInstance nem materialize.
+
+    Mesma lógica de entrada, workflow e validação dos assets; a metadata que
+    cada asset publicaria no Dagster volta em ``metadata[<asset>]``. Cada etapa
+    repete com a mesma RetryPolicy do asset; esgotadas as tentativas, a falha
+    interrompe a run como em ``raise_on_error=True``.
+    """
+    metadata: Dict[str, Dict[str, Any]] = {}
+
+    def collector(asset_name: str) -> Callable[[Dict[str, Any]], None]:
+        def add_metadata(values: Dict[str, Any]) -> None:
+            metadata.setdefault(asset_name, {}).update(_plain_metadata(values))
+
+        return add_metadata
+
+    input_state = _call_with_retry_policy(
+        external_service_retry,
+        "enhanced_multimodal_input_asset",
+        lambda: _build_multimodal_input(
+            config, collector("enhanced_multimodal_input_asset")
+        ),
+    )
+    final_state = _call_with_retry_policy(
+        ai_model_retry,
+        "enhanced_langgraph_workflow_asset",
+        lambda: _run_langgraph_workflow(
+            input_state, collector("enhanced_langgraph_workflow_asset")
+        ),
+    )
+    validation = _call_with_retry_policy(
+        None,
+        "enhanced_validation_asset",
+        lambda: _validate_pipeline_output(
+            final_state, collector("enhanced_validation_asset")
+        ),
+    )
+    return {
+        "final_state": final_state,
+        "validation": validation,
+        "metadata": metadata,
+    }
+
+
 # Funções auxiliares
 def _calculate_average_scene_score(state: Dict[str, Any]) -> float:
     """Calcular score médio das cenas"""
@@ -7,7 +7,9 @@ ser usados como substitutos diretos do chat model do LangGraph.
 """
 
 import os
-from typing import Optional
+import threading
+import time
+from typing import Any, Callable, Optional
 from dotenv import load_dotenv
 
 # Carregar variáveis de ambiente
@@ -61,9 +63,51 @@ OPENAI_GENERATION_CONFIG = {
 }
 
 
+# Clientes reutilizados por (provider, model, config) em todo o processo: cada
+# instância mantém seu próprio transporte HTTP, então recriá-la por chamada
+# descarta conexões abertas. Provedores que falham ficam em cooldown.
+_CLIENTS: dict[tuple[str, str, tuple[tuple[str, Any], ...]], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+_PROVIDER_COOLDOWN_UNTIL: dict[str, float] = {}
+
+
+def _provider_cooldown_seconds() -> float:
+    try:
+        return max(0.0, float(os.getenv("LLM_PROVIDER_COOLDOWN_SECONDS", "300")))
+    except ValueError:
+        return 300.0
+
+
+def record_provider_failure(provider: str) -> None:
+    """Abre o circuito do provider: fallbacks o pulam até o cooldown expirar."""
+    with _CLIENTS_LOCK:
+        _PROVIDER_COOLDOWN_UNTIL[provider] = (
+            time.monotonic() + _provider_cooldown_seconds()
+        )
+
+
+def provider_available(provider: str) -> bool:
+    with _CLIENTS_LOCK:
+        return time.monotonic() >= _PROVIDER_COOLDOWN_UNTIL.get(provider, 0.0)
+
+
+def _pooled_client(
+    provider: str,
+    model: str,
+    config: dict[str, Any],
+    factory: Callable[[], Any],
+):
+    key = (provider, model, tuple(sorted(config.items())))
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _CLIENTS[key] = factory()
+        return client
+
+
 def get_llm_client(provider: Optional[str] = None):
     """
-    Retorna o cliente LLM configurado
+    Retorna o cliente LLM configurado, reutilizando a instância do processo
     
     Args:
         provider: "gemini" ou "openai". Se None, usa DEFAULT_LLM_PROVIDER
@@ -74,50 +118,70 @@ def get_llm_client(provider: Optional[str] = None):
     provider = provider or DEFAULT_LLM_PROVIDER
     
     if provider == "gemini":
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        
         if not GEMINI_API_KEY:
             raise ValueError(
                 "GEMINI_API_KEY não encontrada. "
                 "Defina GEMINI_API_KEY ou GOOGLE_API_KEY no .env"
             )
         
-        return ChatGoogleGenerativeAI(
-            model=DEFAULT_LLM_MODEL,
-            google_api_key=GEMINI_API_KEY,
-            **GEMINI_GENERATION_CONFIG
+        def build_gemini():
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            return ChatGoogleGenerativeAI(
+                model=DEFAULT_LLM_MODEL,
+                google_api_key=GEMINI_API_KEY,
+                **GEMINI_GENERATION_CONFIG,
+            )
+
+        return _pooled_client(
+            "gemini", DEFAULT_LLM_MODEL, GEMINI_GENERATION_CONFIG, build_gemini
         )
     
     elif provider == "openai":
-        from langchain_openai import ChatOpenAI
-        
         if not OPENAI_API_KEY:
             raise ValueError(
                 "OPENAI_API_KEY não encontrada. "
                 "Defina OPENAI_API_KEY no .env"
             )
         
-        return ChatOpenAI(
-            model=FALLBACK_LLM_MODEL,
-            openai_api_key=OPENAI_API_KEY,
-            **OPENAI_GENERATION_CONFIG
+        def build_openai():
+            from langchain_openai import ChatOpenAI
+
+            return ChatOpenAI(
+                model=FALLBACK_LLM_MODEL,
+                openai_api_key=OPENAI_API_KEY,
+                **OPENAI_GENERATION_CONFIG,
+            )
+
+        return _pooled_client(
+            "openai", FALLBACK_LLM_MODEL, OPENAI_GENERATION_CONFIG, build_openai
         )
     
     else:
         raise ValueError(f"Provider inválido: {provider}. Use 'gemini' ou 'openai'")
 
 
+def _llm_with_fallback():
+    """Retorna (provider, cliente), pulando Gemini enquanto o circuito está aberto."""
+    if provider_available("gemini"):
+        try:
+            return "gemini", get_llm_client("gemini")
+        except Exception as e:
+            print(f"⚠️ Gemini falhou: {e}")
+            record_provider_failure("gemini")
+    else:
+        print("⏭️ Gemini em cooldown após falha recente")
+    print("🔄 Usando OpenAI como fallback...")
+    return "openai", get_llm_client("openai")
+
+
 def get_llm_with_fallback():
     """
     Retorna LLM com fallback automático
-    Tenta Gemini primeiro, se falhar usa OpenAI
+    Tenta Gemini primeiro, se falhar usa OpenAI; após uma falha, Gemini fica
+    em cooldown (LLM_PROVIDER_COOLDOWN_SECONDS) e as chamadas vão direto ao OpenAI
     """
-    try:
-        return get_llm_client("gemini")
-    except Exception as e:
-        print(f"⚠️ Gemini falhou: {e}")
-        print("🔄 Usando OpenAI como fallback...")
-        return get_llm_client("openai")
+    return _llm_with_fallback()[1]
 
 
 # Configuração para prompts cinematográficos
@@ -175,6 +239,59 @@ def get_llm():
     return get_llm_client()
 
 
+def describe_llm(provider: Optional[str] = None, with_fallback: bool = False):
+    """
+    Identifica o modelo que get_llm_client/get_llm_with_fallback usariam,
+    sem instanciar o cliente (chave de cache de respostas).
+
+    Returns:
+        Dict com provider, model e generation_config
+    """
+    provider = provider or DEFAULT_LLM_PROVIDER
+    if (
+        with_fallback
+        and provider == "gemini"
+        and (not GEMINI_API_KEY or not provider_available("gemini"))
+    ):
+        provider = "openai"
+    if provider == "openai":
+        return {
+            "provider": "openai",
+            "model": FALLBACK_LLM_MODEL,
+            "generation_config": dict(OPENAI_GENERATION_CONFIG),
+        }
+    return {
+        "provider": provider,
+        "model": DEFAULT_LLM_MODEL,
+        "generation_config": dict(GEMINI_GENERATION_CONFIG),
+    }
+
+
+def build_cinematic_prompt_request(story_text: str) -> str:
+    """Texto enviado ao LLM por generate_cinematic_prompt"""
+    return f"""
+Transforme esta história em um prompt cinematográfico ultra-detalhado para geração de imagens:
+
+HISTÓRIA:
+{story_text}
+
+Crie um prompt que inclua:
+1. Estilo cinematográfico específico (ex: "Blade Runner 2049 style", "Wes Anderson symmetry")
+2. Iluminação detalhada (ex: "golden hour backlight", "dramatic chiaroscuro")
+3. Lente e câmera (ex: "shot on ARRI Alexa, 35mm anamorphic lens")
+4. Composição (ex: "rule of thirds", "dutch angle", "extreme wide shot")
+5. Resolução e qualidade (ex: "8K, photorealistic, highly detailed")
+6. Mood e atmosfera (ex: "melancholic", "tense", "dreamlike")
+
+Retorne apenas o prompt final, sem formatação adicional.
+"""
+
+
+def fallback_cinematic_prompt(story_text: str) -> str:
+    """Prompt simples usado quando o LLM falha"""
+    return f"Cinematic scene based on: {story_text[:100]}..., photorealistic, highly detailed, 8K"
+
+
 def generate_cinematic_prompt(story_text: str, use_pro_model: bool = False):
     """
     Gera prompt cinematográfico a partir do texto da história
@@ -188,35 +305,25 @@ def generate_cinematic_prompt(story_text: str, use_pro_model: bool = False):
     Returns:
         Prompt cinematográfico detalhado para geração de imagens
     """
+    provider = None
     try:
         # Usar Gemini direto para geração de prompts quando solicitado.
         if use_pro_model:
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            llm = ChatGoogleGenerativeAI(
-                model=GEMINI_TEXT_MODEL,
-                google_api_key=GEMINI_API_KEY,
-                temperature=0.9,
-                max_output_tokens=2048
-            )
-        else:
-            llm = get_llm_with_fallback()
-        
-        prompt = f"""
-Transforme esta história em um prompt cinematográfico ultra-detalhado para geração de imagens:
+            pro_config = {"temperature": 0.9, "max_output_tokens": 2048}
 
-HISTÓRIA:
-{story_text}
+            def build_pro():
+                from langchain_google_genai import ChatGoogleGenerativeAI
 
-Crie um prompt que inclua:
-1. Estilo cinematográfico específico (ex: "Blade Runner 2049 style", "Wes Anderson symmetry")
-2. Iluminação detalhada (ex: "golden hour backlight", "dramatic chiaroscuro")
-3. Lente e câmera (ex: "shot on ARRI Alexa, 35mm anamorphic lens")
-4. Composição (ex: "rule of thirds", "dutch angle", "extreme wide shot")
-5. Resolução e qualidade (ex: "8K, photorealistic, highly detailed")
-6. Mood e atmosfera (ex: "melancholic", "tense", "dreamlike")
+                return ChatGoogleGenerativeAI(
+                    model=GEMINI_TEXT_MODEL, google_api_key=GEMINI_API_KEY, **pro_config
+                )
 
-Retorne apenas o prompt final, sem formatação adicional.
-"""
+            provider = "gemini"
+            llm = _pooled_client("gemini", GEMINI_TEXT_MODEL, pro_config, build_pro)
+        else:
+            provider, llm = _llm_with_fallback()
+        
+        prompt = build_cinematic_prompt_request(story_text)
         
         response = llm.invoke(prompt)
         
@@ -230,8 +337,10 @@ Retorne apenas o prompt final, sem formatação adicional.
         
     except Exception as e:
         print(f"⚠️ Erro ao gerar prompt cinematográfico: {e}")
+        if provider is not None:
+            record_provider_failure(provider)
         # Fallback para prompt simples
-        return f"Cinematic scene based on: {story_text[:100]}..., photorealistic, highly detailed, 8K"
+        return fallback_cinematic_prompt(story_text)
 
 
 def print_llm_config():
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Measure per-run LangGraph workflow setup: rebuild per run vs process cache."""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+OPEN3D_ROOT = REPO_ROOT / "open3d_implementation"
+
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(OPEN3D_ROOT))
+
+from open3d_implementation.core import langgraph_adapter  # noqa: E402
+
+
+def _timed_ms(build) -> float:
+    # The builders print progress banners; keep them out of the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        workflow = build()
+        elapsed = (time.perf_counter() - started) * 1000
+    if workflow is None:
+        raise SystemExit("workflow build failed; is langgraph installed?")
+    return elapsed
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "first_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    runs = max(1, args.runs)
+
+    rebuilt = [_timed_ms(langgraph_adapter.create_open3d_workflow) for _ in range(runs)]
+    langgraph_adapter._COMPILED_WORKFLOW = None
+    cached = [_timed_ms(langgraph_adapter.get_open3d_workflow) for _ in range(runs)]
+    print(
+        json.dumps(
+            {
+                "runs": runs,
+                "rebuild_per_run": _summary(rebuilt),
+                "process_cached": _summary(cached),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
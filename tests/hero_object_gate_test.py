@@ -1,7 +1,11 @@
 import base64
+import importlib
+import importlib.util
 import inspect
 import json
 import sys
+import threading
+import time
 from io import BytesIO
 from pathlib import Path
 from types import ModuleType, SimpleNamespace
@@ -12,7 +16,16 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from open3d_implementation import ui_server  # noqa: E402
-from open3d_implementation.core import langgraph_adapter  # noqa: E402
+from open3d_implementation.core import (  # noqa: E402
+    comfyui_assets,
+    consistency_prefilter,
+    langgraph_adapter,
+    llm_response_cache,
+    probe_cache,
+    run_events,
+    runpod_client,
+    summary_journal,
+)
 from open3d_implementation.core.langgraph_adapter import (  # noqa: E402
     DEFAULT_IMAGE_STYLE,
     _apply_runpod_execution_telemetry,
@@ -72,6 +85,12 @@ def _names(scene):
     return [item["name"] for item in _hero_object_requirements(scene)]
 
 
+@pytest.fixture(autouse=True)
+def isolated_disk_caches(monkeypatch, tmp_path):
+    monkeypatch.setenv("SEMANTIC_QA_CACHE_DIR", str(tmp_path / "semantic_qa_cache"))
+    monkeypatch.setenv("LLM_RESPONSE_CACHE_DIR", str(tmp_path / "llm_cache"))
+
+
 def test_qwen_semantic_retry_is_bounded_and_requires_a_rejected_flux_source(
     monkeypatch,
 ):
@@ -87,6 +106,658 @@ def test_qwen_semantic_retry_is_bounded_and_requires_a_rejected_flux_source(
     assert _image_generation_max_attempts() == 4
 
 
+def test_scene_jobs_run_bounded_and_merge_in_scene_order(monkeypatch):
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def worker(scene_id):
+        with lock:
+            in_flight.append(scene_id)
+            peak.append(len(in_flight))
+        time.sleep(0.02 * (5 - scene_id))
+        with lock:
+            in_flight.remove(scene_id)
+        return {"scene_id": scene_id}
+
+    results = langgraph_adapter._run_scene_jobs([1, 2, 3, 4], worker, max_in_flight=2)
+
+    assert [item["scene_id"] for item in results] == [1, 2, 3, 4]
+    assert max(peak) == 2
+
+    monkeypatch.setenv("IMAGE_GENERATION_MAX_IN_FLIGHT", "99")
+    assert langgraph_adapter._image_generation_max_in_flight() == 8
+    monkeypatch.setenv("IMAGE_GENERATION_MAX_IN_FLIGHT", "0")
+    assert langgraph_adapter._image_generation_max_in_flight() == 1
+
+
+def test_elevenlabs_quota_is_reserved_in_scene_order_before_parallel_posts(
+    monkeypatch,
+):
+    reservations = langgraph_adapter._reserve_elevenlabs_characters(
+        [400, 700, 300], 800
+    )
+
+    assert reservations == [(True, 800), (False, 400), (True, 400)]
+    assert langgraph_adapter._reserve_elevenlabs_characters([400], None) == [
+        (True, None)
+    ]
+
+    monkeypatch.setenv("ELEVENLABS_MAX_IN_FLIGHT", "9")
+    assert langgraph_adapter._audio_generation_max_in_flight() == 4
+    assert (
+        langgraph_adapter._elevenlabs_session()
+        is langgraph_adapter._elevenlabs_session()
+    )
+    source = inspect.getsource(langgraph_adapter.create_open3d_workflow)
+    assert "max_in_flight=_audio_generation_max_in_flight()" in source
+    assert "_elevenlabs_session().post(" in source
+
+
+def test_scene_scheduler_waits_for_identity_anchor_before_fan_out():
+    source = inspect.getsource(langgraph_adapter.create_open3d_workflow)
+
+    assert "while pending_scenes and reference_image_path is None:" in source
+    assert "max_in_flight=_image_generation_max_in_flight()" in source
+
+
+def test_clip_encode_pool_is_sized_from_cpu_and_encode_threads(monkeypatch):
+    monkeypatch.setattr(langgraph_adapter.os, "cpu_count", lambda: 8)
+    monkeypatch.setenv("FFMPEG_THREADS_PER_ENCODE", "2")
+    monkeypatch.delenv("FFMPEG_MAX_PARALLEL_ENCODES", raising=False)
+
+    assert langgraph_adapter._ffmpeg_max_parallel_encodes() == 4
+    cmd = langgraph_adapter._ffmpeg_motion_clip_command(
+        "scene.png", "clip.mp4", {"scene_id": 1}, 4.0
+    )
+    assert cmd[cmd.index("-threads") + 1] == "2"
+    assert cmd[cmd.index("-progress") + 1] == "pipe:2"
+
+    monkeypatch.setenv("FFMPEG_MAX_PARALLEL_ENCODES", "1")
+    assert langgraph_adapter._ffmpeg_max_parallel_encodes() == 1
+
+
+def test_clip_render_profiles_control_encode_cost(monkeypatch):
+    monkeypatch.delenv("VIDEO_RENDER_PROFILE", raising=False)
+
+    master = langgraph_adapter._ffmpeg_motion_clip_command(
+        "scene.png", "clip.mp4", {"scene_id": 1}, 4.0
+    )
+    assert master[master.index("-preset") + 1] == "slow"
+    assert master[master.index("-crf") + 1] == "18"
+    assert "s=1080x1920" in master[master.index("-vf") + 1]
+
+    draft = langgraph_adapter._ffmpeg_motion_clip_command(
+        "scene.png",
+        "clip.mp4",
+        {"scene_id": 1},
+        4.0,
+        langgraph_adapter._resolve_video_render_profile("draft"),
+    )
+    assert draft[draft.index("-preset") + 1] == "ultrafast"
+    assert draft[draft.index("-r") + 1] == "24"
+    assert "s=540x960:fps=24" in draft[draft.index("-vf") + 1]
+
+    assert langgraph_adapter._video_render_profile_key("unknown") == "master"
+    monkeypatch.setenv("VIDEO_RENDER_PROFILE", "review")
+    assert langgraph_adapter._video_render_profile_key(None) == "review"
+
+
+def test_single_pass_assembly_keeps_crossfades_on_narration_boundaries():
+    profile = langgraph_adapter._resolve_video_render_profile("review")
+
+    cmd = langgraph_adapter._ffmpeg_single_pass_command(
+        [
+            ("s1.png", {"scene_id": 1}, 4.0, "s1.mp3"),
+            ("s2.png", {"scene_id": 2}, 5.0, None),
+            ("s3.png", {"scene_id": 3}, 3.0, "s3.mp3"),
+        ],
+        "final.mp4",
+        profile,
+        transition_seconds=0.5,
+    )
+
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert cmd.count("-i") == 6
+    assert "anullsrc=r=44100:cl=stereo" in cmd
+    assert "trim=duration=4.500" in graph
+    assert "xfade=transition=fade:duration=0.500:offset=4.000[x1]" in graph
+    assert "xfade=transition=fade:duration=0.500:offset=9.000[x2]" in graph
+    assert "[a0][a1][a2]concat=n=3:v=0:a=1,loudnorm=" in graph
+    assert cmd[cmd.index("-map") + 1] == "[x2]"
+    assert cmd[-1] == "final.mp4"
+
+    silent = langgraph_adapter._ffmpeg_single_pass_command(
+        [("s1.png", {"scene_id": 1}, 4.0, None)], "final.mp4", profile
+    )
+    assert "[aout]" not in silent
+    assert silent[silent.index("-map") + 1] == "[v0]"
+
+
+def test_scene_streaming_mode_prerenders_clips_and_detects_repaired_stills(
+    monkeypatch, tmp_path
+):
+    monkeypatch.delenv("PIPELINE_EXECUTION_MODE", raising=False)
+    assert langgraph_adapter._pipeline_execution_mode(None) == "staged"
+    monkeypatch.setenv("PIPELINE_EXECUTION_MODE", "scene_streaming")
+    assert langgraph_adapter._pipeline_execution_mode(None) == "scene_streaming"
+    assert langgraph_adapter._pipeline_execution_mode("bogus") == "staged"
+
+    image_path = tmp_path / "scene_1_image.png"
+    image_path.write_bytes(b"a" * 2000)
+    fingerprint = langgraph_adapter._image_fingerprint(str(image_path))
+    langgraph_adapter.os.utime(image_path, ns=(1, 1))
+    assert langgraph_adapter._image_fingerprint(str(image_path)) != fingerprint
+    assert langgraph_adapter._image_fingerprint(str(tmp_path / "missing")) is None
+
+    source = inspect.getsource(langgraph_adapter.create_open3d_workflow)
+    assert '"scene_streaming": "stream_scenes"' in source
+    assert "generate_images(dict(state), on_image_ready)" in source
+    assert "and not prerendered_clips" in source
+    assert '== _image_fingerprint(img["image_path"])' in source
+    assert "scene_streaming sem clipes antecipados" in source
+
+
+def test_create_run_rejects_unknown_video_render_profile():
+    client = ui_server.app.test_client()
+
+    response = client.post(
+        "/api/runs",
+        json={"story_text": "Alice.", "video_render_profile": "cinema"},
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "invalid video_render_profile"
+
+
+def test_curation_recompile_keeps_one_relative_clip_per_scene(monkeypatch, tmp_path):
+    run = {"run_dir": str(tmp_path), "summary": {"scene_videos": []}}
+    output_dir = tmp_path / "output"
+    for profile in ("master", "draft"):
+        ui_server._upsert_scene_video(
+            run,
+            {
+                "scene_id": "1",
+                "video_path": str(output_dir / "scene_1_motion.mp4"),
+                "render_profile": profile,
+            },
+        )
+    assert run["summary"]["scene_videos"] == [
+        {
+            "scene_id": "1",
+            "video_path": "output/scene_1_motion.mp4",
+            "render_profile": "draft",
+        }
+    ]
+
+    clips = [output_dir / "scene_1_motion.mp4", output_dir / "scene_2_runway.mp4"]
+    streams = {
+        clips[0]: {"codec_name": "h264", "width": 540, "height": 960},
+        clips[1]: {"codec_name": "h264", "width": 1080, "height": 1920},
+    }
+    monkeypatch.setattr(
+        langgraph_adapter, "_ffprobe_video_stream", lambda path: streams[path]
+    )
+    mixed = ui_server._concat_video_command(
+        clips, output_dir / "list.txt", output_dir / "temp.mp4", "review"
+    )
+    assert "copy" not in mixed
+    assert "scale=720:1280" in mixed[mixed.index("-filter_complex") + 1]
+
+    streams[clips[1]] = dict(streams[clips[0]])
+    output_dir.mkdir()
+    uniform = ui_server._concat_video_command(
+        clips, output_dir / "list.txt", output_dir / "temp.mp4", "review"
+    )
+    assert uniform[uniform.index("-c:v") + 1] == "copy"
+
+
+def test_curation_recompile_renders_single_pass_scenes_without_clips(
+    monkeypatch, tmp_path
+):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    run = {
+        "run_dir": str(tmp_path),
+        "summary": {
+            "scene_images": [{"scene_id": "1"}],
+            "scene_videos": [
+                {"scene_id": "1", "video_path": None, "assembly": "single_pass"}
+            ],
+        },
+    }
+    rendered = []
+
+    def fake_render(run, scene_id, render_profile_key):
+        clip = output_dir / f"scene_{scene_id}_motion.mp4"
+        clip.write_bytes(b"\0" * 2048)
+        rendered.append((scene_id, render_profile_key))
+        ui_server._upsert_scene_video(
+            run, {"scene_id": scene_id, "video_path": str(clip)}
+        )
+        return clip
+
+    def fake_ffmpeg(command, **kwargs):
+        Path(command[-1]).write_bytes(b"\0" * 2048)
+        return ui_server.subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.delenv("VIDEO_RENDER_PROFILE", raising=False)
+    monkeypatch.setattr(ui_server, "_render_curation_motion_clip", fake_render)
+    monkeypatch.setattr(ui_server.subprocess, "run", fake_ffmpeg)
+    monkeypatch.setattr(
+        langgraph_adapter, "_ffprobe_video_stream", lambda path: {"codec_name": "h264"}
+    )
+    monkeypatch.setattr(
+        langgraph_adapter, "_probe_media_quality", lambda path, kind: {"ok": True}
+    )
+
+    metric = ui_server._recompile_final_video_from_attempts(run)
+
+    assert metric == {"ok": True}
+    assert rendered == [("1", "master")]
+    assert (output_dir / "final_video.mp4").exists()
+    assert run["summary"]["scene_videos"] == [
+        {"scene_id": "1", "video_path": "output/scene_1_motion.mp4"}
+    ]
+
+
+def test_ui_runs_without_render_profile_follow_server_default(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        ui_server,
+        "_start_pipeline_run",
+        lambda **kwargs: started.append(kwargs)
+        or {"id": "r", "status": "queued", "run_dir": "/tmp/r"},
+    )
+    response = ui_server.app.test_client().post(
+        "/api/runs", json={"story_text": "Alice."}
+    )
+
+    assert response.status_code == 200
+    assert started[0]["video_render_profile"] is None
+    monkeypatch.setenv("VIDEO_RENDER_PROFILE", "review")
+    assert langgraph_adapter._video_render_profile_key(None) == "review"
+
+
+def test_ui_runs_queue_behind_the_concurrent_run_limit(monkeypatch, tmp_path):
+    gate = threading.Event()
+    started = []
+
+    def fake_run_pipeline(run_id, *args):
+        ui_server._set_run(run_id, status="running")
+        started.append(run_id)
+        gate.wait(5)
+        ui_server._set_run(run_id, status="completed")
+
+    monkeypatch.setattr(ui_server, "RUNS_ROOT", tmp_path)
+    monkeypatch.setattr(ui_server, "RUNS", {})
+    monkeypatch.setattr(ui_server, "RUN_QUEUE", ui_server.queue.Queue())
+    monkeypatch.setattr(ui_server, "RUN_WORKERS", [])
+    monkeypatch.setattr(ui_server, "QUEUED_RUN_IDS", [])
+    monkeypatch.setattr(ui_server, "_run_pipeline", fake_run_pipeline)
+    monkeypatch.setenv("AI_FILM_MAX_CONCURRENT_RUNS", "1")
+
+    first = ui_server._start_pipeline_run("Alice.", "comic_storybook", "high")
+    deadline = time.monotonic() + 2
+    while not started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    second = ui_server._start_pipeline_run("Alice.", "comic_storybook", "high")
+    third = ui_server._start_pipeline_run("Alice.", "comic_storybook", "high")
+
+    assert started == [first["id"]]
+    assert ui_server.RUNS[second["id"]]["status"] == "queued"
+    assert ui_server.RUNS[first["id"]]["queue_position"] is None
+    assert ui_server.RUNS[second["id"]]["queue_position"] == 0
+    assert ui_server.RUNS[third["id"]]["queue_position"] == 1
+    assert "na fila: 1 run(s) à frente" in ui_server.RUNS[third["id"]]["log"]
+    gate.set()
+    ui_server.RUN_QUEUE.join()
+    assert started == [first["id"], second["id"], third["id"]]
+    assert ui_server.QUEUED_RUN_IDS == []
+    assert "os.chdir" not in inspect.getsource(ui_server._run_pipeline)
+    assert "os.environ" not in inspect.getsource(ui_server._run_pipeline)
+
+
+def test_run_index_pages_runs_and_evicts_idle_hydrated_runs(monkeypatch, tmp_path):
+    for number in range(6):
+        run_dir = tmp_path / f"run_{number}"
+        run_dir.mkdir()
+        summary_path = run_dir / "pipeline_summary.json"
+        summary_path.write_text(
+            json.dumps(
+                {
+                    "status": "completed",
+                    "image_style": "anime" if number % 2 else "comic_storybook",
+                    "cost_estimate": {"total_usd": number / 10},
+                    "quality_metrics": {"overall_score": 80 + number},
+                }
+            ),
+            encoding="utf-8",
+        )
+        langgraph_adapter.os.utime(summary_path, (1000 + number, 1000 + number))
+
+    monkeypatch.setattr(ui_server, "RUNS_ROOT", tmp_path)
+    monkeypatch.setattr(ui_server, "RUNS", {})
+    monkeypatch.setattr(ui_server, "RUN_INDEX", None)
+    monkeypatch.setenv("AI_FILM_MAX_HYDRATED_RUNS", "4")
+    client = ui_server.app.test_client()
+
+    page = client.get("/api/runs?limit=2&offset=1&image_style=anime").get_json()
+    assert page["total"] == 3
+    assert [item["run_id"] for item in page["runs"]] == ["run_3", "run_1"]
+    assert page["runs"][0]["quality_score"] == 83
+    assert client.get("/api/runs/latest").get_json()["id"] == "run_5"
+
+    for number in range(6):
+        assert client.get(f"/api/runs/run_{number}").status_code == 200
+    assert list(ui_server.RUNS) == ["run_2", "run_3", "run_4", "run_5"]
+    assert client.get("/api/runs/run_0/file?path=missing.png").status_code == 404
+    assert "run_0" in ui_server.RUNS
+
+    (tmp_path / "run_5" / "pipeline_summary.json").unlink()
+    assert ui_server._run_index().sync(tmp_path) == 1
+    assert ui_server._run_index().latest().run_id == "run_4"
+
+
+def test_curation_edits_append_journal_deltas_until_compaction(monkeypatch, tmp_path):
+    run_dir = tmp_path / "run_j"
+    summary_path = run_dir / "pipeline_summary.json"
+    run = {
+        "id": "run_j",
+        "run_dir": str(run_dir),
+        "summary": {
+            "status": "completed",
+            "scene_images": [{"scene_id": 1, "image_path": "output/a.png"}],
+            "curation": {"scenes": {"1": {"image": {"status": "pending"}}}},
+        },
+    }
+    monkeypatch.setattr(ui_server, "RUNS_ROOT", tmp_path)
+    monkeypatch.setattr(ui_server, "RUNS", {})
+    monkeypatch.setattr(ui_server, "RUN_INDEX", None)
+    monkeypatch.setattr(ui_server, "SUMMARY_BASELINES", {})
+    monkeypatch.setenv("AI_FILM_SUMMARY_COMPACT_EVENTS", "2")
+
+    ui_server._persist_summary(run)
+    snapshot = summary_path.read_text(encoding="utf-8")
+    journal = summary_journal.journal_path(summary_path)
+    run["summary"]["curation"]["scenes"]["1"]["image"]["status"] = "approved"
+    ui_server._persist_summary(run)
+    ui_server._persist_summary(run)
+
+    assert summary_path.read_text(encoding="utf-8") == snapshot
+    entries = journal.read_text(encoding="utf-8").splitlines()
+    assert len(entries) == 1
+    assert json.loads(entries[0])["ops"] == [
+        {
+            "op": "set",
+            "path": ["curation", "scenes", "1", "image", "status"],
+            "value": "approved",
+        }
+    ]
+    with journal.open("a", encoding="utf-8") as handle:
+        handle.write('{"at": "torn')
+    replayed, events = summary_journal.load_summary(summary_path)
+    assert events == 1
+    assert replayed["curation"]["scenes"]["1"]["image"]["status"] == "approved"
+
+    hydrated = ui_server._hydrate_run_from_summary(summary_path)
+    assert hydrated["summary"]["curation"]["scenes"]["1"]["image"]["status"] == (
+        "approved"
+    )
+    assert journal.read_text(encoding="utf-8").endswith('{"at": "torn')
+    run["summary"]["curation"]["scenes"]["1"]["image"]["status"] = "rejected"
+    ui_server._persist_summary(run)
+    repaired = journal.read_text(encoding="utf-8").splitlines()
+    assert repaired[0] == entries[0] and len(repaired) == 2
+    replayed, events = summary_journal.load_summary(summary_path)
+    assert events == 2
+    assert replayed["curation"]["scenes"]["1"]["image"]["status"] == "rejected"
+    run["summary"]["status"] = "archived"
+    ui_server._persist_summary(run)
+
+    assert not journal.exists()
+    compacted = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert compacted["status"] == "archived"
+    assert compacted["curation"]["scenes"]["1"]["image"]["status"] == "rejected"
+
+
+def test_summary_journal_appends_after_a_torn_line_survive_reload(tmp_path):
+    summary_path = tmp_path / "pipeline_summary.json"
+    summary_journal.write_snapshot(summary_path, {"status": "completed"})
+    summary_journal.append_patch(
+        summary_path, [{"op": "set", "path": ["status"], "value": "approved"}]
+    )
+    journal = summary_journal.journal_path(summary_path)
+    with journal.open("a", encoding="utf-8") as handle:
+        handle.write('{"at": "torn')
+
+    torn = journal.read_bytes()
+    replayed, events = summary_journal.load_summary(summary_path)
+    assert (replayed["status"], events) == ("approved", 1)
+    assert journal.read_bytes() == torn
+    summary_journal.append_patch(
+        summary_path, [{"op": "set", "path": ["status"], "value": "archived"}]
+    )
+
+    replayed, events = summary_journal.load_summary(summary_path)
+    assert (replayed["status"], events) == ("archived", 2)
+
+
+def test_summary_journal_stores_grown_lists_as_appended_items():
+    before = {"runpod_jobs": [{"id": "a"}], "attempts": [1, 2]}
+    after = {"runpod_jobs": [{"id": "a"}, {"id": "b"}], "attempts": [2]}
+
+    ops = summary_journal.summary_patch(before, after)
+
+    assert ops == [
+        {"op": "extend", "path": ["runpod_jobs"], "value": [{"id": "b"}]},
+        {"op": "set", "path": ["attempts"], "value": [2]},
+    ]
+    replayed = json.loads(json.dumps(before))
+    summary_journal.apply_patch(replayed, ops)
+    assert replayed == after
+
+
+def test_run_event_stream_resumes_and_carries_pooled_job_progress(
+    monkeypatch, tmp_path
+):
+    run = {"id": "run_sse", "run_dir": str(tmp_path), "status": "running", "log": []}
+    monkeypatch.setattr(ui_server, "RUNS", {"run_sse": run})
+    monkeypatch.setattr(ui_server, "RUN_EVENTS", {})
+    monkeypatch.setattr(ui_server, "RUN_EVENT_KEEPALIVE_SECONDS", 0.01)
+
+    ui_server._append_log("run_sse", "materializando assets Dagster")
+    resume_from = run["last_event_id"]
+
+    def scene_job(scene_id):
+        langgraph_adapter._emit_scene_job_progress(
+            {
+                "scene_id": scene_id,
+                "attempt": 1,
+                "job_id": f"job-{scene_id}",
+                "status": "IN_PROGRESS",
+                "estimated_cost_usd": 0.01 * scene_id,
+            }
+        )
+        return scene_id
+
+    with run_events.progress_sink(ui_server._pipeline_progress_sink("run_sse")):
+        assert langgraph_adapter._run_scene_jobs(
+            [1, 2], scene_job, max_in_flight=2
+        ) == [1, 2]
+    ui_server._set_run("run_sse", status="completed")
+
+    def read_events(**kwargs):
+        response = ui_server.app.test_client().get(
+            "/api/runs/run_sse/events", buffered=False, **kwargs
+        )
+        assert response.mimetype == "text/event-stream"
+        # The stream ends on its own after the terminal status event.
+        text = b"".join(response.response).decode("utf-8")
+        response.close()
+        return text
+
+    resumed = read_events(headers={"Last-Event-ID": str(resume_from)})
+    assert "materializando" not in resumed
+    assert resumed.count("event: scene_job") == 2
+    assert '"provider_jobs_usd": 0.03' in resumed
+    assert 'event: status\ndata: {"status": "completed"}' in resumed
+
+    stale = read_events(query_string={"last_event_id": "999"})
+    assert stale.startswith("retry: 2000\n\nevent: reset")
+    assert f"id: {resume_from}\nevent: log" in stale
+    assert resumed.endswith('data: {"status": "completed"}\n\n')
+
+    idle = read_events(headers={"Last-Event-ID": str(run["last_event_id"])})
+    assert idle == "retry: 2000\n\n"
+
+    run["status"] = "running"
+    response = ui_server.app.test_client().get(
+        "/api/runs/run_sse/events",
+        buffered=False,
+        headers={"Last-Event-ID": str(run["last_event_id"])},
+    )
+    chunks = iter(response.response)
+    assert next(chunks) == b"retry: 2000\n\n"
+    assert next(chunks) == b": keepalive\n\n"
+    ui_server.RUN_EVENTS.pop("run_sse").close()
+    assert list(chunks) in ([], [b": keepalive\n\n"])
+    response.close()
+
+    events = run_events.RunEventLog(max_events=2)
+    for number in range(3):
+        events.publish("log", {"message": number})
+    replay, gap = events.since(0)
+    assert gap and [event.id for event in replay] == [2, 3]
+    assert events.since(3, timeout=0.01) == ([], False)
+
+
+def test_run_media_serves_ranges_validators_and_versioned_thumbnails(
+    monkeypatch, tmp_path
+):
+    from PIL import Image
+
+    run_dir = tmp_path / "run_media"
+    (run_dir / "output").mkdir(parents=True)
+    Image.new("RGB", (900, 1600), (40, 90, 160)).save(
+        run_dir / "output" / "scene_1_image.png"
+    )
+    (run_dir / "output" / "clip.mp4").write_bytes(bytes(range(256)) * 8)
+    attempt = {"id": "attempt_1", "image_path": "output/scene_1_image.png"}
+    versions = ui_server._attempt_media_versions(attempt, run_dir)
+    image_version = versions["image_path"]
+    monkeypatch.setattr(
+        ui_server,
+        "RUNS",
+        {
+            "run_media": {
+                "id": "run_media",
+                "run_dir": str(run_dir),
+                "status": "completed",
+            }
+        },
+    )
+    client = ui_server.app.test_client()
+
+    partial = client.get(
+        "/api/runs/run_media/file?path=output/clip.mp4",
+        headers={"Range": "bytes=256-511"},
+    )
+    assert partial.status_code == 206
+    assert partial.data == bytes(range(256))
+    assert partial.headers["Content-Range"] == "bytes 256-511/2048"
+    assert "no-cache" in partial.headers["Cache-Control"]
+
+    full = client.get(
+        f"/api/runs/run_media/file?path=output/scene_1_image.png&v={image_version}"
+    )
+    assert full.headers["ETag"] == f'"{image_version}"'
+    assert "immutable" in full.headers["Cache-Control"]
+    assert "Last-Modified" in full.headers
+    revalidated = client.get(
+        "/api/runs/run_media/file?path=output/scene_1_image.png",
+        headers={"If-None-Match": full.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+
+    thumbnail = client.get(
+        "/api/runs/run_media/thumbnail?path=output/scene_1_image.png&width=300"
+        f"&v={image_version}"
+    )
+    assert thumbnail.status_code == 200
+    assert thumbnail.mimetype == "image/jpeg"
+    assert "immutable" in thumbnail.headers["Cache-Control"]
+    with Image.open(BytesIO(thumbnail.data)) as preview:
+        assert preview.size == (320, 569)
+
+    Image.new("RGB", (900, 1600), (200, 30, 30)).save(
+        run_dir / "output" / "scene_1_image.png"
+    )
+    langgraph_adapter.os.utime(run_dir / "output" / "scene_1_image.png", ns=(1, 1))
+    replaced = client.get(
+        "/api/runs/run_media/thumbnail?path=output/scene_1_image.png&width=300"
+        f"&v={image_version}"
+    )
+    assert "immutable" not in replaced.headers["Cache-Control"]
+    assert len(list((run_dir / "output" / "thumbnails").glob("*.jpg"))) == 1
+    assert client.get("/api/runs/run_media/thumbnail?path=story.txt").status_code == 404
+
+
+def test_summary_stores_run_relative_artifact_paths(tmp_path):
+    run_dir = tmp_path / "run"
+    image_path = run_dir / "output" / "scene_1_image.png"
+
+    summary = ui_server._build_summary(
+        run_dir,
+        {
+            "video_path": str(run_dir / "output" / "final_video.mp4"),
+            "scene_images": [{"scene_id": 1, "image_path": str(image_path)}],
+            "visual_bible": {"character_reference_image_path": "/elsewhere/ref.png"},
+        },
+    )
+
+    assert summary["scene_images"][0]["image_path"] == "output/scene_1_image.png"
+    assert summary["video_path"] == str(run_dir / "output" / "final_video.mp4")
+    assert summary["visual_bible"]["character_reference_image_path"] == (
+        "/elsewhere/ref.png"
+    )
+    assert langgraph_adapter._output_root({}) == Path("output")
+    assert langgraph_adapter._output_root({"output_root": str(run_dir / "output")}) == (
+        run_dir / "output"
+    )
+
+
+def test_clip_encode_progress_streams_to_run_log_and_keeps_errors(capsys):
+    script = (
+        "import sys\n"
+        "for us in (500000, 1000000, 2000000):\n"
+        "    print(f'out_time_us={us}', file=sys.stderr)\n"
+        "    print('bitrate=  25.9kbits/s', file=sys.stderr)\n"
+        "print('[libx264] broken frame', file=sys.stderr)\n"
+        "print('progress=end', file=sys.stderr)\n"
+    )
+
+    result = langgraph_adapter._run_ffmpeg_with_progress(
+        [sys.executable, "-c", script], label="cena 2", duration=2.0
+    )
+
+    log = capsys.readouterr().out
+    assert result.returncode == 0
+    assert result.stderr == "[libx264] broken frame\n"
+    assert "🎞️ cena 2: 25%" in log
+    assert "🎞️ cena 2: 50%" in log
+    assert "🎞️ cena 2: 100%" in log
+
+
+def test_compile_video_renders_clips_in_pool_before_ordered_concat():
+    source = inspect.getsource(langgraph_adapter.create_open3d_workflow)
+
+    assert "max_in_flight=max_parallel_encodes" in source
+    assert source.index("render_scene_clip,") < source.index(
+        'filelist_path = str(output_root / "filelist.txt")'
+    )
+
+
 def test_semantic_retry_instruction_falls_back_to_scene_contract():
     scene = {
         "description": (
@@ -489,6 +1160,100 @@ def test_audio_quality_gate_marks_non_premium_provider():
     assert gated["quality_score"] <= 72.0
 
 
+def test_audio_gate_reads_waveform_levels_and_loudness_from_one_decode(monkeypatch):
+    np = pytest.importorskip("numpy")
+    rate = 48000
+    tone = 0.1 * np.sin(2 * np.pi * 1000 * np.arange(rate * 5) / rate)
+    pcm = np.concatenate([tone, np.zeros(rate)]).astype("<f4").tobytes()
+    decodes = []
+
+    def fake_run(command, **kwargs):
+        decodes.append(command)
+        return SimpleNamespace(returncode=0, stdout=pcm, stderr=b"")
+
+    monkeypatch.setattr(langgraph_adapter.shutil, "which", lambda name: name)
+    monkeypatch.setattr(langgraph_adapter.subprocess, "run", fake_run)
+
+    gated = _audio_quality_gate(
+        {
+            "valid": True,
+            "path": "narration.mp3",
+            "duration_seconds": 6.0,
+            "bit_rate": 128000,
+            "quality_score": 96.0,
+            "issues": [],
+        },
+        "Alice observa o jardim.",
+        "elevenlabs",
+    )
+
+    assert len(decodes) == 1
+    assert decodes[0][-3:] == ["-f", "f32le", "-"]
+    assert len(gated["waveform"]) == 48
+    assert gated["waveform"][0] == 1.0 and gated["waveform"][-1] == 0.0
+    assert gated["audio_levels"]["peak_dbfs"] == -20.0
+    assert gated["audio_levels"]["silence_ratio"] == pytest.approx(1 / 6, abs=0.01)
+    # A 1 kHz sine at -20 dBFS peak measures about -23 LUFS under BS.1770.
+    assert gated["loudness"]["input_i_lufs"] == pytest.approx(-23.0, abs=0.5)
+    assert "loudness_outside_video_standard" in gated["issues"]
+
+
+def test_media_probes_are_cached_per_file_version_across_processes(
+    monkeypatch, tmp_path
+):
+    from PIL import Image
+
+    output_dir = tmp_path / "run" / "output"
+    (output_dir / "curation").mkdir(parents=True)
+    image_path = output_dir / "curation" / "scene_1_attempt_2_image.png"
+    Image.new("RGB", (640, 960), (90, 60, 30)).save(image_path)
+    audio_path = output_dir / "scene_1_audio.mp3"
+    audio_path.write_bytes(b"\0" * 4096)
+    measured = []
+    measure_image_stats = langgraph_adapter._measure_image_stats
+
+    def counting_measure(path, focus_box):
+        measured.append(path.name)
+        return measure_image_stats(path, focus_box)
+
+    def fake_ffprobe(command, **kwargs):
+        measured.append(command[0])
+        return SimpleNamespace(
+            returncode=0,
+            stdout=json.dumps(
+                {"format": {"duration": "6.5", "size": "4096", "bit_rate": "128000"}}
+            ),
+        )
+
+    monkeypatch.setattr(langgraph_adapter, "_measure_image_stats", counting_measure)
+    monkeypatch.setattr(langgraph_adapter.subprocess, "run", fake_ffprobe)
+
+    first = langgraph_adapter._probe_image_quality(str(image_path))
+    assert langgraph_adapter._probe_image_quality(str(image_path)) == first
+    assert (
+        langgraph_adapter._probe_media_quality(str(audio_path), "audio")[
+            "duration_seconds"
+        ]
+        == 6.5
+    )
+    langgraph_adapter._probe_media_quality(str(audio_path), "audio")
+    assert measured == [image_path.name, "ffprobe"]
+    assert (output_dir / probe_cache.PROBE_CACHE_FILENAME).exists()
+
+    # A fresh process only has the per-run SQLite file.
+    monkeypatch.setattr(probe_cache, "_MEMORY", probe_cache.OrderedDict())
+    assert langgraph_adapter._probe_image_quality(str(image_path)) == first
+    assert measured == [image_path.name, "ffprobe"]
+
+    Image.new("RGB", (320, 480), (90, 60, 30)).save(image_path)
+    assert langgraph_adapter._probe_image_quality(str(image_path))["width"] == 320
+    assert measured == [image_path.name, "ffprobe", image_path.name]
+
+    monkeypatch.setenv("PROBE_CACHE_ENABLED", "false")
+    langgraph_adapter._probe_media_quality(str(audio_path), "audio")
+    assert measured[-1] == "ffprobe" and len(measured) == 4
+
+
 def test_voice_id_can_route_future_character_dialogue(monkeypatch):
     monkeypatch.setenv("ELEVENLABS_VOICE_ID", "narrator-default")
     monkeypatch.setenv("ELEVENLABS_VOICE_ID_ALICE", "alice-premium")
@@ -739,6 +1504,136 @@ def test_runpod_cost_uses_provider_execution_time():
     assert monitor["cost_estimate_status"] == "provider_execution_time_configured_rate"
 
 
+def test_runpod_poll_interval_backs_off_then_tracks_expected_finish(monkeypatch):
+    monkeypatch.delenv("RUNPOD_POLL_MIN_SECONDS", raising=False)
+    monkeypatch.delenv("RUNPOD_POLL_MAX_SECONDS", raising=False)
+
+    queued = runpod_client.runpod_poll_interval(
+        status="IN_QUEUE",
+        previous_interval=4.0,
+        execution_seconds=None,
+        expected_execution_seconds=None,
+    )
+    nearly_done = runpod_client.runpod_poll_interval(
+        status="IN_PROGRESS",
+        previous_interval=4.0,
+        execution_seconds=17.0,
+        expected_execution_seconds=18.0,
+    )
+    overdue = runpod_client.runpod_poll_interval(
+        status="IN_PROGRESS",
+        previous_interval=4.0,
+        execution_seconds=30.0,
+        expected_execution_seconds=18.0,
+    )
+
+    assert queued == 5.0
+    assert nearly_done == 0.5
+    assert overdue == 0.5
+
+
+def test_runpod_short_endpoints_submit_through_runsync(monkeypatch):
+    monkeypatch.setenv("RUNPOD_RUNSYNC_MAX_EXPECTED_SECONDS", "20")
+    clock = runpod_client._ExecutionClock()
+    monkeypatch.setattr(runpod_client, "EXECUTION_CLOCK", clock)
+
+    assert runpod_client.runpod_submit_url("fast").endswith("/fast/run")
+
+    clock.record("fast", 12.0)
+    clock.record("slow", 140.0)
+
+    runsync_url = runpod_client.runpod_submit_url("fast")
+    assert runsync_url.endswith("/fast/runsync?wait=20000")
+    assert runpod_client.runpod_submit_url("slow").endswith("/slow/run")
+    # RunPod answers with the job id at ?wait=, before the client gives up.
+    assert runpod_client.runpod_submit_timeout(runsync_url) == pytest.approx(50.0)
+
+    # Cold starts count: a fast job behind a long queue delay is polled.
+    runpod_client.record_runpod_completion(
+        "cold", {"status": "COMPLETED", "executionTime": 8000, "delayTime": 40000}
+    )
+    assert runpod_client.runpod_submit_url("cold").endswith("/cold/run")
+    clock.record_submit_timeout("fast", 50.0)
+    assert runpod_client.runpod_submit_url("fast").endswith("/fast/run")
+
+
+@pytest.mark.parametrize(
+    ("error", "outcome_unknown"),
+    [
+        (runpod_client.requests.exceptions.ReadTimeout("slow"), True),
+        (runpod_client.requests.exceptions.ConnectTimeout("unreachable"), False),
+    ],
+)
+def test_runsync_read_timeout_is_not_a_failed_submit(
+    monkeypatch, error, outcome_unknown
+):
+    def fake_post(*_args, **_kwargs):
+        raise error
+
+    monkeypatch.setattr(runpod_client.requests, "post", fake_post)
+    with pytest.raises(runpod_client.RunPodClientError) as raised:
+        runpod_client.RunPodBlockingClient().post(
+            "https://api.runpod.ai/v2/fast/runsync?wait=20000",
+            json={},
+            headers={},
+            timeout=50.0,
+        )
+
+    assert isinstance(raised.value, runpod_client.RunPodSubmitTimeout) is (
+        outcome_unknown
+    )
+    assert langgraph_adapter._non_retryable_comfyui_job_error(
+        {"error": f"runpod_submit_outcome_unknown: {raised.value}"}
+    )
+
+
+def test_blocking_runpod_client_polls_until_terminal_status(monkeypatch):
+    class StatusResponse:
+        status_code = 200
+
+        def __init__(self, payload):
+            self._payload = payload
+
+        def json(self):
+            return self._payload
+
+    responses = [
+        runpod_client.requests.exceptions.ReadTimeout("temporary"),
+        StatusResponse({"status": "IN_QUEUE", "delayTime": 900}),
+        StatusResponse({"status": "COMPLETED", "executionTime": 8000}),
+    ]
+    sleeps = []
+
+    def fake_get(*_args, **_kwargs):
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    clock = runpod_client._ExecutionClock()
+    monkeypatch.setattr(runpod_client, "EXECUTION_CLOCK", clock)
+    monkeypatch.setattr(runpod_client.requests, "get", fake_get)
+    monkeypatch.setattr(runpod_client.time, "sleep", sleeps.append)
+    polls = []
+
+    payload = runpod_client.RunPodBlockingClient().wait_for_job(
+        endpoint_id="endpoint",
+        status_url="https://api.runpod.ai/v2/endpoint/status/job",
+        headers={},
+        max_wait_seconds=60,
+        on_poll=polls.append,
+    )
+
+    assert payload["status"] == "COMPLETED"
+    assert [poll.error or poll.status for poll in polls] == [
+        "ReadTimeout",
+        "IN_QUEUE",
+        "COMPLETED",
+    ]
+    assert sleeps == sorted(sleeps)
+    assert clock.expected("endpoint") == 8.0
+
+
 def test_staged_report_distinguishes_capacity_timeout_from_semantic_failure():
     assert (
         staged_smoke._stage_report_status(
@@ -1018,6 +1913,226 @@ def test_local_visual_qa_requires_revision_for_custom_model(monkeypatch):
         )
 
 
+def test_local_visual_checklist_batches_criteria_into_padded_generate(
+    monkeypatch, tmp_path
+):
+    from contextlib import nullcontext
+
+    from PIL import Image
+
+    from open3d_implementation.core import local_visual_qa
+
+    class Rows(list):
+        @property
+        def shape(self):
+            return (len(self), len(self[0]))
+
+        def __getitem__(self, key):
+            if isinstance(key, tuple):
+                return Rows(row[key[1]] for row in self)
+            return list.__getitem__(self, key)
+
+    batches = []
+
+    class Processor:
+        tokenizer = SimpleNamespace(padding_side="left")
+
+        def apply_chat_template(self, conversation, *, add_generation_prompt):
+            return conversation[0]["content"][1]["text"]
+
+        def __call__(self, *, text, images, padding, return_tensors):
+            batches.append((list(text), len(images), padding))
+            return {"input_ids": Rows([0, 0] for _ in text)}
+
+        def batch_decode(self, sequences, *, skip_special_tokens):
+            return [f" {row[0]} " for row in sequences]
+
+    class Model:
+        def generate(self, **kwargs):
+            return Rows(
+                [0, 0, "no" if "absent" in prompt else "yes"]
+                for prompt, _ in zip(batches[-1][0], kwargs["input_ids"])
+            )
+
+    image_path = tmp_path / "frame.png"
+    Image.new("RGB", (8, 8)).save(image_path)
+    monkeypatch.setitem(
+        sys.modules, "torch", SimpleNamespace(inference_mode=nullcontext)
+    )
+    monkeypatch.setattr(
+        local_visual_qa,
+        "_load_local_vision_model",
+        lambda *_args: (Processor(), Model()),
+    )
+    monkeypatch.setenv("LOCAL_VISION_QA_BATCH_SIZE", "2")
+    criteria = [
+        local_visual_qa.LocalVisualCriterion(
+            code=f"c{index}",
+            question=question,
+            expected="yes",
+            weight=1.0,
+        )
+        for index, question in enumerate(
+            ["Is Alice visible?", "Is the mouse absent?", "Is the bowl visible?"]
+        )
+    ]
+
+    answers = local_visual_qa.evaluate_local_visual_checklist(
+        image_path=image_path, criteria=criteria
+    )
+
+    assert [len(prompts) for prompts, _, _ in batches] == [2, 1]
+    assert all(padding for _, _, padding in batches)
+    assert [answer.answer for answer in answers] == ["yes", "no", "yes"]
+    assert [answer.criterion.code for answer in answers] == ["c0", "c1", "c2"]
+
+
+def test_reduced_precision_local_qa_falls_back_after_parity_mismatch(
+    monkeypatch, tmp_path
+):
+    from PIL import Image
+
+    from open3d_implementation.core import local_visual_qa
+
+    loaded = []
+
+    def run_prompts(*, processor, model, images, prompts, max_new_tokens):
+        loaded.append(model)
+        return ["no" if model == "int8" else "yes" for _ in prompts]
+
+    image_path = tmp_path / "frame.png"
+    Image.new("RGB", (8, 8)).save(image_path)
+    monkeypatch.setattr(local_visual_qa, "_PARITY_STATE", {})
+    monkeypatch.setattr(
+        local_visual_qa,
+        "_load_local_vision_model",
+        lambda _name, _revision, _edge, backend: (None, backend),
+    )
+    monkeypatch.setattr(local_visual_qa, "_run_local_visual_prompts", run_prompts)
+    monkeypatch.setenv("LOCAL_VISION_QA_BACKEND", "int8")
+    criteria = [
+        local_visual_qa.LocalVisualCriterion(
+            code="alice", question="Is Alice visible?", expected="yes", weight=1.0
+        )
+    ]
+
+    first = local_visual_qa.evaluate_local_visual_checklist(
+        image_path=image_path, criteria=criteria
+    )
+    second = local_visual_qa.evaluate_local_visual_checklist(
+        image_path=image_path, criteria=criteria
+    )
+
+    assert loaded == ["int8", "float32", "float32"]
+    assert [(answer.answer, answer.backend) for answer in first] == [("yes", "float32")]
+    assert second[0].backend == "float32"
+
+
+def test_local_qa_server_batches_concurrent_checklists(monkeypatch, tmp_path):
+    from open3d_implementation.core import local_qa_server, local_visual_qa
+
+    batch_sizes = []
+
+    def evaluate_checklists(*, checklists, model_name, backend):
+        batch_sizes.append(len(checklists))
+        return [
+            [
+                local_visual_qa.LocalVisualAnswer(
+                    criterion=criterion,
+                    answer="yes" if Path(image_path).name == "a.png" else "no",
+                    raw_response="yes",
+                )
+                for criterion in criteria
+            ]
+            for image_path, criteria in checklists
+        ]
+
+    monkeypatch.setattr(
+        local_qa_server, "evaluate_local_visual_checklists", evaluate_checklists
+    )
+    server = local_qa_server.LocalQAServer(
+        port=0, max_batch_requests=4, batch_window_seconds=0.5
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.address
+    monkeypatch.setenv("LOCAL_VISION_QA_SERVER_URL", f"http://{host}:{port}")
+    criteria = [
+        local_visual_qa.LocalVisualCriterion(
+            code="alice", question="Is Alice visible?", expected="yes", weight=3.0
+        )
+    ]
+    results = {}
+
+    def check(name):
+        results[name] = local_visual_qa.evaluate_local_visual_checklist(
+            image_path=tmp_path / name, criteria=criteria
+        )
+
+    try:
+        threads = [
+            threading.Thread(target=check, args=(name,)) for name in ("a.png", "b.png")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        health = server.health()
+    finally:
+        server.shutdown()
+
+    assert batch_sizes == [2]
+    assert results["a.png"][0].answer == "yes"
+    assert results["b.png"][0].answer == "no"
+    assert results["a.png"][0].criterion is criteria[0]
+    assert health["processed"] == 2
+    assert health["queue_depth"] == 0
+    assert health["latency_ms"]["max"] is not None
+
+
+def test_local_qa_server_survives_unexpected_model_errors(monkeypatch):
+    from open3d_implementation.core import local_qa_server
+
+    calls = []
+
+    def evaluate_checklists(*, checklists, model_name, backend):
+        calls.append(len(checklists))
+        if len(calls) == 1:
+            raise KeyError("model.safetensors")
+        return [[] for _ in checklists]
+
+    monkeypatch.setattr(
+        local_qa_server, "evaluate_local_visual_checklists", evaluate_checklists
+    )
+    server = local_qa_server.LocalQAServer(port=0, batch_window_seconds=0.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    payload = {
+        "image_path": "a.png",
+        "criteria": [{"code": "alice", "question": "Is Alice visible?"}],
+    }
+    try:
+        failed = server.submit("checklist", payload)
+        recovered = server.submit("checklist", payload)
+        health = server.health()
+    finally:
+        server.shutdown()
+
+    assert "internal_error:KeyError" in failed["error"]
+    assert recovered["answers"] == []
+    assert health["status"] == "ok"
+
+    stalled = local_qa_server.LocalQAServer(port=0, request_timeout_seconds=1.0)
+    stalled._httpd.server_close()
+    assert stalled.submit("age", {}) == {"error": "local_qa_server:timeout"}
+
+
+def test_local_qa_client_falls_back_in_process_when_server_is_down(monkeypatch):
+    from open3d_implementation.core import local_visual_qa
+
+    monkeypatch.setenv("LOCAL_VISION_QA_SERVER_URL", "http://127.0.0.1:9")
+
+    assert local_visual_qa._post_local_qa_server("/checklist", {}) is None
+
+
 def test_semantic_qa_can_run_locally_without_external_provider(monkeypatch, tmp_path):
     def pass_local(**_kwargs):
         return {
@@ -1061,6 +2176,134 @@ def test_semantic_qa_can_run_locally_without_external_provider(monkeypatch, tmp_
     assert "fallback_used" not in result
 
 
+def test_semantic_qa_verdicts_are_cached_by_image_and_contract(monkeypatch, tmp_path):
+    calls = []
+
+    def pass_local(**kwargs):
+        calls.append(kwargs["image_path"])
+        return {
+            "semantic_score": 92,
+            "accepted": True,
+            "hero_object_legibility": True,
+            "hero_object_notes": "",
+            "issues": [],
+            "critical_failures": [],
+            "retry_prompt": "",
+            "evidence": [{"code": "required_1", "matched": True}],
+        }
+
+    monkeypatch.setenv("IMAGE_SEMANTIC_QA_PROVIDER", "local")
+    monkeypatch.setattr(
+        langgraph_adapter, "_evaluate_semantic_qa_with_local_vlm", pass_local
+    )
+    image_path = tmp_path / "scene.png"
+    image_path.write_bytes(b"cached-image")
+    copy_path = tmp_path / "alice_character_reference.png"
+    copy_path.write_bytes(b"cached-image")
+    scene = {"description": "Alice reads beside a tree."}
+
+    first = _evaluate_image_semantics(
+        str(image_path), scene, "Alice reads.", DEFAULT_IMAGE_STYLE
+    )
+    second = _evaluate_image_semantics(
+        str(copy_path), scene, "Alice reads.", DEFAULT_IMAGE_STYLE
+    )
+    changed = _evaluate_image_semantics(
+        str(image_path),
+        {"description": "Alice runs to the rabbit hole."},
+        "Alice runs.",
+        DEFAULT_IMAGE_STYLE,
+    )
+
+    assert len(calls) == 2
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert changed["cache_hit"] is False
+    assert second["semantic_score"] == first["semantic_score"] == 92
+    assert second["evidence"] == first["evidence"]
+
+
+def test_semantic_qa_fallback_verdicts_are_not_cached_as_primary(monkeypatch, tmp_path):
+    calls = []
+    openai_down = [True]
+
+    def openai_qa(**kwargs):
+        calls.append("openai")
+        if openai_down[0]:
+            raise langgraph_adapter.SemanticQAProviderError("openai:http_503")
+        return {"semantic_score": 95, "accepted": True, "issues": []}
+
+    def local_qa(**kwargs):
+        calls.append("local")
+        return {"semantic_score": 90, "accepted": True, "issues": []}
+
+    monkeypatch.setenv("IMAGE_SEMANTIC_QA_PROVIDER", "openai")
+    monkeypatch.setenv("IMAGE_SEMANTIC_QA_FALLBACK_PROVIDER", "local")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(
+        langgraph_adapter, "_evaluate_semantic_qa_with_openai", openai_qa
+    )
+    monkeypatch.setattr(
+        langgraph_adapter, "_evaluate_semantic_qa_with_local_vlm", local_qa
+    )
+    image_path = tmp_path / "scene.png"
+    image_path.write_bytes(b"fallback-image")
+    scene = {"description": "Alice reads beside a tree."}
+
+    def evaluate():
+        return _evaluate_image_semantics(
+            str(image_path), scene, "Alice reads.", DEFAULT_IMAGE_STYLE
+        )
+
+    fallback = evaluate()
+    openai_down[0] = False
+    recovered = evaluate()
+    cached = evaluate()
+
+    assert fallback["fallback_used"] is True
+    assert recovered["cache_hit"] is False
+    assert recovered["provider"] == "openai"
+    assert cached["cache_hit"] is True
+    assert calls == ["openai", "local", "openai"]
+
+
+def test_semantic_qa_cache_key_changes_with_prompt_and_model():
+    from open3d_implementation.core.semantic_qa_cache import semantic_qa_cache_key
+
+    base = {
+        "image_sha256": "abc",
+        "contract": {"scene": {"description": "Alice reads."}},
+        "prompt": "Score this image.",
+        "provider": "openai",
+        "model": "gpt-5.4-mini",
+        "revision": "",
+    }
+    key = semantic_qa_cache_key(**base)
+
+    assert semantic_qa_cache_key(**base) == key
+    assert semantic_qa_cache_key(**{**base, "prompt": "Score strictly."}) != key
+    assert semantic_qa_cache_key(**{**base, "model": "gpt-5.4"}) != key
+
+
+def test_semantic_qa_cache_evicts_least_recently_used(tmp_path):
+    import os
+
+    from open3d_implementation.core.semantic_qa_cache import SemanticQACache
+
+    cache = SemanticQACache(tmp_path, max_bytes=200)
+    cache.put("old", {"payload": "x" * 60})
+    cache.put("used", {"payload": "y" * 60})
+    os.utime(tmp_path / "old.json", (1, 1))
+    os.utime(tmp_path / "used.json", (2, 2))
+    assert cache.get("used") is not None
+
+    cache.put("new", {"payload": "z" * 60})
+
+    assert cache.get("old") is None
+    assert cache.get("used") is not None
+    assert cache.get("new") is not None
+
+
 def test_local_semantic_qa_does_not_fallback_externally_by_default(
     monkeypatch, tmp_path
 ):
@@ -2021,3 +3264,460 @@ def test_missing_semantic_scene_blocks_final_approval_and_publication(tmp_path):
     assert result["curation"]["final_review"]["status"] == "quality_review_blocked"
     assert result["production_status"]["status"] == "blocked"
     assert result["curation"]["can_publish"] is False
+
+
+def test_compiled_workflow_is_built_once_per_process(monkeypatch):
+    builds = []
+
+    def fake_create():
+        builds.append(object())
+        return builds[-1] if len(builds) > 1 else None
+
+    monkeypatch.setattr(langgraph_adapter, "create_open3d_workflow", fake_create)
+    monkeypatch.setattr(langgraph_adapter, "_COMPILED_WORKFLOW", None)
+
+    # A failed build is not cached, so a later run can still compile.
+    assert langgraph_adapter.get_open3d_workflow() is None
+    first = langgraph_adapter.get_open3d_workflow()
+    assert first is builds[1]
+    assert langgraph_adapter.get_open3d_workflow() is first
+    assert len(builds) == 2
+
+
+def test_story_and_scene_llm_responses_replay_from_cache(monkeypatch, tmp_path):
+    pytest.importorskip("langgraph.graph")
+    pytest.importorskip("google.generativeai")
+    llm_config = importlib.import_module("orchestration.llm_config")
+    calls = []
+    scenes_json = json.dumps(
+        [
+            {
+                "scene_id": 1,
+                "description": "Alice abre o açucareiro.",
+                "prompt": "Alice opens the sugar bowl",
+                "duration": 6,
+            }
+        ]
+    )
+
+    class FakeLLM:
+        def invoke(self, prompt):
+            calls.append("scenes")
+            return SimpleNamespace(content=scenes_json)
+
+    def fake_cinematic_prompt(story_text, use_pro_model=False):
+        calls.append("story")
+        return "warm lamplight, soft film grain"
+
+    monkeypatch.setattr(llm_config, "generate_cinematic_prompt", fake_cinematic_prompt)
+    monkeypatch.setattr(llm_config, "get_llm", lambda *args, **kwargs: FakeLLM())
+    nodes = langgraph_adapter.create_open3d_workflow().builder.nodes
+
+    def run(**overrides):
+        state = {"story_text": "Alice abriu o açucareiro.", "max_scenes": 1}
+        state.update(overrides)
+        state = nodes["extract_story"].runnable.func(state)
+        return nodes["generate_scenes"].runnable.func(state)
+
+    first = run()
+    second = run()
+    bypassed = run(bypass_cache=True)
+
+    assert calls == ["story", "scenes", "story", "scenes"]
+    assert second["cinematic_prompt"] == first["cinematic_prompt"]
+    assert second["scenes"] == first["scenes"]
+    assert first["cost_estimate"]["llm_cache"]["misses"] == 2
+    assert second["cost_estimate"]["llm_cache"] == {
+        "hits": 2,
+        "misses": 0,
+        "bypassed": False,
+        "steps": {"extract_story": "hit", "generate_scenes": "hit"},
+    }
+    assert second["cost_estimate"]["llm_usd"] == 0
+    assert bypassed["cost_estimate"]["llm_cache"]["bypassed"] is True
+    assert bypassed["cost_estimate"]["llm_cache"]["hits"] == 0
+
+    expired = llm_response_cache.LLMResponseCache(tmp_path / "ttl", 1024 * 1024, 0)
+    expired.put("key", {"text": "stale"})
+    time.sleep(0.01)
+    assert expired.get("key") is None
+    assert not (tmp_path / "ttl" / "key.json").exists()
+
+
+def test_llm_clients_are_pooled_and_failing_gemini_cools_down(monkeypatch):
+    spec = importlib.util.spec_from_file_location(
+        "pooled_llm_config", ROOT / "orchestration" / "llm_config.py"
+    )
+    llm_config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(llm_config)
+    monkeypatch.setattr(llm_config, "GEMINI_API_KEY", "gemini-key")
+    monkeypatch.setattr(llm_config, "OPENAI_API_KEY", "openai-key")
+    built = []
+
+    class FakeChat:
+        def __init__(self, **kwargs):
+            built.append(kwargs["model"])
+            self.kwargs = kwargs
+
+        def invoke(self, prompt):
+            if "google_api_key" in self.kwargs:
+                raise RuntimeError("429 quota exceeded")
+            return SimpleNamespace(content="openai prompt")
+
+    gemini_module = ModuleType("langchain_google_genai")
+    gemini_module.ChatGoogleGenerativeAI = FakeChat
+    openai_module = ModuleType("langchain_openai")
+    openai_module.ChatOpenAI = FakeChat
+    monkeypatch.setitem(sys.modules, "langchain_google_genai", gemini_module)
+    monkeypatch.setitem(sys.modules, "langchain_openai", openai_module)
+
+    clients = []
+    workers = [
+        threading.Thread(target=lambda: clients.append(llm_config.get_llm()))
+        for _ in range(8)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len({id(client) for client in clients}) == 1
+    assert built == [llm_config.DEFAULT_LLM_MODEL]
+
+    story = "Alice abriu o açucareiro."
+    assert llm_config.generate_cinematic_prompt(story) == (
+        llm_config.fallback_cinematic_prompt(story)
+    )
+    assert not llm_config.provider_available("gemini")
+    assert llm_config.describe_llm(with_fallback=True)["provider"] == "openai"
+    assert llm_config.generate_cinematic_prompt(story) == "openai prompt"
+    assert llm_config.generate_cinematic_prompt(story) == "openai prompt"
+    assert built == [llm_config.DEFAULT_LLM_MODEL, llm_config.FALLBACK_LLM_MODEL]
+
+    monkeypatch.setenv("LLM_PROVIDER_COOLDOWN_SECONDS", "0")
+    llm_config.record_provider_failure("gemini")
+    assert llm_config.provider_available("gemini")
+
+
+def test_ui_gemini_breaker_ignores_per_prompt_errors(monkeypatch):
+    from google.api_core import exceptions as google_exceptions
+
+    spec = importlib.util.spec_from_file_location(
+        "ui_llm_config",
+        ROOT / "open3d_implementation" / "orchestration" / "llm_config.py",
+    )
+    llm_config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(llm_config)
+    errors = [
+        ValueError("response.text: candidate was blocked by safety"),
+        google_exceptions.ServiceUnavailable("503 backend unavailable"),
+    ]
+
+    class FakeModel:
+        def generate_content(self, prompt):
+            raise errors.pop(0)
+
+    chat = object.__new__(llm_config._GeminiChat)
+    chat._model = FakeModel()
+
+    with pytest.raises(ValueError):
+        chat.invoke("blocked prompt")
+    assert llm_config.provider_available()
+    with pytest.raises(google_exceptions.ServiceUnavailable):
+        chat.invoke("any prompt")
+    assert not llm_config.provider_available()
+    with pytest.raises(RuntimeError, match="cooldown"):
+        chat.invoke("any prompt")
+
+
+def test_comfyui_inputs_upload_once_and_fall_back_inline(monkeypatch, tmp_path):
+    from PIL import Image
+
+    source = tmp_path / "alice_reference.png"
+    Image.new("RGB", (96, 128), (200, 120, 80)).save(source)
+    first = _encode_comfyui_reference_image(
+        str(source), image_name="ref_scene_1.png", target_size=(64, 64)
+    )
+    second = _encode_comfyui_reference_image(
+        str(source), image_name="ref_scene_2.png", target_size=(64, 64)
+    )
+    # Same source and parameters: one PNG encode, shared across scenes.
+    assert second["image"] is first["image"]
+
+    store_dir = tmp_path / "volume"
+    monkeypatch.setenv("COMFYUI_ASSET_STORE_DIR", str(store_dir))
+    store = comfyui_assets.default_asset_store()
+    endpoint_id = f"endpoint-{tmp_path.name}"
+    staged_first = comfyui_assets.stage_input_images(
+        [first], store=store, endpoint_id=endpoint_id
+    )
+    staged_second = comfyui_assets.stage_input_images(
+        [second], store=store, endpoint_id=endpoint_id
+    )
+
+    assert (staged_first.uploaded, staged_second.reused) == (1, 1)
+    assert staged_first.inline_images == staged_second.inline_images == []
+    stored_name = staged_second.stored_names["ref_scene_2.png"]
+    assert stored_name.startswith("ai_film_assets/")
+    assert len(list(store_dir.glob("*.png"))) == 1
+    with Image.open(store_dir / stored_name.split("/", 1)[1]) as stored:
+        assert stored.size == (64, 64)
+
+    workflow = {
+        "1": {"inputs": {"image": "ref_scene_2.png"}, "class_type": "LoadImage"},
+        "2": {"inputs": {"image": ["1", 0]}, "class_type": "FluxKontextImageScale"},
+    }
+    comfyui_assets.reference_stored_assets(workflow, staged_second.stored_names)
+    assert workflow["1"]["inputs"]["image"] == stored_name
+    assert workflow["2"]["inputs"]["image"] == ["1", 0]
+
+    error = {"node_errors": {"1": f"Invalid image file: {stored_name}"}}
+    assert comfyui_assets.mentions_stored_asset(error, staged_second.stored_names)
+    comfyui_assets.mark_endpoint_without_store(endpoint_id)
+    fallback = comfyui_assets.stage_input_images(
+        [second], store=store, endpoint_id=endpoint_id
+    )
+    assert fallback.stored_names == {}
+    assert fallback.inline_images == [second]
+
+
+def test_best_of_n_accepts_first_passing_candidate_and_cancels_siblings(monkeypatch):
+    def run_candidate(candidate, cancel_event):
+        if candidate == 2:
+            return (
+                {"status": "COMPLETED"},
+                {"image_path": "candidate_2.png"},
+                {"semantic_accepted": True, "quality_score": 91},
+            )
+        # Siblings are still polling RunPod when the winner passes QA.
+        assert cancel_event.wait(timeout=5)
+        return {"status": "CANCELLED_EARLY_ACCEPT"}, None, None
+
+    monkeypatch.setenv("IMAGE_GENERATION_BEST_OF_N", "9")
+    assert langgraph_adapter._image_generation_best_of_n() == 4
+
+    results = langgraph_adapter._sample_best_of_n(3, run_candidate)
+
+    assert results[0][0] == 2
+    assert results[0][3]["semantic_accepted"] is True
+    assert sorted(result[0] for result in results) == [1, 2, 3]
+    assert {result[1]["status"] for result in results[1:]} == {"CANCELLED_EARLY_ACCEPT"}
+
+    polled = []
+    monkeypatch.setattr(runpod_client.requests, "get", polled.append)
+    payload = runpod_client.RunPodBlockingClient().wait_for_job(
+        endpoint_id="endpoint",
+        status_url="https://api.runpod.ai/v2/endpoint/status/job",
+        headers={},
+        max_wait_seconds=60,
+        on_poll=polled.append,
+        should_stop=lambda: True,
+    )
+    assert payload is None
+    assert polled == []
+
+
+def test_best_of_n_keeps_siblings_when_one_candidate_raises():
+    raised = threading.Event()
+
+    def run_candidate(candidate, cancel_event):
+        if candidate == 1:
+            raised.set()
+            raise KeyError("images")
+        assert raised.wait(timeout=5)
+        return (
+            {"status": "COMPLETED", "estimated_cost_usd": 0.02},
+            {"image_path": f"candidate_{candidate}.png"},
+            {"semantic_accepted": candidate == 2, "quality_score": 90},
+        )
+
+    results = {
+        candidate: (job, record)
+        for candidate, job, record, _ in langgraph_adapter._sample_best_of_n(
+            3, run_candidate
+        )
+    }
+
+    assert results[1][0]["status"] == "FAILED"
+    assert results[1][0]["error"] == "candidate_raised: KeyError: 'images'"
+    assert results[1][1] is None
+    assert results[2][1] == {"image_path": "candidate_2.png"}
+    assert results[3][0]["estimated_cost_usd"] == 0.02
+
+
+def test_consistency_prefilter_fails_only_near_duplicates_locally(
+    monkeypatch, tmp_path
+):
+    from PIL import Image, ImageDraw
+
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.setenv("IMAGE_SEMANTIC_QA_ENABLED", "true")
+
+    def scene_image(name, box, background=(40, 90, 60), subject=(220, 180, 90)):
+        image = Image.new("RGB", (256, 256), background)
+        ImageDraw.Draw(image).ellipse(box, fill=subject)
+        for x in range(0, 256, 4):
+            ImageDraw.Draw(image).line([(x, 0), (x, 255)], fill=(x, 60, 255 - x))
+        path = tmp_path / name
+        image.save(path)
+        return {"image_path": str(path)}
+
+    left = scene_image("left.png", (10, 60, 110, 200))
+    right = scene_image("right.png", (150, 20, 250, 120))
+    duplicate = scene_image("duplicate.png", (12, 62, 112, 202))
+
+    night_path = tmp_path / "night.png"
+    Image.frombytes(
+        "RGB",
+        (256, 256),
+        bytes((x * 7 + y) % 48 for y in range(256) for x in range(256 * 3)),
+    ).save(night_path)
+    night = {"image_path": str(night_path)}
+
+    distinct = langgraph_adapter._evaluate_image_set_consistency([left, right], {})
+    redundant = langgraph_adapter._evaluate_image_set_consistency([left, duplicate], {})
+    drifting = langgraph_adapter._evaluate_image_set_consistency(
+        [left, right, night], {}
+    )
+
+    assert distinct["prefilter"]["verdict"] == "pass"
+    assert distinct["model"] != "local_prefilter"
+    assert distinct["issues"] == ["consistency_qa_insufficient_inputs"]
+    assert drifting["prefilter"]["verdict"] == "ambiguous"
+    assert "palette_drift" in drifting["prefilter"]["ambiguous"]
+    assert drifting["prefilter"]["drifting_images"] == [2]
+    assert "palette_drift" not in drifting["issues"]
+    assert redundant["accepted"] is False
+    assert redundant["issues"] == ["compositional_redundancy"]
+    assert redundant["prefilter"]["duplicate_pairs"] == [[0, 1]]
+    assert langgraph_adapter._select_consistency_repair_scene(
+        [{"scene_id": 1}, {"scene_id": 2}], redundant
+    ) == {"scene_id": 2}
+
+    jpeg = consistency_prefilter.downscaled_jpeg(Path(left["image_path"]), 128)
+    with Image.open(BytesIO(jpeg)) as preview:
+        assert (preview.format, preview.size) == ("JPEG", (128, 128))
+
+
+def test_direct_engine_runs_pipeline_assets_without_dagster_instance(
+    monkeypatch, tmp_path
+):
+    pipeline = importlib.import_module("orchestration.enhanced_dagster_pipeline")
+    invoked = []
+
+    class FakeWorkflow:
+        def invoke(self, state):
+            invoked.append(state)
+            return {
+                **state,
+                "scenes": [{"scene_id": 1}],
+                "quality_metrics": {"overall_score": 90},
+                "cost_estimate": {"total_usd": 0.0},
+            }
+
+    monkeypatch.setattr(pipeline, "get_open3d_workflow", FakeWorkflow)
+    monkeypatch.setattr(ui_server, "RUNS", {})
+    monkeypatch.setattr(ui_server, "_index_run", lambda run: None)
+    monkeypatch.setenv("AI_FILM_PIPELINE_ENGINE", "direct")
+    run_dir = tmp_path / "run-direct"
+    run_dir.mkdir()
+    ui_server.RUNS["run-direct"] = {
+        "id": "run-direct",
+        "run_dir": str(run_dir),
+        "status": "queued",
+        "logs": [],
+    }
+
+    ui_server._run_pipeline("run-direct", "Alice.", "comic_storybook", "high")
+
+    run = ui_server.RUNS["run-direct"]
+    assert run["status"] == "completed", run.get("traceback")
+    assert invoked[0]["output_root"] == str(run_dir / "output")
+    assert not (run_dir / "dagster_home").exists()
+    orchestration = run["summary"]["dagster"]
+    assert orchestration["engine"] == "direct"
+    assert set(orchestration["asset_metadata"]) == {
+        "enhanced_multimodal_input_asset",
+        "enhanced_langgraph_workflow_asset",
+        "enhanced_validation_asset",
+    }
+    validation_metadata = orchestration["asset_metadata"]["enhanced_validation_asset"]
+    assert validation_metadata["cost_estimate"] == {"total_usd": 0.0}
+    assert orchestration["validation"]["metrics"]["total_scenes"] == 1
+
+
+def test_unexpected_pipeline_errors_fail_the_run_and_keep_the_worker(
+    monkeypatch, tmp_path
+):
+    pipeline = importlib.import_module("orchestration.enhanced_dagster_pipeline")
+
+    def broken_direct(config):
+        raise AttributeError("'NoneType' object has no attribute 'text'")
+
+    monkeypatch.setattr(pipeline, "run_pipeline_direct", broken_direct)
+    monkeypatch.setattr(ui_server, "RUNS", {})
+    monkeypatch.setattr(ui_server, "_index_run", lambda run: None)
+    monkeypatch.setenv("AI_FILM_PIPELINE_ENGINE", "direct")
+    for run_id in ("run-a", "run-b"):
+        ui_server.RUNS[run_id] = {
+            "id": run_id,
+            "run_dir": str(tmp_path / run_id),
+            "status": "queued",
+            "log": [],
+        }
+
+    ui_server._run_pipeline("run-a", "Alice.", "comic_storybook", "high")
+    assert ui_server.RUNS["run-a"]["status"] == "failed"
+    assert "AttributeError" in ui_server.RUNS["run-a"]["error"]
+
+    def escaping_pipeline(run_id, *args):
+        raise LookupError("not in the except tuple")
+
+    monkeypatch.setattr(ui_server, "_run_pipeline", escaping_pipeline)
+    run_queue = ui_server.queue.Queue()
+    worker = threading.Thread(
+        target=ui_server._run_worker, args=(run_queue,), daemon=True
+    )
+    worker.start()
+    run_queue.put(("run-b",))
+    run_queue.join()
+
+    assert worker.is_alive()
+    assert ui_server.RUNS["run-b"]["status"] == "failed"
+    assert ui_server.RUNS["run-b"]["error"] == "not in the except tuple"
+
+
+def test_direct_engine_applies_the_assets_retry_policies(monkeypatch, tmp_path):
+    pipeline = importlib.import_module("orchestration.enhanced_dagster_pipeline")
+    attempts = []
+    delays = []
+
+    class FlakyWorkflow:
+        def invoke(self, state):
+            attempts.append(state)
+            if len(attempts) < 3:
+                raise RuntimeError("gemini_unavailable")
+            return {**state, "scenes": [{"scene_id": 1}]}
+
+    monkeypatch.setattr(pipeline, "get_open3d_workflow", FlakyWorkflow)
+    monkeypatch.setattr(pipeline.time, "sleep", delays.append)
+    config = pipeline.AIFilmPipelineConfig(
+        session_id="retry", story_input="Alice.", run_root=str(tmp_path)
+    )
+
+    result = pipeline.run_pipeline_direct(config)
+
+    assert len(attempts) == 3
+    assert delays == [
+        pipeline.ai_model_retry.delay * 1,
+        pipeline.ai_model_retry.delay * 2,
+    ]
+    assert result["validation"]["metrics"]["total_scenes"] == 1
+
+    attempts.clear()
+    monkeypatch.setattr(
+        pipeline, "ai_model_retry", pipeline.ai_model_retry._replace(max_retries=1)
+    )
+    with pytest.raises(RuntimeError, match="gemini_unavailable"):
+        pipeline.run_pipeline_direct(config)
+    assert len(attempts) == 2